@@ -0,0 +1,510 @@
+"""
+Agent Run Module for PowerPoint Automation Agent
+One agent run (LLM iteration loop plus PowerPoint workflow) as a compact
+slotted object with an explicit lifecycle, so many runs can share one
+process and event loop without sharing any state
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import traceback
+from functools import lru_cache
+
+import numeric_codec
+from prompt_cache import PrefixedPrompt
+from tool_deadlines import Deadlines
+from run_checkpoint import RunCheckpoint
+from run_profiler import NullProfiler
+
+MAX_ITERATIONS = 10  # For PowerPoint operations
+
+DEFAULT_QUERY = """Find the ASCII values of characters in INDIA and then return sum of exponentials of those values. After getting the final answer, open PowerPoint, draw a rectangle, and write the result inside it."""
+
+# PowerPoint workflow run after FINAL_ANSWER: (tool name, iteration header)
+POWERPOINT_WORKFLOW = [
+    ("open_powerpoint", "Opening PowerPoint and Creating New Presentation"),
+    ("select_rectangle_shape", "Selecting Rectangle Shape (Insert -> Shapes -> Rectangle)"),
+    ("draw_rectangle_centered", "Drawing Rectangle Centered on Slide"),
+    ("select_text_box", "Selecting Text Box (Insert -> Text Box)"),
+    ("click_inside_rectangle", "Clicking Inside Rectangle Area to Place Text Box"),
+    ("paste_number", "Pasting Generated Number Inside Rectangle"),
+]
+
+# Run states: created -> running -> completed | incomplete | failed
+CREATED, RUNNING, COMPLETED, INCOMPLETE, FAILED = (
+    "created", "running", "completed", "incomplete", "failed")
+
+
+def describe_tools(tools):
+    """Numbered one-line descriptions of the tools for the system prompt"""
+    tools_description = []
+    for i, tool in enumerate(tools):
+        try:
+            # Get tool properties
+            params = tool.inputSchema
+            desc = getattr(tool, 'description', 'No description available')
+            name = getattr(tool, 'name', f'tool_{i}')
+
+            # Format the input schema in a more readable way
+            if 'properties' in params:
+                param_details = []
+                for param_name, param_info in params['properties'].items():
+                    param_type = param_info.get('type', 'unknown')
+                    param_details.append(f"{param_name}: {param_type}")
+                params_str = ', '.join(param_details)
+            else:
+                params_str = 'no parameters'
+
+            tools_description.append(f"{i+1}. {name}({params_str}) - {desc}")
+        except Exception as e:
+            print(f"Error processing tool {i}: {e}")
+            tools_description.append(f"{i+1}. Error processing tool")
+    return "\n".join(tools_description)
+
+
+@lru_cache(maxsize=8)
+def system_prompt_for(tools_description):
+    """Build the system prompt; runs against the same server share one copy"""
+    return f"""You are a math agent solving problems in iterations. You have access to various mathematical tools and PowerPoint automation tools.
+
+Available tools:
+{tools_description}
+
+You must respond with EXACTLY ONE line in one of these formats (no additional text):
+1. For function calls:
+   FUNCTION_CALL: function_name|param1|param2|...
+
+2. For final answers:
+   FINAL_ANSWER: [number]
+
+Important:
+- When a function returns multiple values, you need to process all of them
+- Only give FINAL_ANSWER when you have completed all necessary calculations
+- Do not repeat function calls with the same parameters
+- For PowerPoint operations, follow this complete sequence: open_powerpoint -> select_rectangle_shape -> draw_rectangle_centered -> select_text_box -> click_inside_rectangle -> paste_number
+- You must complete ALL steps in the sequence before giving FINAL_ANSWER
+- For large inputs (files or long documents) use the *_chunked tools and pass the returned handle to the next tool instead of the list
+
+Examples:
+- FUNCTION_CALL: add|5|3
+- FUNCTION_CALL: strings_to_chars_to_int|INDIA
+- FUNCTION_CALL: int_list_to_exponential_sum|[73,78,68,73,65]
+- FUNCTION_CALL: strings_to_chars_to_int_chunked|file:report.txt
+- FUNCTION_CALL: int_handle_to_exponential_sum|h_3f2a9c1d0b7e
+- FUNCTION_CALL: open_powerpoint
+- FUNCTION_CALL: draw_rectangle_centered
+- FINAL_ANSWER: [42]
+
+DO NOT include any explanations or additional text.
+Your entire response should be a single line starting with either FUNCTION_CALL: or FINAL_ANSWER:"""
+
+
+def _deep_size(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif isinstance(obj, memoryview):
+        size += obj.nbytes
+    return size
+
+
+class AgentRun:
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = (
+        "query", "generate", "checkpoint", "profiler", "max_iterations", "echo",
+        "state", "started", "finished", "error", "final_answer",
+        "iteration", "last_response", "current_query", "iteration_response",
+        "tools", "system_prompt", "typed_arrays", "logs", "llm_tokens", "cached_tokens",
+        "deadlines",
+    )
+
+    # Working state dropped by close(); the outcome and logs are kept
+    _WORKING_STATE = ("generate", "last_response", "current_query", "iteration_response",
+                      "tools", "system_prompt", "typed_arrays")
+
+    def __init__(self, generate, checkpoint=None, query=None, profiler=None,
+                 max_iterations=MAX_ITERATIONS, echo=True, deadlines=None):
+        """
+        State of one agent run
+
+        Lifecycle: construct, await run(session) once, then close() to
+        release the working state. Everything a run touches lives on the
+        instance, so any number of runs can be in flight in one event loop.
+
+        Args:
+            generate: Async callable prompt -> response with a .text attribute
+            checkpoint (RunCheckpoint): Checkpoint to record to and replay from;
+                an in-memory one when omitted
+            query (str): Problem to solve (DEFAULT_QUERY when omitted)
+            profiler: Profiler for per-iteration sections (off when omitted)
+            max_iterations (int): LLM iterations before giving up
+            echo (bool): Print log lines to the console as well as keeping them
+            deadlines (Deadlines): Per-tool deadlines; a tool call that gets
+                no answer within its deadline (plus a margin for the server
+                to report first) is abandoned. From the environment when omitted
+        """
+        self.query = query or DEFAULT_QUERY
+        self.generate = generate
+        self.checkpoint = checkpoint or RunCheckpoint(persist=False)
+        self.profiler = profiler or NullProfiler()
+        self.max_iterations = max_iterations
+        self.echo = echo
+        self.state = CREATED
+        self.started = time.time()
+        self.finished = None
+        self.error = None
+        self.final_answer = None
+        self.iteration = 0
+        self.last_response = None
+        self.current_query = None
+        self.iteration_response = []
+        self.tools = None
+        self.system_prompt = None
+        self.typed_arrays = {}
+        self.logs = []
+        self.llm_tokens = 0        # billed by the provider, when reported
+        self.cached_tokens = 0     # prompt tokens served from the provider's prefix cache
+        self.deadlines = deadlines or Deadlines.from_env()
+
+    @property
+    def run_id(self):
+        return self.checkpoint.run_id
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def log(self, message, log_type="INFO"):
+        """Log a message with a timestamp to the console and the run's logs"""
+        self.log_raw(f"[{time.strftime('%H:%M:%S')}] {log_type}: {message}")
+
+    def log_raw(self, message):
+        """Log raw terminal output to the run's logs (without timestamp)"""
+        if self.echo:
+            print(message)
+        self.logs.append(message)
+
+    def footprint(self):
+        """
+        Approximate bytes held by this run alone
+
+        Covers the instance, its logs and its prompt history and results;
+        the shared system prompt, tools, session and checkpoint are excluded.
+        """
+        seen = {id(self.system_prompt), id(self.tools)}
+        size = sys.getsizeof(self)
+        for name in ("query", "final_answer", "error", "last_response", "current_query",
+                     "iteration_response", "typed_arrays", "logs"):
+            size += _deep_size(getattr(self, name), seen)
+        return size
+
+    async def run(self, session, initialize=True):
+        """
+        Run the iteration loop and PowerPoint workflow over an MCP session
+
+        Returns:
+            str: The final answer, or None when the run did not reach one
+        """
+        if self.state != CREATED:
+            raise RuntimeError(f"Run {self.run_id} has already been started ({self.state})")
+        self.state = RUNNING
+        try:
+            self.profiler.begin("setup")
+            await self._setup(session, initialize)
+            self.log("Starting iteration loop...", "INFO")
+            await self._loop(session)
+        except BaseException as e:
+            self.state = FAILED
+            self.error = str(e) or type(e).__name__
+            raise
+        else:
+            self.state = COMPLETED if self.checkpoint.done else INCOMPLETE
+        finally:
+            self.profiler.end()
+            self.finished = time.time()
+            if self.llm_tokens:
+                self.log(f"LLM tokens: {self.llm_tokens} billed, {self.cached_tokens} of them "
+                         f"served from the cached system prompt", "INFO")
+        return self.final_answer
+
+    def close(self):
+        """Release the working state and the checkpoint file; idempotent"""
+        for name in self._WORKING_STATE:
+            setattr(self, name, None)
+        self.checkpoint.close()
+
+    async def _call_tool(self, session, name, arguments=None):
+        """
+        session.call_tool with the tool's client-side deadline
+
+        Raises:
+            TimeoutError: No answer within the deadline; the request is cancelled
+        """
+        seconds = self.deadlines.client(name)
+        try:
+            return await asyncio.wait_for(session.call_tool(name, arguments=arguments), seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{name} did not answer within {seconds:g}s") from None
+
+    async def _setup(self, session, initialize):
+        if initialize:
+            self.log("Session created, initializing...", "INFO")
+            await session.initialize()
+
+        # Get available tools
+        self.log("Requesting tool list...", "INFO")
+        tools_result = await session.list_tools()
+        tools = tools_result.tools
+        self.log(f"Successfully retrieved {len(tools)} tools", "SUCCESS")
+
+        # Opt in to compact typed-array results (AGENT_TYPED_ARRAYS=1)
+        if os.getenv("AGENT_TYPED_ARRAYS") == "1" and any(t.name == "negotiate_encoding" for t in tools):
+            negotiated = await self._call_tool(session, "negotiate_encoding", {
+                "accept": [numeric_codec.TYPED_ENCODING, "json"]
+            })
+            encoding = json.loads(negotiated.content[0].text).get("encoding", "json")
+            self.log(f"Negotiated result encoding: {encoding}", "INFO")
+        self.tools = [t for t in tools if t.name != "negotiate_encoding"]
+
+        # Create system prompt with available tools
+        self.log("Creating system prompt...", "INFO")
+        try:
+            tools_description = describe_tools(self.tools)
+            self.log("Successfully created tools description", "SUCCESS")
+        except Exception as e:
+            self.log(f"Error creating tools description: {e}", "ERROR")
+            tools_description = "Error loading tools"
+        self.system_prompt = system_prompt_for(tools_description)
+
+    async def _loop(self, session):
+        checkpoint = self.checkpoint
+        while self.iteration < self.max_iterations:
+            self.profiler.begin(f"iteration_{self.iteration + 1:02d}")
+            self.log_raw(f"\n{'='*60}")
+            self.log_raw(f"ITERATION {self.iteration + 1}: Processing")
+            self.log_raw(f"{'='*60}")
+
+            if self.last_response is None:
+                self.current_query = self.query
+            else:
+                self.current_query = self.current_query + "\n\n" + " ".join(self.iteration_response)
+                self.current_query = self.current_query + "  What should I do next?"
+
+            # Get model's response with timeout
+            self.log_raw("Preparing to generate LLM response...")
+            # The system prompt is identical on every call: providers cache it
+            prompt = PrefixedPrompt(self.system_prompt, f"\n\nQuery: {self.current_query}")
+            try:
+                response_text = checkpoint.replay_llm(prompt)
+                if response_text is not None:
+                    self.log_raw("Replayed LLM response from checkpoint")
+                else:
+                    response = await self.generate(prompt)
+                    response_text = response.text.strip()
+                    self.llm_tokens += getattr(response, "tokens", None) or 0
+                    self.cached_tokens += getattr(response, "cached_tokens", None) or 0
+                    checkpoint.record_llm(self.iteration + 1, prompt, response_text)
+                self.log_raw(f"LLM Response: {response_text}")
+
+                # Find the FUNCTION_CALL line in the response
+                for line in response_text.split('\n'):
+                    line = line.strip()
+                    if line.startswith("FUNCTION_CALL:"):
+                        response_text = line
+                        break
+
+            except Exception as e:
+                self.log_raw(f"Failed to get LLM response: {e}")
+                break
+
+            if response_text.startswith("FUNCTION_CALL:"):
+                if not await self._call_function(session, response_text):
+                    break
+
+            elif response_text.startswith("FINAL_ANSWER:"):
+                await self._run_workflow(session, response_text)
+                break
+
+            self.iteration += 1
+
+    async def _call_function(self, session, response_text):
+        """Run one FUNCTION_CALL line; returns False if the loop should stop"""
+        checkpoint = self.checkpoint
+        _, function_info = response_text.split(":", 1)
+        parts = [p.strip() for p in function_info.split("|")]
+        func_name, params = parts[0], parts[1:]
+
+        self.log_raw(f"Calling function: {func_name}")
+        self.log_raw(f"Parameters: {params}")
+
+        try:
+            # Find the matching tool to get its input schema
+            tool = next((t for t in self.tools if t.name == func_name), None)
+            if not tool:
+                self.log_raw(f"Available tools: {[t.name for t in self.tools]}")
+                raise ValueError(f"Unknown tool: {func_name}")
+
+            # Prepare arguments according to the tool's input schema
+            arguments = {}
+            schema_properties = tool.inputSchema.get('properties', {})
+            required_params = tool.inputSchema.get('required', [])
+
+            for param_name, param_info in schema_properties.items():
+                if not params:  # Check if we have enough parameters
+                    if param_name not in required_params:
+                        continue  # Optional parameter left at its default
+                    raise ValueError(f"Not enough parameters provided for {func_name}")
+
+                value = params.pop(0)  # Get and remove the first parameter
+                param_type = param_info.get('type', 'string')
+
+                # Convert the value to the correct type based on the schema
+                if param_type == 'integer':
+                    arguments[param_name] = int(value)
+                elif param_type == 'number':
+                    arguments[param_name] = float(value)
+                elif param_type == 'array':
+                    # Handle array input
+                    typed = self.typed_arrays.get("".join(value.split())) if isinstance(value, str) else None
+                    if typed is not None:
+                        # The list of an earlier typed result: no text parsing
+                        arguments[param_name] = typed.tolist()
+                    elif isinstance(value, str):
+                        # Remove brackets and split by comma
+                        value = value.strip('[]').split(',')
+                        # Filter out empty strings and convert to int
+                        arguments[param_name] = [int(x.strip()) for x in value if x.strip()]
+                    else:
+                        arguments[param_name] = value
+                else:
+                    arguments[param_name] = str(value)
+
+            self.log_raw(f"Final arguments: {arguments}")
+
+            iteration_result = checkpoint.replay_tool(func_name, arguments)
+            if iteration_result is not None:
+                self.log_raw("Replayed tool result from checkpoint")
+            else:
+                result = await self._call_tool(session, func_name, arguments)
+
+                # Get the full result content
+                if hasattr(result, 'content'):
+                    text = (result.content[0].text
+                            if len(result.content) == 1 and hasattr(result.content[0], 'text') else None)
+                    typed = numeric_codec.decode_text(text) if text is not None else None
+                    found = []
+                    nested = (numeric_codec.decode_nested_text(text, found)
+                              if text is not None and typed is None else None)
+                    if typed is not None:
+                        # Same prompt text as a JSON list result
+                        iteration_result = [str(v) for v in typed]
+                        self.typed_arrays["[" + ",".join(iteration_result) + "]"] = typed
+                    elif nested is not None:
+                        # Typed arrays inside a result (e.g. a read_chunk page)
+                        # reach the prompt as lists, never as base64
+                        iteration_result = [nested]
+                        for view in found:
+                            if view.ndim == 1:
+                                self.typed_arrays["[" + ",".join(str(v) for v in view.tolist()) + "]"] = view
+                    elif isinstance(result.content, list):
+                        iteration_result = [
+                            item.text if hasattr(item, 'text') else str(item)
+                            for item in result.content
+                        ]
+                    else:
+                        iteration_result = str(result.content)
+                else:
+                    iteration_result = str(result)
+                checkpoint.record_tool(self.iteration + 1, func_name, arguments, iteration_result)
+
+            # Format the response based on result type
+            if isinstance(iteration_result, list):
+                result_str = f"[{', '.join(iteration_result)}]"
+            else:
+                result_str = str(iteration_result)
+
+            self.log_raw(f"Function result: {result_str}")
+
+            self.iteration_response.append(
+                f"In iteration {self.iteration + 1} you called {func_name} with {arguments} parameters, "
+                f"and the function returned {result_str}."
+            )
+            self.last_response = iteration_result
+            return True
+
+        except Exception as e:
+            self.log_raw(f"Error details: {str(e)}")
+            if self.echo:
+                traceback.print_exc()
+            self.iteration_response.append(f"Error in iteration {self.iteration + 1}: {str(e)}")
+            return False
+
+    async def _run_workflow(self, session, response_text):
+        checkpoint = self.checkpoint
+        self.log_raw("\n=== Agent Execution Complete ===")
+        self.log_raw(f"Final Answer: {response_text}")
+
+        # Extract the final number for PowerPoint
+        final_number = response_text.replace("FINAL_ANSWER:", "").strip()
+        self.log_raw(f"Final number to display: {final_number}")
+
+        # Now automatically perform PowerPoint operations following your exact workflow
+        self.log_raw("\n=== AUTOMATIC POWERPOINT WORKFLOW STARTING ===")
+
+        checkpoint.record_final(final_number)
+
+        # PowerPoint state does not survive a crash (the server and its
+        # window handle are gone), so nothing here is replayed
+        template_path = os.getenv("PPT_TEMPLATE_PATH")
+        template_name = os.getenv("PPT_TEMPLATE_NAME", "default")
+
+        # A presentation left open by an earlier run is updated in place;
+        # the GUI workflow runs when there is none (or a template is wanted)
+        if not template_path and any(t.name == "render_value" for t in self.tools):
+            self.profiler.begin("workflow_render_value")
+            result = await self._call_tool(session, "render_value", {"value": final_number})
+            text = result.content[0].text
+            self.log_raw(text)
+            if text.startswith("Rendered"):
+                checkpoint.record_step("render_value", text)
+                self.log("Result rendered into the open presentation", "SUCCESS")
+                self.final_answer = final_number
+                checkpoint.record_done()
+                return
+            self.log_raw("No open presentation to update; running the GUI workflow")
+
+        if template_path:
+            self.log_raw(f"Using template '{template_name}': {template_path}")
+            await self._call_tool(session, "load_template", {
+                "name": template_name,
+                "path": template_path
+            })
+
+        for step_number, (tool_name, header) in enumerate(POWERPOINT_WORKFLOW, start=1):
+            self.profiler.begin(f"workflow_{tool_name}")
+            self.log_raw(f"\n{'='*60}")
+            self.log_raw(f"ITERATION {step_number}: {header}")
+            self.log_raw(f"{'='*60}")
+            if tool_name == "open_powerpoint" and template_path:
+                arguments = {"template": template_name}
+            elif tool_name == "paste_number":
+                arguments = {"text": final_number}
+            else:
+                arguments = None
+            result = await self._call_tool(session, tool_name, arguments)
+            self.log_raw(result.content[0].text)
+            checkpoint.record_step(tool_name, result.content[0].text)
+
+        self.log("AUTOMATIC POWERPOINT WORKFLOW COMPLETE", "SUCCESS")
+        self.log("PowerPoint should now be open with a slide containing a rectangle and the number inside it!", "SUCCESS")
+        self.log("Check your PowerPoint window to see the result.", "INFO")
+        self.final_answer = final_number
+        checkpoint.record_done()
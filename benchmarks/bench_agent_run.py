@@ -0,0 +1,90 @@
+"""
+Benchmark: memory per run and throughput with many concurrent AgentRun
+instances in one event loop
+
+Each run talks to an in-process fake session and a scripted LLM that yields
+to the loop on every call, so all runs are in flight at once. Memory is
+measured with tracemalloc while the runs are still held and again after
+close(), which keeps only the logs and the outcome.
+
+Run from the repository root:
+    python benchmarks/bench_agent_run.py [runs]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent_run import AgentRun, COMPLETED, POWERPOINT_WORKFLOW
+
+TOOLS = [
+    SimpleNamespace(name="strings_to_chars_to_int", description="ASCII values of a string",
+                    inputSchema={"properties": {"string": {"type": "string"}}}),
+    SimpleNamespace(name="int_list_to_exponential_sum", description="Sum of exponentials",
+                    inputSchema={"properties": {"int_list": {"type": "array"}}}),
+] + [SimpleNamespace(name=name, description=header, inputSchema={})
+     for name, header in POWERPOINT_WORKFLOW]
+
+
+class FakeSession:
+    async def initialize(self):
+        pass
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=TOOLS)
+
+    async def call_tool(self, name, arguments=None):
+        await asyncio.sleep(0)
+        if name == "strings_to_chars_to_int":
+            return SimpleNamespace(content=[SimpleNamespace(text=str(ord(c))) for c in arguments["string"]])
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{name} complete")])
+
+
+async def generate(prompt):
+    await asyncio.sleep(0)
+    if "int_list_to_exponential_sum with" in prompt:
+        return SimpleNamespace(text="FINAL_ANSWER: [7.59982224609308e+33]")
+    if "strings_to_chars_to_int with" in prompt:
+        return SimpleNamespace(text="FUNCTION_CALL: int_list_to_exponential_sum|[73, 78, 68, 73, 65]")
+    return SimpleNamespace(text="FUNCTION_CALL: strings_to_chars_to_int|INDIA")
+
+
+async def measure(count):
+    session = FakeSession()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    runs = [AgentRun(generate, echo=False) for _ in range(count)]
+    await asyncio.gather(*(run.run(session, initialize=False) for run in runs))
+    elapsed = time.perf_counter() - started
+    assert all(run.state == COMPLETED for run in runs)
+    live = tracemalloc.get_traced_memory()[0] - baseline
+    estimate = sum(run.footprint() for run in runs)
+    for run in runs:
+        run.close()
+    closed = tracemalloc.get_traced_memory()[0] - baseline
+    return elapsed, live, estimate, closed
+
+
+def main():
+    max_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    sizes = [n for n in (100, 1000, 5000) if n <= max_runs] or [max_runs]
+    asyncio.run(measure(10))  # warm up imports and the prompt cache
+
+    print(f"{'runs':>7}{'wall s':>9}{'runs/s':>9}{'live KiB/run':>14}"
+          f"{'footprint()':>13}{'closed KiB/run':>16}")
+    print("-" * 68)
+    tracemalloc.start()
+    for count in sizes:
+        elapsed, live, estimate, closed = asyncio.run(measure(count))
+        print(f"{count:>7}{elapsed:>9.2f}{count / elapsed:>9.0f}{live / count / 1024:>14.1f}"
+              f"{estimate / count / 1024:>13.1f}{closed / count / 1024:>16.1f}")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
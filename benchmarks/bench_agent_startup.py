@@ -0,0 +1,78 @@
+"""
+Benchmark: agent cold start
+
+Times fresh interpreters (best of several) for importing the agent with its
+lazy imports, for importing everything the agent used to load up front
+(MCP client, LLM client, e-mail logger, job service), and for a whole
+`--resume` of an already completed run, which needs none of them.
+
+Run from the repository root:
+    python benchmarks/bench_agent_startup.py [repeats]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from run_checkpoint import RunCheckpoint
+
+EAGER_IMPORTS = (
+    "import powerpoint_working_agent\n"
+    "from mcp import ClientSession, StdioServerParameters\n"
+    "from mcp.client.stdio import stdio_client\n"
+    "from llm_client import create_client; create_client()\n"
+    "from email_logger import EmailLogger; EmailLogger()\n"
+    "from slide_thumbnail import get_slide_thumbnail\n"
+    "from run_recorder import RunRecorder\n"
+    "from job_service import serve\n"
+)
+HEAVY_MODULES = ("mcp", "httpx", "starlette", "smtplib", "llm_client", "job_service")
+
+
+def best_seconds(args, repeats, env=None):
+    """Best wall time of a fresh interpreter running args"""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    check = ("import sys, powerpoint_working_agent; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.strip()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(directory=tmp)
+        checkpoint.record_final("1.0")
+        checkpoint.record_done()
+        checkpoint.close()
+        env = dict(os.environ, AGENT_CHECKPOINT_DIR=tmp)
+        rows = [
+            ("python -c pass", best_seconds(["-c", "pass"], repeats)),
+            ("import agent (lazy)", best_seconds(["-c", "import powerpoint_working_agent"], repeats)),
+            ("import agent + eager stacks", best_seconds(["-c", EAGER_IMPORTS], repeats)),
+            ("--resume of a completed run",
+             best_seconds(["powerpoint_working_agent.py", "--resume", checkpoint.run_id], repeats, env)),
+        ]
+
+    print(f"Fresh interpreter wall time (best of {repeats})")
+    print("-" * 52)
+    for name, seconds in rows:
+        print(f"{name:<36}{seconds * 1000:>12.0f} ms")
+    print("-" * 52)
+    print(f"Heavy modules loaded by the agent import: {loaded or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: evaluate_expression against chained single-operation tools
+
+(a+b)*c^d takes three tool calls (add, power, multiply), each one LLM
+iteration and RPC in a real run, or one evaluate_expression call. This
+times the server-side work only: chained tool functions, compiling on every
+call, the cached compiled form, and per-row cost of a batched evaluation.
+
+Run from the repository root:
+    python benchmarks/bench_evaluate_expression.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import powerpoint_working_mcp_server as server
+from expression_eval import compile_expression, evaluate, evaluate_batch
+
+CALLS = 20_000
+ROWS = 10_000
+EXPRESSION = "(a+b)*c^d"
+VALUES = {"a": 1, "b": 2, "c": 3, "d": 4}
+
+
+def per_call_us(stmt, number=CALLS):
+    """Best-of-three time per call in microseconds"""
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    server.log.set_level("INFO")
+    print(f"Server-side cost of {EXPRESSION} (best of 3)")
+    print("-" * 60)
+    chained = per_call_us(lambda: server.multiply(server.add(1, 2), server.power(3, 4)))
+    print(f"{'add + power + multiply (3 tool calls)':<44}{chained:>10.2f} us")
+    uncached = per_call_us(lambda: evaluate(compile_expression(EXPRESSION), VALUES))
+    print(f"{'compile + evaluate every call':<44}{uncached:>10.2f} us")
+    cached = per_call_us(lambda: evaluate(server.expressions.compile(EXPRESSION), VALUES))
+    print(f"{'cached compiled expression':<44}{cached:>10.2f} us")
+    decimal = per_call_us(lambda: evaluate(server.expressions.compile(EXPRESSION), VALUES, "decimal"))
+    print(f"{'cached, decimal mode':<44}{decimal:>10.2f} us")
+
+    compiled = server.expressions.compile(EXPRESSION)
+    vectors = {"a": list(range(ROWS)), "b": [2] * ROWS}
+    batch = per_call_us(lambda: evaluate_batch(compiled, vectors, {"c": 3, "d": 4}), number=5) / ROWS
+    print(f"{f'batched, per row ({ROWS:,} rows)':<44}{batch:>10.2f} us")
+    print("-" * 60)
+    print("Each avoided tool call also saves one LLM iteration and one RPC round trip")
+
+
+if __name__ == "__main__":
+    main()
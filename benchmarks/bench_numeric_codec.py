@@ -0,0 +1,58 @@
+"""
+Benchmark: payload size and client decode time of numeric array results,
+typed-array encoding versus JSON
+
+The JSON columns cover both ways a list reaches the agent today: parsing
+the JSON text, and the agent's strip('[]').split(',') parsing of a list
+passed back as a tool argument.
+
+Run from the repository root:
+    python benchmarks/bench_numeric_codec.py [max_items]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numeric_codec import decode_text, encode_array
+
+
+def best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def split_parse(text):
+    return [int(x.strip()) for x in text.strip('[]').split(',') if x.strip()]
+
+
+def main():
+    max_items = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [n for n in (1_000, 100_000, 1_000_000) if n <= max_items]
+
+    print(f"{'items':>9}{'json KB':>10}{'typed KB':>10}{'json ms':>10}"
+          f"{'split ms':>10}{'typed ms':>10}{'speedup':>9}")
+    print("-" * 68)
+    for count in sizes:
+        values = [ord("A") + i % 58 for i in range(count)]
+        json_text = json.dumps(values)
+        typed_text = json.dumps(encode_array(values))
+        assert decode_text(typed_text).tolist() == values
+
+        json_time = best_of(lambda: json.loads(json_text))
+        split_time = best_of(lambda: split_parse(json_text))
+        typed_time = best_of(lambda: decode_text(typed_text))
+        print(f"{count:>9}{len(json_text) / 1024:>10.0f}{len(typed_text) / 1024:>10.0f}"
+              f"{json_time * 1000:>10.2f}{split_time * 1000:>10.2f}{typed_time * 1000:>10.2f}"
+              f"{json_time / typed_time:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
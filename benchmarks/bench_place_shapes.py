@@ -0,0 +1,60 @@
+"""
+Benchmark: place_shapes layout and batched insertion for many shapes
+
+Layout time is the up-front computation from the slide size; insert time
+is the batched write of one slide holding every shape (the .pptx path that
+runs without PowerPoint). For comparison, the single-shape GUI workflow
+(select shape, draw, select text box, click, paste) sleeps several seconds
+per shape before any PowerPoint work is counted.
+
+Run from the repository root:
+    python benchmarks/bench_place_shapes.py [max_shapes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck_writer import DeckWriter, EMU_PER_POINT, SLIDE_HEIGHT, SLIDE_WIDTH
+from shape_layout import compute_layout
+
+
+def best_of(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    max_shapes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sizes = [n for n in (10, 50, 100, 250, 500) if n <= max_shapes]
+    width, height = SLIDE_WIDTH / EMU_PER_POINT, SLIDE_HEIGHT / EMU_PER_POINT
+
+    print(f"Slide {width:g}x{height:g}pt")
+    print(f"{'layout':>7}{'shapes':>8}{'font pt':>9}{'layout ms':>11}{'insert ms':>11}{'us/shape':>10}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shapes.pptx")
+        for layout in ("grid", "flow"):
+            for count in sizes:
+                items = [f"{i * 7.389:.2f}" for i in range(count)]
+                layout_time, boxes = best_of(lambda: compute_layout(items, width, height, layout))
+
+                def insert():
+                    with DeckWriter(path) as deck:
+                        deck.add_shapes_slide(boxes)
+
+                insert_time, _ = best_of(insert)
+                total = layout_time + insert_time
+                print(f"{layout:>7}{count:>8}{boxes[0].font_size:>9g}{layout_time * 1000:>11.2f}"
+                      f"{insert_time * 1000:>11.2f}{total / count * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: per-job PowerPoint start-up cost with and without the instance pool
+
+Uses stand-in processes that take a fixed time to become ready, so it runs
+on any platform. Launching per job pays the start-up cost every time; the
+pool pays it once, plus once per recycle.
+
+Run from the repository root:
+    python benchmarks/bench_powerpoint_pool.py [jobs] [startup_delay] [max_jobs]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from powerpoint_pool import InstancePool, StandInLauncher
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    startup_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    max_jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        launcher = StandInLauncher(startup_delay=startup_delay, state_dir=tmp)
+
+        started = time.perf_counter()
+        for _ in range(jobs):
+            instance = launcher.launch()
+            launcher.stop(instance)
+        cold = time.perf_counter() - started
+
+        pool = InstancePool(launcher, size=1, max_jobs=max_jobs)
+        pool.prewarm(wait=True)
+        waits = []
+        started = time.perf_counter()
+        for _ in range(jobs):
+            instance = pool.acquire()
+            waits.append(pool.last_acquire_seconds)
+            pool.release(instance)
+        pooled = time.perf_counter() - started
+        stats = pool.stats()
+        pool.close()
+
+    waits.sort()
+    print(f"jobs={jobs} startup_delay={startup_delay}s max_jobs={max_jobs}")
+    print(f"{'mode':<12}{'total s':>10}{'per job ms':>12}")
+    print("-" * 34)
+    print(f"{'cold':<12}{cold:>10.2f}{cold / jobs * 1000:>12.1f}")
+    print(f"{'pooled':<12}{pooled:>10.2f}{pooled / jobs * 1000:>12.1f}")
+    print(f"pooled acquire p50={waits[len(waits) // 2] * 1000:.2f}ms "
+          f"max={waits[-1] * 1000:.1f}ms cold_starts={stats['cold_starts']} "
+          f"recycled={stats['recycled']}")
+
+
+if __name__ == "__main__":
+    main()
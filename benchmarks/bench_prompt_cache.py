@@ -0,0 +1,70 @@
+"""
+Benchmark: agent prompts with and without the cached system-prompt prefix
+
+Sends the agent's real system prompt (built from the server's tool list)
+followed by a growing query, as a run does each iteration, to the local
+stand-in LLM server. Compares request sizes and the prompt tokens the
+provider has to process when the prefix is registered once and referenced
+by handle.
+
+Run from the repository root:
+    python benchmarks/bench_prompt_cache.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import powerpoint_working_mcp_server as server
+from agent_run import describe_tools, system_prompt_for
+from llm_client import GeminiClient
+from llm_stub_server import StubLLMServer
+from prompt_cache import PrefixCache, PrefixedPrompt
+
+ITERATIONS = 10
+RUNS = 3
+
+
+async def measure(url, system_prompt, prefix_cache):
+    request_bytes = tokens = cached = 0
+    started = time.perf_counter()
+    async with GeminiClient("key", base_url=url, prefix_cache=prefix_cache) as client:
+        for _ in range(RUNS):
+            query = "Find the ASCII values of characters in INDIA and return the sum of exponentials."
+            for i in range(ITERATIONS):
+                prompt = PrefixedPrompt(system_prompt, f"\n\nQuery: {query}")
+                text = prompt.suffix if prefix_cache else prompt
+                request_bytes += len(json.dumps({"contents": [{"parts": [{"text": text}]}]}))
+                response = await client.generate(prompt)
+                tokens += response.tokens
+                cached += response.cached_tokens or 0
+                query += f" In iteration {i + 1} you called add with {{'a': {i}, 'b': 1}} and it returned {i + 1}."
+    return request_bytes, tokens, cached, time.perf_counter() - started
+
+
+def main():
+    server.log.set_level("INFO")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    tools = asyncio.run(server.mcp.list_tools())
+    system_prompt = system_prompt_for(describe_tools(tools))
+    calls = RUNS * ITERATIONS
+    print(f"System prompt: {len(system_prompt):,} chars (~{len(system_prompt) // 4:,} tokens); "
+          f"{RUNS} runs x {ITERATIONS} iterations")
+    print(f"{'mode':<20}{'request KB':>12}{'tokens':>10}{'cached':>10}{'processed':>11}{'ms/call':>9}")
+    print("-" * 72)
+    with StubLLMServer(["FUNCTION_CALL: add|1|2"]) as stub:
+        for label, cache in (("full prompt", None), ("cached prefix", PrefixCache(min_tokens=1024))):
+            sent, tokens, cached, seconds = asyncio.run(measure(stub.gemini_url, system_prompt, cache))
+            print(f"{label:<20}{sent / 1024:>12.1f}{tokens:>10,}{cached:>10,}{tokens - cached:>11,}"
+                  f"{seconds / calls * 1000:>9.2f}")
+    print("-" * 72)
+    print("processed = billed tokens not served from the provider's cache (one registration per prefix)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: streaming deck generation time and peak memory by slide count
+
+Peak Python heap usage should stay flat as the slide count grows because
+each slide part is written to disk as soon as it is generated.
+
+Run from the repository root:
+    python benchmarks/bench_render_deck.py [max_slides]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck_writer import render_deck
+
+
+def rows(count):
+    """Generate result rows lazily, as a long-running job would"""
+    for i in range(count):
+        yield {"value": f"{i * 1.0001:.4f}", "title": f"Result {i + 1}"}
+
+
+def main():
+    max_slides = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    counts = [c for c in (100, 1_000, 10_000, 100_000) if c <= max_slides]
+
+    print(f"{'slides':>8}{'seconds':>10}{'slides/s':>12}{'peak heap':>12}{'file size':>12}")
+    print("-" * 54)
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            path = os.path.join(tmp, f"deck_{count}.pptx")
+            tracemalloc.start()
+            started = time.perf_counter()
+            render_deck(rows(count), path)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = os.path.getsize(path)
+            print(f"{count:>8}{elapsed:>10.2f}{count / elapsed:>12.0f}"
+                  f"{peak / 1024:>10.0f}KB{size / 1024:>10.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: re-rendering a result into an existing presentation
+
+The presentation holds the result slide followed by SLIDES other slides.
+Writing the whole .pptx again is compared with render_value's incremental
+path: a new value (only the result slide's part is rewritten; every other
+part is copied as stored) and an unchanged value (skipped without opening
+the file).
+
+Run from the repository root:
+    python benchmarks/bench_render_value.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deck_writer
+from slide_model import PptxSlide, SlideModel
+
+CALLS = 100
+SLIDES = 200
+
+
+def per_call_ms(stmt):
+    """Best-of-three time per call in milliseconds"""
+    return min(timeit.repeat(stmt, number=CALLS, repeat=3)) / CALLS * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "result.pptx")
+        others = [f"Appendix {i}" for i in range(SLIDES)]
+
+        def full_rewrite(value):
+            deck_writer.render_deck([{"value": value, "title": "Answer"}] + others, path)
+
+        model = SlideModel()
+        values = iter(range(1, 10**9))
+
+        def update(value):
+            model.render(path, PptxSlide(path), deck_writer.result_shapes(value, "Answer"))
+
+        print(f"Per-call cost over {CALLS} calls (best of 3), result slide + {SLIDES} slides")
+        print("-" * 60)
+        full = per_call_ms(lambda: full_rewrite(next(values)))
+        print(f"{'full rewrite (render_deck)':<40}{full:>10.3f} ms")
+        update("same")
+        changed = per_call_ms(lambda: update(next(values)))
+        print(f"{'incremental, new value':<40}{changed:>10.3f} ms")
+        update("same")
+        unchanged = per_call_ms(lambda: update("same"))
+        print(f"{'incremental, unchanged value':<40}{unchanged:>10.3f} ms")
+        print("-" * 60)
+        print(f"Operations: {model.stats()['operations']}, slide scans: {model.scans}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: per-call logging overhead of the MCP server math tools
+
+Compares the old print()-to-stdout approach against the structured logger
+with debug disabled (no-op) and enabled (queued to a file).
+
+Run from the repository root:
+    python benchmarks/bench_server_logging.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import powerpoint_working_mcp_server as server
+from server_logging import StructuredLogger
+
+CALLS = 200_000
+
+
+def add_with_print(a, b):
+    """Replica of the original add tool, logging via print()"""
+    print("CALLED: add(a: int, b: int) -> int:")
+    return int(a + b)
+
+
+def add_without_logging(a, b):
+    """Replica of the add tool with no logging at all"""
+    return int(a + b)
+
+
+def per_call_ns(stmt):
+    """Best-of-three time per call in nanoseconds"""
+    best = min(timeit.repeat(stmt, number=CALLS, repeat=3))
+    return best / CALLS * 1e9
+
+
+def main():
+    print(f"Per-call cost over {CALLS:,} calls (best of 3)")
+    print("-" * 60)
+
+    baseline = per_call_ns(lambda: add_without_logging(5, 3))
+    print(f"{'add, no logging':<40}{baseline:>10.0f} ns")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        printed = per_call_ns(lambda: add_with_print(5, 3))
+    print(f"{'add, print() to stdout (in-memory)':<40}{printed:>10.0f} ns")
+
+    server.log.set_level("INFO")
+    disabled = per_call_ns(lambda: server.add(5, 3))
+    print(f"{'add, structured logger, debug off':<40}{disabled:>10.0f} ns")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = server.log
+        server.log = StructuredLogger(name="bench", level="DEBUG",
+                                      log_file=os.path.join(tmp, "server.log"))
+        try:
+            enabled = per_call_ns(lambda: server.add(5, 3))
+            print(f"{'add, structured logger, debug to file':<40}{enabled:>10.0f} ns")
+            server.log.set_level("INFO")
+            for name, call in (
+                ("power (memoized)", lambda: server.power(2, 64)),
+                ("strings_to_chars_to_int (memoized)",
+                 lambda: server.strings_to_chars_to_int("INDIA")),
+            ):
+                print(f"{name + ', debug off':<40}{per_call_ns(call):>10.0f} ns")
+        finally:
+            server.log.close()
+            server.log = original
+
+    print("-" * 60)
+    print(f"Disabled-level overhead vs no logging: {disabled - baseline:+.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: per-call overhead of the tool metrics wrapper
+
+Times the add tool bare and wrapped by MetricsRegistry.instrument (counters
+plus a latency histogram bucket), then renders the Prometheus text.
+
+Run from the repository root:
+    python benchmarks/bench_server_metrics.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import powerpoint_working_mcp_server as server
+from server_metrics import MetricsRegistry
+
+CALLS = 200_000
+
+
+def per_call_ns(stmt):
+    """Best-of-three time per call in nanoseconds"""
+    best = min(timeit.repeat(stmt, number=CALLS, repeat=3))
+    return best / CALLS * 1e9
+
+
+def main():
+    registry = MetricsRegistry()
+    measured_add = registry.instrument(server.add)
+
+    print(f"Per-call cost over {CALLS:,} calls (best of 3)")
+    print("-" * 60)
+    bare = per_call_ns(lambda: server.add(5, 3))
+    print(f"{'add, bare':<40}{bare:>10.0f} ns")
+    measured = per_call_ns(lambda: measured_add(5, 3))
+    print(f"{'add, instrumented':<40}{measured:>10.0f} ns")
+
+    for name in ("power", "subtract", "multiply"):
+        instrumented = registry.instrument(getattr(server, name))
+        for _ in range(1000):
+            instrumented(2, 3)
+    render = min(timeit.repeat(registry.prometheus_text, number=1000, repeat=3)) / 1000 * 1e6
+    print(f"{'prometheus_text(), 4 tools':<40}{render:>10.1f} us")
+    print("-" * 60)
+    print(f"Instrumentation overhead: {measured - bare:+.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
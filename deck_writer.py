@@ -0,0 +1,419 @@
+"""
+Streaming Deck Writer for PowerPoint MCP Server
+Writes multi-slide .pptx packages incrementally with constant memory
+"""
+
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from collections import namedtuple
+from xml.sax.saxutils import escape
+
+# Slide geometry in EMU (16:9, 13.333in x 7.5in)
+SLIDE_WIDTH = 12192000
+SLIDE_HEIGHT = 6858000
+RECT_WIDTH = 4572000
+RECT_HEIGHT = 2286000
+EMU_PER_POINT = 12700
+
+# Names of the shapes on a result slide; they identify the shapes when a
+# slide is updated in place (see slide_model)
+RESULT_SHAPE = "Result Rectangle"
+TITLE_SHAPE = "Title"
+
+# One text-bearing rectangle: position and size in EMU, font size in
+# hundredths of a point
+ShapeSpec = namedtuple("ShapeSpec", "name x y cx cy text size filled")
+
+_NS = ('xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+       'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+       'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"')
+# Characters outside the XML 1.0 Char range; a part holding one will not open
+_QUOTE = {'"': "&quot;"}
+_INVALID_XML_CHARS = re.compile("[^\x09\x0a\x0d\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_PML = "application/vnd.openxmlformats-officedocument.presentationml"
+
+_ROOT_RELS = (
+    f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="ppt/presentation.xml"/>'
+    '</Relationships>'
+)
+
+_THEME = (
+    f'{_XML_HEADER}<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office Theme">'
+    '<a:themeElements>'
+    '<a:clrScheme name="Office">'
+    '<a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1>'
+    '<a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1>'
+    '<a:dk2><a:srgbClr val="44546A"/></a:dk2><a:lt2><a:srgbClr val="E7E6E6"/></a:lt2>'
+    '<a:accent1><a:srgbClr val="4472C4"/></a:accent1><a:accent2><a:srgbClr val="ED7D31"/></a:accent2>'
+    '<a:accent3><a:srgbClr val="A5A5A5"/></a:accent3><a:accent4><a:srgbClr val="FFC000"/></a:accent4>'
+    '<a:accent5><a:srgbClr val="5B9BD5"/></a:accent5><a:accent6><a:srgbClr val="70AD47"/></a:accent6>'
+    '<a:hlink><a:srgbClr val="0563C1"/></a:hlink><a:folHlink><a:srgbClr val="954F72"/></a:folHlink>'
+    '</a:clrScheme>'
+    '<a:fontScheme name="Office">'
+    '<a:majorFont><a:latin typeface="Calibri Light"/><a:ea typeface=""/><a:cs typeface=""/></a:majorFont>'
+    '<a:minorFont><a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/></a:minorFont>'
+    '</a:fontScheme>'
+    '<a:fmtScheme name="Office">'
+    '<a:fillStyleLst>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '</a:fillStyleLst>'
+    '<a:lnStyleLst>'
+    '<a:ln w="6350"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>'
+    '<a:ln w="12700"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>'
+    '<a:ln w="19050"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>'
+    '</a:lnStyleLst>'
+    '<a:effectStyleLst>'
+    '<a:effectStyle><a:effectLst/></a:effectStyle>'
+    '<a:effectStyle><a:effectLst/></a:effectStyle>'
+    '<a:effectStyle><a:effectLst/></a:effectStyle>'
+    '</a:effectStyleLst>'
+    '<a:bgFillStyleLst>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '</a:bgFillStyleLst>'
+    '</a:fmtScheme>'
+    '</a:themeElements>'
+    '</a:theme>'
+)
+
+_EMPTY_TREE = (
+    '<p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr></p:spTree>'
+)
+
+_MASTER = (
+    f'{_XML_HEADER}<p:sldMaster {_NS}>'
+    f'<p:cSld><p:bg><p:bgRef idx="1001"><a:schemeClr val="bg1"/></p:bgRef></p:bg>{_EMPTY_TREE}</p:cSld>'
+    '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" '
+    'accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" '
+    'hlink="hlink" folHlink="folHlink"/>'
+    '<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst>'
+    '</p:sldMaster>'
+)
+
+_MASTER_RELS = (
+    f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>'
+    f'<Relationship Id="rId2" Type="{_REL_NS}/theme" Target="../theme/theme1.xml"/>'
+    '</Relationships>'
+)
+
+_LAYOUT = (
+    f'{_XML_HEADER}<p:sldLayout {_NS} type="blank" preserve="1">'
+    f'<p:cSld name="Blank">{_EMPTY_TREE}</p:cSld>'
+    '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr>'
+    '</p:sldLayout>'
+)
+
+_LAYOUT_RELS = (
+    f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/slideMaster" Target="../slideMasters/slideMaster1.xml"/>'
+    '</Relationships>'
+)
+
+_SLIDE_RELS = (
+    f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>'
+    '</Relationships>'
+).encode("utf-8")
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_DATA_DESCRIPTOR = struct.Struct("<IIII")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_ZIP64_END_RECORD = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<IIQI")
+_CHUNK_SIZE = 64 * 1024
+
+
+def _xml_text(text, entities=None):
+    """Escape text for XML, replacing characters XML cannot hold (e.g. \\x0b) with a space"""
+    return escape(_INVALID_XML_CHARS.sub(" ", text), entities or {})
+
+
+def _shape_xml(shape_id, name, x, y, cx, cy, text, size, filled):
+    """Build a text-bearing rectangle shape"""
+    fill = ('<a:solidFill><a:schemeClr val="accent1"/></a:solidFill>' if filled
+            else '<a:noFill/>')
+    line = '<a:ln><a:solidFill><a:schemeClr val="accent1"/></a:solidFill></a:ln>' if filled else '<a:ln><a:noFill/></a:ln>'
+    color = "bg1" if filled else "tx1"
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{_xml_text(name, _QUOTE)}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+        f'<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+        f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>{fill}{line}</p:spPr>'
+        '<p:txBody><a:bodyPr anchor="ctr"/><a:lstStyle/>'
+        f'<a:p><a:pPr algn="ctr"/><a:r><a:rPr lang="en-US" sz="{size}" dirty="0">'
+        f'<a:solidFill><a:schemeClr val="{color}"/></a:solidFill></a:rPr>'
+        f'<a:t>{_xml_text(text)}</a:t></a:r></a:p></p:txBody></p:sp>'
+    )
+
+
+def result_shapes(value, title=None):
+    """Shape specs of a result slide: a centered rectangle holding the value, and an optional title"""
+    specs = [ShapeSpec(RESULT_SHAPE, (SLIDE_WIDTH - RECT_WIDTH) // 2, (SLIDE_HEIGHT - RECT_HEIGHT) // 2,
+                       RECT_WIDTH, RECT_HEIGHT, str(value), 2400, True)]
+    if title is not None:
+        specs.append(ShapeSpec(TITLE_SHAPE, 457200, 457200, SLIDE_WIDTH - 914400, 1143000,
+                               str(title), 3200, False))
+    return specs
+
+
+def shape_xml(shape_id, spec):
+    """Build the XML of one ShapeSpec"""
+    return _shape_xml(shape_id, spec.name, spec.x, spec.y, spec.cx, spec.cy,
+                      spec.text, spec.size, spec.filled)
+
+
+def slide_xml(value, title=None):
+    """Build the XML for one slide: a centered rectangle holding the value"""
+    shapes = "".join(shape_xml(number, spec)
+                     for number, spec in enumerate(result_shapes(value, title), start=2))
+    tree = _EMPTY_TREE.replace("</p:spTree>", shapes + "</p:spTree>")
+    return f'{_XML_HEADER}<p:sld {_NS}><p:cSld>{tree}</p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>'
+
+
+def shapes_slide_xml(boxes):
+    """Build the XML for one slide holding many labeled rectangles (ShapeBox, in points)"""
+    shapes = "".join(
+        _shape_xml(number, f"Shape {number - 1}",
+                   round(box.left * EMU_PER_POINT), round(box.top * EMU_PER_POINT),
+                   round(box.width * EMU_PER_POINT), round(box.height * EMU_PER_POINT),
+                   box.label, round(box.font_size * 100), True)
+        for number, box in enumerate(boxes, start=2)
+    )
+    tree = _EMPTY_TREE.replace("</p:spTree>", shapes + "</p:spTree>")
+    return f'{_XML_HEADER}<p:sld {_NS}><p:cSld>{tree}</p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>'
+
+
+def _dos_datetime(timestamp):
+    """Convert a timestamp into zip (DOS) date and time fields"""
+    t = time.localtime(timestamp)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((max(t.tm_year, 1980) - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class ZipStreamWriter:
+    def __init__(self, path):
+        """
+        Minimal append-only zip writer
+
+        Entries are written as they arrive and central directory records are
+        spilled to a temporary file, so memory use does not depend on the
+        number of entries.
+
+        Args:
+            path (str): Output file path
+        """
+        self.path = path
+        self.entries = 0
+        self._file = open(path, "wb")
+        self._directory = tempfile.TemporaryFile()
+        self._dos_time, self._dos_date = _dos_datetime(time.time())
+        self.closed = False
+
+    def write_part(self, name, chunks):
+        """Deflate an iterable of byte chunks into an entry with a data descriptor"""
+        encoded_name = name.encode("utf-8")
+        offset = self._file.tell()
+        self._file.write(_LOCAL_HEADER.pack(0x04034b50, 20, 0x0008, 8, self._dos_time,
+                                            self._dos_date, 0, 0, 0, len(encoded_name), 0))
+        self._file.write(encoded_name)
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        crc = 0
+        size = 0
+        compressed_size = 0
+        for chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            data = compressor.compress(chunk)
+            compressed_size += len(data)
+            self._file.write(data)
+        data = compressor.flush()
+        compressed_size += len(data)
+        self._file.write(data)
+        self._file.write(_DATA_DESCRIPTOR.pack(0x08074b50, crc, compressed_size, size))
+        self._add_directory_record(encoded_name, 0x0008, 8, crc, compressed_size, size, offset)
+
+    def write_raw(self, name, method, crc, size, compressed):
+        """Copy an already-compressed entry verbatim (no recompression)"""
+        encoded_name = name.encode("utf-8")
+        offset = self._file.tell()
+        self._file.write(_LOCAL_HEADER.pack(0x04034b50, 20, 0, method, self._dos_time,
+                                            self._dos_date, crc, len(compressed), size,
+                                            len(encoded_name), 0))
+        self._file.write(encoded_name)
+        self._file.write(compressed)
+        self._add_directory_record(encoded_name, 0, method, crc, len(compressed), size, offset)
+
+    def _add_directory_record(self, encoded_name, flags, method, crc, compressed_size, size, offset):
+        if offset > 0xFFFFFFFF or compressed_size > 0xFFFFFFFF:
+            raise ValueError("Package exceeds 4 GiB")
+        self._directory.write(_CENTRAL_HEADER.pack(
+            0x02014b50, 20, 20, flags, method, self._dos_time, self._dos_date,
+            crc, compressed_size, size, len(encoded_name), 0, 0, 0, 0, 0, offset))
+        self._directory.write(encoded_name)
+        self.entries += 1
+
+    def close(self):
+        """Write the central directory and end records, then close the file"""
+        if self.closed:
+            return
+        start = self._file.tell()
+        self._directory.seek(0)
+        shutil.copyfileobj(self._directory, self._file, _CHUNK_SIZE)
+        size = self._file.tell() - start
+
+        entries = self.entries
+        if entries > 0xFFFF:
+            zip64_offset = self._file.tell()
+            self._file.write(_ZIP64_END_RECORD.pack(0x06064b50, 44, 45, 45, 0, 0,
+                                                    entries, entries, size, start))
+            self._file.write(_ZIP64_LOCATOR.pack(0x07064b50, 0, zip64_offset, 1))
+            entries = 0xFFFF
+        self._file.write(_END_RECORD.pack(0x06054b50, 0, 0, entries, entries, size, start, 0))
+        self._file.close()
+        self._directory.close()
+        self.closed = True
+
+    def abort(self):
+        """Close and remove a partially written file"""
+        if self.closed:
+            return
+        self._file.close()
+        self._directory.close()
+        self.closed = True
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class DeckWriter:
+    def __init__(self, path):
+        """
+        Open a .pptx package for incremental writing
+
+        Each slide is compressed and written to disk as soon as it is added,
+        so memory use does not grow with the number of slides.
+
+        Args:
+            path (str): Output .pptx path
+        """
+        self.path = path
+        self.slide_count = 0
+        self._zip = ZipStreamWriter(path)
+
+        self._zip.write_part("_rels/.rels", [_ROOT_RELS.encode("utf-8")])
+        self._zip.write_part("ppt/theme/theme1.xml", [_THEME.encode("utf-8")])
+        self._zip.write_part("ppt/slideMasters/slideMaster1.xml", [_MASTER.encode("utf-8")])
+        self._zip.write_part("ppt/slideMasters/_rels/slideMaster1.xml.rels", [_MASTER_RELS.encode("utf-8")])
+        self._zip.write_part("ppt/slideLayouts/slideLayout1.xml", [_LAYOUT.encode("utf-8")])
+        self._zip.write_part("ppt/slideLayouts/_rels/slideLayout1.xml.rels", [_LAYOUT_RELS.encode("utf-8")])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def add_slide(self, value, title=None):
+        """Render one slide and write it to the package immediately"""
+        self._write_slide(slide_xml(value, title))
+
+    def add_shapes_slide(self, boxes):
+        """Write one slide holding a precomputed layout of labeled rectangles"""
+        self._write_slide(shapes_slide_xml(boxes))
+
+    def _write_slide(self, xml):
+        self.slide_count += 1
+        number = self.slide_count
+        self._zip.write_part(f"ppt/slides/slide{number}.xml", [xml.encode("utf-8")])
+        self._zip.write_part(f"ppt/slides/_rels/slide{number}.xml.rels", [_SLIDE_RELS])
+
+    def close(self):
+        """Write the presentation parts and central directory, then close"""
+        if self._zip.closed:
+            return
+        count = self.slide_count
+        self._zip.write_part("ppt/presentation.xml", self._presentation_chunks(count))
+        self._zip.write_part("ppt/_rels/presentation.xml.rels", self._presentation_rels_chunks(count))
+        self._zip.write_part("[Content_Types].xml", self._content_types_chunks(count))
+        self._zip.close()
+
+    def abort(self):
+        """Close and remove a partially written package"""
+        self._zip.abort()
+
+    # Package parts generated at close time, streamed in chunks
+
+    def _presentation_chunks(self, count):
+        yield (f'{_XML_HEADER}<p:presentation {_NS} saveSubsetFonts="1">'
+               '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+               '<p:sldIdLst>').encode("utf-8")
+        for start in range(0, count, 1000):
+            yield "".join(f'<p:sldId id="{255 + n}" r:id="rId{n + 2}"/>'
+                          for n in range(start + 1, min(start + 1000, count) + 1)).encode("utf-8")
+        yield (f'</p:sldIdLst><p:sldSz cx="{SLIDE_WIDTH}" cy="{SLIDE_HEIGHT}"/>'
+               '<p:notesSz cx="6858000" cy="9144000"/></p:presentation>').encode("utf-8")
+
+    def _presentation_rels_chunks(self, count):
+        yield (f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+               f'<Relationship Id="rId1" Type="{_REL_NS}/slideMaster" Target="slideMasters/slideMaster1.xml"/>'
+               f'<Relationship Id="rId2" Type="{_REL_NS}/theme" Target="theme/theme1.xml"/>').encode("utf-8")
+        for start in range(0, count, 1000):
+            yield "".join(f'<Relationship Id="rId{n + 2}" Type="{_REL_NS}/slide" Target="slides/slide{n}.xml"/>'
+                          for n in range(start + 1, min(start + 1000, count) + 1)).encode("utf-8")
+        yield b'</Relationships>'
+
+    def _content_types_chunks(self, count):
+        yield (f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+               '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+               '<Default Extension="xml" ContentType="application/xml"/>'
+               f'<Override PartName="/ppt/presentation.xml" ContentType="{_CT_PML}.presentation.main+xml"/>'
+               f'<Override PartName="/ppt/slideMasters/slideMaster1.xml" ContentType="{_CT_PML}.slideMaster+xml"/>'
+               f'<Override PartName="/ppt/slideLayouts/slideLayout1.xml" ContentType="{_CT_PML}.slideLayout+xml"/>'
+               '<Override PartName="/ppt/theme/theme1.xml" '
+               'ContentType="application/vnd.openxmlformats-officedocument.theme+xml"/>').encode("utf-8")
+        for start in range(0, count, 1000):
+            yield "".join(f'<Override PartName="/ppt/slides/slide{n}.xml" ContentType="{_CT_PML}.slide+xml"/>'
+                          for n in range(start + 1, min(start + 1000, count) + 1)).encode("utf-8")
+        yield b'</Types>'
+
+
+def render_deck(rows, path):
+    """
+    Render one slide per row into a single .pptx file
+
+    Rows may be plain values or dicts with a "value" and optional "title".
+    Rows can be any iterable, including a generator, and are consumed one
+    at a time.
+
+    Returns:
+        int: Number of slides written
+    """
+    with DeckWriter(path) as deck:
+        for row in rows:
+            if isinstance(row, dict):
+                deck.add_slide(row.get("value", ""), row.get("title"))
+            else:
+                deck.add_slide(row)
+        return deck.slide_count
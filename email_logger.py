@@ -8,10 +8,14 @@ import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
+from email.mime.image import MIMEImage
 from email import encoders
 from datetime import datetime
 import json
 
+# Inline images larger than this are dropped to keep notifications small
+MAX_INLINE_IMAGE_BYTES = 100 * 1024
+
 class EmailLogger:
     def __init__(self):
         """Initialize email logger with configuration from environment variables"""
@@ -68,15 +72,31 @@ class EmailLogger:
             print(f"ERROR: Error sending email: {str(e)}")
             return False
     
-    def send_success_email(self, final_result, execution_time, logs):
-        """Send success notification with results"""
+    def send_success_email(self, final_result, execution_time, logs, thumbnail=None):
+        """
+        Send success notification with results
+        
+        Args:
+            final_result (str): Number written to the slide
+            execution_time (float): Run duration in seconds
+            logs (list): List of log messages
+            thumbnail (bytes): Optional PNG preview of the slide, shown inline
+        """
         subject = "✅ PowerPoint Automation - SUCCESS"
+        inline_images = {}
+        preview = ""
+        if thumbnail and len(thumbnail) <= MAX_INLINE_IMAGE_BYTES:
+            inline_images["slide-thumbnail"] = thumbnail
+            preview = """
+        <h3>🖼️ Slide Preview:</h3>
+        <p><img src="cid:slide-thumbnail" alt="Slide preview" style="max-width: 480px; border: 1px solid #ccc;"></p>
+        """
         body = f"""
         <h2>🎉 PowerPoint Automation Completed Successfully!</h2>
         
         <h3>📊 Final Result:</h3>
         <p><strong>Generated Number:</strong> {final_result}</p>
-        
+        {preview}
         <h3>⏱️ Execution Details:</h3>
         <ul>
             <li><strong>Execution Time:</strong> {execution_time:.2f} seconds</li>
@@ -90,7 +110,7 @@ class EmailLogger:
         <p><em>This email was automatically generated by the PowerPoint Automation Agent.</em></p>
         """
         
-        return self._send_custom_email(subject, body)
+        return self._send_custom_email(subject, body, inline_images)
     
     def send_error_email(self, error_message, logs):
         """Send error notification"""
@@ -110,19 +130,31 @@ class EmailLogger:
         
         return self._send_custom_email(subject, body)
     
-    def _send_custom_email(self, subject, body):
-        """Send custom email with HTML body"""
+    def _build_message(self, subject, body, inline_images=None):
+        """Build an HTML message, embedding images referenced as cid:<name>"""
+        msg = MIMEMultipart('related' if inline_images else 'mixed')
+        msg['From'] = self.sender_email
+        msg['To'] = self.recipient_email
+        msg['Subject'] = subject
+        
+        msg.attach(MIMEText(body, 'html'))
+        
+        for content_id, data in (inline_images or {}).items():
+            image = MIMEImage(data, 'png')
+            image.add_header('Content-ID', f'<{content_id}>')
+            image.add_header('Content-Disposition', 'inline', filename=f'{content_id}.png')
+            msg.attach(image)
+        
+        return msg
+    
+    def _send_custom_email(self, subject, body, inline_images=None):
+        """Send custom email with HTML body and optional inline images"""
         if not self.enabled:
             print("Email logging is disabled due to incomplete configuration.")
             return False
         
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
-            msg['To'] = self.recipient_email
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html'))
+            msg = self._build_message(subject, body, inline_images)
             
             server = smtplib.SMTP(self.smtp_server, self.smtp_port)
             server.starttls()
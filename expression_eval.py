@@ -0,0 +1,343 @@
+"""
+Expression Module for PowerPoint MCP Server
+Parses an arithmetic expression such as (a+b)*c^d once into validated,
+compiled code, caches the compiled form by text, and evaluates it for
+scalar variables or for whole vectors of inputs, in float, decimal or exact
+rational arithmetic
+"""
+
+import ast
+import math
+from decimal import Decimal, DecimalException, localcontext
+from fractions import Fraction
+
+from tool_cache import LRUCache, estimate_size
+
+MODES = ("float", "decimal", "fraction")
+
+MAX_LENGTH = 2000          # Characters in an expression
+MAX_NODES = 500            # Syntax tree nodes in an expression
+MAX_EXPONENT = 10000       # Largest |exponent| of a power
+MAX_RESULT_BITS = 1 << 16  # Largest exact power result, in bits
+MAX_PRECISION = 1000       # Significant digits in decimal mode
+MAX_ROWS = 100000          # Rows in one batched evaluation
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+class ExpressionError(ValueError):
+    """The expression is malformed, not allowed, or cannot be evaluated"""
+
+
+# Functions and constants per mode
+
+def _decimal_pi():
+    """pi to the current decimal precision (recipe from the decimal docs)"""
+    with localcontext() as ctx:
+        ctx.prec += 2
+        three = Decimal(3)
+        last, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != last:
+            last = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    return +s
+
+
+def _decimal_log(x, base=None):
+    x = Decimal(x)
+    return x.ln() if base is None else x.ln() / Decimal(base).ln()
+
+
+def _fraction_sqrt(x):
+    x = Fraction(x)
+    numerator, denominator = math.isqrt(x.numerator), math.isqrt(x.denominator)
+    if x < 0 or numerator * numerator != x.numerator or denominator * denominator != x.denominator:
+        raise ExpressionError(f"sqrt({x}) is not exact; use float or decimal mode")
+    return Fraction(numerator, denominator)
+
+
+_COMMON = {"abs": abs, "min": min, "max": max, "round": round,
+           "floor": math.floor, "ceil": math.ceil}
+
+FUNCTIONS = {
+    "float": dict(_COMMON, sqrt=math.sqrt, exp=math.exp, log=math.log, log10=math.log10,
+                  sin=math.sin, cos=math.cos, tan=math.tan),
+    "decimal": dict(_COMMON, sqrt=lambda x: Decimal(x).sqrt(), exp=lambda x: Decimal(x).exp(),
+                    log=_decimal_log, log10=lambda x: Decimal(x).log10()),
+    "fraction": dict(_COMMON, sqrt=_fraction_sqrt),
+}
+CONSTANTS = {"pi", "e"}
+ALL_FUNCTIONS = set().union(*FUNCTIONS.values())
+
+
+def _constants(mode):
+    if mode == "float":
+        return {"pi": math.pi, "e": math.e}
+    if mode == "decimal":
+        return {"pi": _decimal_pi(), "e": Decimal(1).exp()}
+    return {}
+
+
+def _number(value, mode):
+    """Convert an input (number or numeric string such as "0.1" or "1/3") to the mode's type"""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, Decimal, Fraction)):
+        raise ExpressionError(f"Not a number: {value!r}")
+    try:
+        if mode == "decimal":
+            return Decimal(value) if isinstance(value, (int, Decimal)) else Decimal(str(value))
+        if mode == "fraction":
+            return Fraction(value) if isinstance(value, (int, Fraction)) else Fraction(str(value))
+        if isinstance(value, str):
+            return int(value) if value.strip().lstrip("+-").isdigit() else float(Fraction(value))
+        return value
+    except (ValueError, ZeroDivisionError, ArithmeticError) as e:
+        raise ExpressionError(f"Not a number: {value!r}") from e
+
+
+def _checked_pow(base, exponent):
+    """base ** exponent, refusing results too large to compute quickly or exactly"""
+    integral = exponent == int(exponent) if isinstance(exponent, (int, Fraction, Decimal)) else exponent.is_integer()
+    if integral and abs(exponent) > MAX_EXPONENT:
+        raise ExpressionError(f"Exponent {exponent} exceeds {MAX_EXPONENT}")
+    if isinstance(base, Fraction):
+        if not integral:
+            raise ExpressionError("Non-integer powers are not exact; use float or decimal mode")
+        exponent = int(exponent)
+    if integral and isinstance(base, (int, Fraction)):
+        bits = max(abs(base.numerator).bit_length(), base.denominator.bit_length()) * abs(int(exponent))
+        if bits > MAX_RESULT_BITS:
+            raise ExpressionError(f"Power result would exceed {MAX_RESULT_BITS} bits")
+    result = base ** exponent
+    if isinstance(result, complex):
+        raise ExpressionError(f"({base}) ** ({exponent}) is not a real number")
+    return result
+
+
+# Compilation
+
+class _Rewriter(ast.NodeTransformer):
+    """Constants become names bound per mode; powers become guarded calls"""
+
+    def __init__(self):
+        self.constants = []
+
+    def visit_Constant(self, node):
+        self.constants.append(node.value)
+        return ast.copy_location(ast.Name(f"_k{len(self.constants) - 1}", ast.Load()), node)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            call = ast.Call(ast.Name("_pow", ast.Load()), [node.left, node.right], [])
+            return ast.copy_location(call, node)
+        return node
+
+
+def _validate(tree):
+    """Allow only numbers, names, arithmetic and calls to known functions"""
+    variables = set()
+    nodes = 0
+    for node in ast.walk(tree):
+        nodes += 1
+        if nodes > MAX_NODES:
+            raise ExpressionError(f"Expression has more than {MAX_NODES} nodes")
+        if isinstance(node, (ast.Expression, ast.Load)) or isinstance(node, _BINARY_OPERATORS + _UNARY_OPERATORS):
+            continue
+        if isinstance(node, ast.BinOp):
+            if not isinstance(node.op, _BINARY_OPERATORS):
+                raise ExpressionError(f"Operator {type(node.op).__name__} is not allowed")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, _UNARY_OPERATORS):
+                raise ExpressionError(f"Operator {type(node.op).__name__} is not allowed")
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ExpressionError(f"Only numeric literals are allowed, got {node.value!r}")
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in ALL_FUNCTIONS:
+                name = node.func.id if isinstance(node.func, ast.Name) else ast.unparse(node.func)
+                raise ExpressionError(f"Unknown function {name}; known: {', '.join(sorted(ALL_FUNCTIONS))}")
+            if node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+                raise ExpressionError(f"{node.func.id}() takes positional arguments only")
+        elif isinstance(node, ast.Name):
+            if node.id.startswith("_"):
+                raise ExpressionError(f"Names may not start with an underscore: {node.id}")
+            if node.id not in ALL_FUNCTIONS and node.id not in CONSTANTS:
+                variables.add(node.id)
+        else:
+            raise ExpressionError(f"{type(node).__name__} is not allowed in an expression")
+    called = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in ALL_FUNCTIONS and id(node) not in called:
+            raise ExpressionError(f"{node.id} is a function; call it as {node.id}(...)")
+    return variables
+
+
+class CompiledExpression:
+    __slots__ = ("text", "code", "variables", "constants", "functions", "nbytes", "_namespaces")
+
+    def __init__(self, text, code, variables, constants, functions):
+        self.text = text
+        self.code = code
+        self.variables = variables          # Sorted names that must be supplied
+        self.constants = constants          # Literal values, bound as _k0, _k1, ...
+        self.functions = functions          # Function names the expression calls
+        self.nbytes = len(code.co_code) + estimate_size(constants) + 64 * len(code.co_names)
+        self._namespaces = {}
+
+    def namespace(self, mode):
+        """Globals for evaluating in a mode: functions, constants and literals of that type"""
+        namespace = self._namespaces.get(mode)
+        if namespace is None:
+            missing = [name for name in self.functions if name not in FUNCTIONS[mode]]
+            if missing:
+                raise ExpressionError(f"{', '.join(missing)} not available in {mode} mode")
+            namespace = {"__builtins__": {}, "_pow": _checked_pow}
+            namespace.update(FUNCTIONS[mode])
+            namespace.update(_constants(mode))
+            namespace.update((f"_k{i}", _number(value, mode)) for i, value in enumerate(self.constants))
+            self._namespaces[mode] = namespace
+        return namespace
+
+
+def compile_expression(text):
+    """
+    Parse, validate and compile an arithmetic expression
+
+    ^ and ** both mean power (right-associative, binding tighter than
+    * and /). Names other than functions and constants are variables.
+
+    Raises:
+        ExpressionError: Syntax error or anything beyond arithmetic
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise ExpressionError("Expression is empty")
+    if len(text) > MAX_LENGTH:
+        raise ExpressionError(f"Expression is longer than {MAX_LENGTH} characters")
+    try:
+        # Python's ^ is XOR with a lower precedence than +, so rewrite it
+        tree = ast.parse(text.strip().replace("^", "**"), mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression: {e.msg}") from None
+    variables = _validate(tree)
+    functions = sorted({node.func.id for node in ast.walk(tree) if isinstance(node, ast.Call)})
+    rewriter = _Rewriter()
+    tree = ast.fix_missing_locations(rewriter.visit(tree))
+    code = compile(tree, "<expression>", "eval")
+    return CompiledExpression(text, code, tuple(sorted(variables)), tuple(rewriter.constants), functions)
+
+
+# Evaluation
+
+def _run(compiled, namespace, env):
+    try:
+        return eval(compiled.code, namespace, env)
+    except ExpressionError:
+        raise
+    except ZeroDivisionError:
+        raise ExpressionError("Division by zero") from None
+    except (ArithmeticError, DecimalException, ValueError, TypeError) as e:
+        raise ExpressionError(f"Cannot evaluate {compiled.text!r}: {e}") from None
+
+
+def _check_variables(compiled, names):
+    missing = [name for name in compiled.variables if name not in names]
+    if missing:
+        raise ExpressionError(f"Missing variables: {', '.join(missing)}")
+
+
+def evaluate(compiled, variables=None, mode="float", precision=28):
+    """
+    Evaluate a compiled expression once
+
+    Args:
+        variables (dict): Name -> number (or numeric string, e.g. "0.1", "1/3")
+        mode (str): "float", "decimal" (precision significant digits) or "fraction"
+
+    Returns:
+        int, float, Decimal or Fraction
+    """
+    if mode not in MODES:
+        raise ExpressionError(f"Unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+    variables = variables or {}
+    _check_variables(compiled, variables)
+    env = {name: _number(variables[name], mode) for name in compiled.variables}
+    if mode != "decimal":
+        return _run(compiled, compiled.namespace(mode), env)
+    with localcontext() as ctx:
+        ctx.prec = max(1, min(int(precision), MAX_PRECISION))
+        return +_run(compiled, compiled.namespace(mode), env)
+
+
+def evaluate_batch(compiled, vectors, variables=None, mode="float", precision=28):
+    """
+    Evaluate a compiled expression for every row of equally long vectors
+
+    Scalars in variables are shared by every row.
+
+    Returns:
+        list: One result per row
+    """
+    if mode not in MODES:
+        raise ExpressionError(f"Unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+    variables = variables or {}
+    lengths = {len(values) for values in vectors.values()}
+    if len(lengths) > 1:
+        raise ExpressionError(f"Vectors differ in length: {sorted(lengths)}")
+    rows = lengths.pop() if lengths else 0
+    if rows > MAX_ROWS:
+        raise ExpressionError(f"At most {MAX_ROWS} rows can be evaluated at once")
+    _check_variables(compiled, set(variables) | set(vectors))
+
+    shared = {name: _number(variables[name], mode) for name in compiled.variables
+              if name in variables and name not in vectors}
+    columns = [(name, [_number(value, mode) for value in vectors[name]])
+               for name in compiled.variables if name in vectors]
+    namespace = compiled.namespace(mode)
+    env = dict(shared)
+
+    def run_rows():
+        results = []
+        for row in range(rows):
+            for name, column in columns:
+                env[name] = column[row]
+            results.append(_run(compiled, namespace, env))
+        return results
+
+    if mode != "decimal":
+        return run_rows()
+    with localcontext() as ctx:
+        ctx.prec = max(1, min(int(precision), MAX_PRECISION))
+        return [+value for value in run_rows()]
+
+
+def to_json(value):
+    """Decimals and fractions as exact strings; ints and floats unchanged"""
+    if isinstance(value, (Decimal, Fraction)):
+        return str(value)
+    return value
+
+
+class ExpressionCompiler:
+    def __init__(self, max_entries=256, max_bytes=1024 * 1024):
+        """Compile expressions once and keep them in a bounded LRU keyed by text"""
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def compile(self, text):
+        """
+        Return the cached CompiledExpression for a text
+
+        Raises:
+            ExpressionError: The expression is not valid (errors are not cached)
+        """
+        hit, compiled = self._cache.get(text)
+        if not hit:
+            compiled = compile_expression(text)
+            self._cache.put(text, compiled, size=estimate_size(text) + compiled.nbytes)
+        return compiled
+
+    def stats(self):
+        return self._cache.stats()
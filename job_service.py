@@ -0,0 +1,344 @@
+"""
+Job Service Module for PowerPoint Automation Agent
+Long-running service that accepts agent jobs over a local HTTP API, keeps
+them in a persistent SQLite queue and runs them on a pool of async workers,
+each holding its own MCP session
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import anyio
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+STATUSES = ("queued", "running", "succeeded", "failed")
+
+# Transport failures of an MCP session (the server process is gone)
+CONNECTION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream,
+                     ConnectionError)
+CONNECTION_CLOSED = -32000  # mcp.types.CONNECTION_CLOSED
+
+
+class QueueFull(Exception):
+    """The queue holds max_queued jobs; the caller should retry later"""
+
+
+class SessionLost(Exception):
+    """A worker's MCP session broke during a job and has to be reopened"""
+
+
+def connection_lost(error):
+    """True if error, or an error it was raised from, means the session's transport is gone"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, CONNECTION_ERRORS):
+            return True
+        if getattr(getattr(error, "error", None), "code", None) == CONNECTION_CLOSED:
+            return True  # McpError: connection closed
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 6)
+
+
+class JobQueue:
+    def __init__(self, path=None, max_queued=100):
+        """
+        Persistent FIFO of jobs backed by SQLite
+
+        Args:
+            path (str): Database file (AGENT_JOB_DB or jobs.sqlite3)
+            max_queued (int): Submissions are refused while this many jobs are waiting
+        """
+        self.path = path or os.getenv("AGENT_JOB_DB", "jobs.sqlite3")
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                worker INTEGER,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                submitted REAL NOT NULL,
+                started REAL,
+                finished REAL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted)")
+        # Jobs interrupted by a crash or shutdown go back to the queue
+        self.requeued = self._db.execute(
+            "UPDATE jobs SET status = 'queued', worker = NULL, started = NULL "
+            "WHERE status = 'running'").rowcount
+
+    def submit(self, payload):
+        """Queue a job and return its id, or raise QueueFull"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            queued = self._db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                raise QueueFull(f"{queued} jobs already queued")
+            self._db.execute("INSERT INTO jobs (id, status, payload, submitted) VALUES (?, 'queued', ?, ?)",
+                             (job_id, json.dumps(payload), time.time()))
+        return job_id
+
+    def claim(self, worker):
+        """Atomically take the oldest queued job, or return None"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT id FROM jobs WHERE status = 'queued' "
+                                       "ORDER BY submitted, rowid LIMIT 1").fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE jobs SET status = 'running', worker = ?, started = ?, "
+                                     "attempts = attempts + 1 WHERE id = ?",
+                                     (worker, time.time(), row["id"]))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row is not None else None
+
+    def finish(self, job_id, result=None, error=None):
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+                             ("failed" if error else "succeeded",
+                              json.dumps(result) if result is not None else None,
+                              error, time.time(), job_id))
+
+    def get(self, job_id):
+        """Return the job as a dict with latency fields, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        job["queue_seconds"] = job["run_seconds"] = job["total_seconds"] = None
+        if job["started"] is not None:
+            job["queue_seconds"] = round(job["started"] - job["submitted"], 6)
+        if job["finished"] is not None:
+            job["run_seconds"] = round(job["finished"] - job["started"], 6)
+            job["total_seconds"] = round(job["finished"] - job["submitted"], 6)
+        return job
+
+    def counts(self):
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def latencies(self, limit=1000):
+        """Queue, run and total seconds of the most recently finished jobs"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT started - submitted, finished - started, finished - submitted FROM jobs "
+                "WHERE finished IS NOT NULL ORDER BY finished DESC LIMIT ?", (limit,)).fetchall()
+        metrics = {}
+        for index, name in enumerate(("queue", "run", "total")):
+            values = sorted(row[index] for row in rows)
+            metrics[name] = {"p50": _percentile(values, 0.50), "p95": _percentile(values, 0.95),
+                             "max": round(values[-1], 6) if values else None}
+        metrics["samples"] = len(rows)
+        return metrics
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobService:
+    def __init__(self, runner, session_factory, queue, workers=2, poll_interval=1.0, ping_timeout=5.0):
+        """
+        Pool of async workers draining a JobQueue
+
+        Args:
+            runner: async (session, payload) -> JSON-serializable result
+            session_factory: Returns an async context manager yielding an
+                initialized MCP session; each worker opens one and keeps it
+            queue (JobQueue): Persistent job queue
+            workers (int): Number of concurrent workers (and MCP sessions)
+            poll_interval (float): Seconds between queue checks when idle
+            ping_timeout (float): Seconds a session gets to answer the ping
+                sent after a failed job before it is reopened
+        """
+        self.runner = runner
+        self.session_factory = session_factory
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.ping_timeout = ping_timeout
+        self._wakeup = None
+        self._tasks = []
+        self.busy = 0
+        self.session_restarts = 0
+        self.started = None
+
+    def submit(self, payload):
+        job_id = self.queue.submit(payload)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    async def _next_job(self, number):
+        while True:
+            # Clear before claiming so a submission in between is not missed
+            self._wakeup.clear()
+            job = self.queue.claim(number)
+            if job is not None:
+                return job
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _session_alive(self, session):
+        """Ping the session; sessions without send_ping are assumed alive"""
+        ping = getattr(session, "send_ping", None)
+        if ping is None:
+            return True
+        try:
+            await asyncio.wait_for(ping(), self.ping_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return False
+        return True
+
+    async def _worker(self, number):
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    while True:
+                        job = await self._next_job(number)
+                        self.busy += 1
+                        try:
+                            result = await self.runner(session, job["payload"])
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            self.queue.finish(job["id"], error=f"{type(e).__name__}: {e}")
+                            # The agent may wrap a transport error, so ask the session itself
+                            if connection_lost(e) or not await self._session_alive(session):
+                                raise SessionLost(f"MCP session of worker {number} broke") from e
+                        else:
+                            self.queue.finish(job["id"], result=result)
+                        finally:
+                            self.busy -= 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The MCP session could not be opened or broke: reopen it
+                self.session_restarts += 1
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self.started = time.time()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def metrics(self):
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "alive": sum(1 for task in self._tasks if not task.done()),
+            "session_restarts": self.session_restarts,
+            "max_queued": self.queue.max_queued,
+            "uptime_seconds": round(time.time() - self.started, 3) if self.started else 0,
+            "jobs": self.queue.counts(),
+            "latency_seconds": self.queue.latencies(),
+        }
+
+    # HTTP API
+
+    async def _submit(self, request: Request):
+        try:
+            payload = await request.json()
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            return JSONResponse({"error": "Request body must be a JSON object"}, status_code=400)
+        try:
+            job_id = self.submit(payload)
+        except QueueFull as e:
+            return JSONResponse({"error": f"Queue full: {e}"}, status_code=429,
+                                headers={"Retry-After": str(max(1, int(self.poll_interval)))})
+        return JSONResponse({"id": job_id, "status": "queued"}, status_code=202,
+                            headers={"Location": f"/jobs/{job_id}"})
+
+    async def _status(self, request: Request):
+        job = self.queue.get(request.path_params["job_id"])
+        if job is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        job.pop("payload")
+        job.pop("result")
+        return JSONResponse(job)
+
+    async def _result(self, request: Request):
+        job = self.queue.get(request.path_params["job_id"])
+        if job is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        if job["status"] in ("queued", "running"):
+            return JSONResponse({"id": job["id"], "status": job["status"]}, status_code=409)
+        return JSONResponse({"id": job["id"], "status": job["status"],
+                             "result": job["result"], "error": job["error"]})
+
+    async def _metrics(self, request: Request):
+        return JSONResponse(self.metrics())
+
+    def app(self):
+        """Return the Starlette application; workers run for the app's lifetime"""
+        @asynccontextmanager
+        async def lifespan(app):
+            await self.start()
+            try:
+                yield
+            finally:
+                await self.stop()
+
+        return Starlette(lifespan=lifespan, routes=[
+            Route("/jobs", self._submit, methods=["POST"]),
+            Route("/jobs/{job_id}", self._status, methods=["GET"]),
+            Route("/jobs/{job_id}/result", self._result, methods=["GET"]),
+            Route("/metrics", self._metrics, methods=["GET"]),
+        ])
+
+
+def serve(runner, session_factory, host="127.0.0.1", port=8080, workers=2,
+          max_queued=100, db_path=None):
+    """Run the job service until interrupted"""
+    import uvicorn
+
+    queue = JobQueue(db_path, max_queued=max_queued)
+    service = JobService(runner, session_factory, queue, workers=workers)
+    try:
+        uvicorn.run(service.app(), host=host, port=port, log_level="warning")
+    finally:
+        queue.close()
@@ -0,0 +1,141 @@
+"""
+Keystroke Compiler Module for PowerPoint MCP Server
+Compiles high-level GUI commands ("insert rectangle") into one coalesced
+pywinauto keystroke script that is sent in a single type_keys call and
+followed by one readiness wait, instead of a call and a fixed sleep per key
+"""
+
+import threading
+from collections import deque
+
+import tool_deadlines
+
+# Ribbon KeyTip sequences. "ALT" taps Alt to show the KeyTips; other tokens
+# are single keys or pywinauto modifier chords such as "^n"
+DEFAULT_PAUSE = 0.5  # KeyTips can take this long to appear on a slow or remote desktop
+COMMANDS = {
+    "insert rectangle": ("ALT", "i", "s", "r"),     # Insert → Shapes → Rectangle
+    "insert text box": ("ALT", "i", "x"),           # Insert → Text Box
+    "new presentation": ("^n",),
+}
+
+_NAMED_KEYS = {
+    "ALT": "{VK_MENU}",
+    "ENTER": "{ENTER}",
+    "ESC": "{ESC}",
+    "TAB": "{TAB}",
+}
+# Characters pywinauto treats as syntax; typed literally they need braces
+_SPECIAL = set("+^%~(){}[]")
+
+
+class CompiledScript:
+    __slots__ = ("command", "keys", "key_count", "pause", "ready_timeout")
+
+    def __init__(self, command, keys, key_count, pause, ready_timeout):
+        self.command = command
+        self.keys = keys                    # One pywinauto type_keys string
+        self.key_count = key_count
+        self.pause = pause                  # Seconds between keys inside the script
+        self.ready_timeout = ready_timeout  # Seconds to wait for the window afterwards
+
+    def actions(self):
+        """The action stream this script performs, as plain tuples"""
+        return [("type_keys", self.keys, self.pause), ("wait", "ready", self.ready_timeout)]
+
+
+def _escape(char):
+    return "{" + char + "}" if char in _SPECIAL else char
+
+
+def compile_tokens(tokens):
+    """Join command tokens into one type_keys string"""
+    keys = []
+    for token in tokens:
+        if token in _NAMED_KEYS:
+            keys.append(_NAMED_KEYS[token])
+        elif len(token) == 2 and token[0] in "^%+":
+            keys.append(token[0] + _escape(token[1]))  # modifier chord
+        elif len(token) == 1:
+            keys.append(_escape(token))
+        else:
+            raise ValueError(f"Unsupported key token: {token!r}")
+    return "".join(keys)
+
+
+class ActionCompiler:
+    def __init__(self, commands=None, pause=DEFAULT_PAUSE, ready_timeout=5.0):
+        """
+        Compile and cache keystroke scripts per command
+
+        Args:
+            commands (dict): Command name -> key tokens (COMMANDS by default)
+            pause (float): Seconds between keys, enough for KeyTips to render;
+                lower it only on desktops measured to show them sooner
+            ready_timeout (float): Upper bound of the readiness wait after a script
+        """
+        self.commands = dict(COMMANDS if commands is None else commands)
+        self.pause = pause
+        self.ready_timeout = ready_timeout
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(command):
+        return " ".join(command.lower().split())
+
+    def compile(self, command):
+        """
+        Return the cached CompiledScript for a command
+
+        Raises:
+            KeyError: Unknown command
+        """
+        name = self.normalize(command)
+        with self._lock:
+            script = self._cache.get(name)
+            if script is not None:
+                self.hits += 1
+                return script
+            self.misses += 1
+        if name not in self.commands:
+            raise KeyError(f"Unknown GUI command {command!r}; known: {', '.join(sorted(self.commands))}")
+        tokens = self.commands[name]
+        script = CompiledScript(name, compile_tokens(tokens), len(tokens), self.pause, self.ready_timeout)
+        with self._lock:
+            self._cache[name] = script
+        return script
+
+    def stats(self):
+        with self._lock:
+            return {"commands": len(self.commands), "compiled": len(self._cache),
+                    "hits": self.hits, "misses": self.misses}
+
+
+class KeystrokeRunner:
+    def __init__(self, dry_run=False):
+        """
+        Execute compiled scripts against a pywinauto window
+
+        In dry-run mode nothing is sent: the action stream is recorded and
+        returned, so scripts can be checked on hosts without a desktop.
+        """
+        self.dry_run = dry_run
+        self.recorded = deque(maxlen=256)
+
+    def execute(self, script, window=None):
+        """
+        Send the script's keys in one call, then wait once for the window
+
+        Returns:
+            list: The actions performed (or that would have been performed)
+        """
+        actions = script.actions()
+        if self.dry_run:
+            self.recorded.extend(actions)
+            return actions
+        window.type_keys(script.keys, pause=script.pause)
+        window.wait("ready", timeout=tool_deadlines.remaining(script.ready_timeout), retry_interval=0.05)
+        return actions
@@ -0,0 +1,289 @@
+"""
+LLM Client Module for PowerPoint Automation Agent
+Async-native clients for Gemini and OpenAI-compatible HTTP APIs that share
+one keep-alive connection pool and cancel the request on timeout, plus a
+bounded executor adapter for providers that only offer a synchronous SDK.
+The static prefix of a PrefixedPrompt is registered with Gemini's context
+cache once and referenced by handle afterwards
+"""
+
+import abc
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from prompt_cache import prefix_cache_from_env, prefix_key
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+
+class LLMError(Exception):
+    def __init__(self, message, status=None):
+        """The provider returned an error or an unusable response"""
+        super().__init__(message)
+        self.status = status
+
+
+class LLMResponse:
+    __slots__ = ("text", "raw", "tokens", "cached_tokens")
+
+    def __init__(self, text, raw=None, tokens=None, cached_tokens=None):
+        """
+        Provider-independent response; .text matches the SDK response attribute
+
+        Args:
+            tokens (int): Total tokens billed for the call, when reported
+            cached_tokens (int): Prompt tokens served from the provider's
+                cache instead of being processed again, when reported
+        """
+        self.text = text
+        self.raw = raw
+        self.tokens = tokens
+        self.cached_tokens = cached_tokens
+
+
+class AsyncLLMClient(abc.ABC):
+    def __init__(self, model=DEFAULT_MODEL, timeout=10.0):
+        """
+        Base class for async LLM clients; subclasses implement _generate
+
+        Args:
+            model (str): Model name sent to the provider
+            timeout (float): Default seconds before a call is cancelled
+        """
+        self.model = model
+        self.timeout = timeout
+        self.calls = 0
+        self.timeouts = 0
+
+    @abc.abstractmethod
+    async def _generate(self, prompt):
+        """Send one request and return an LLMResponse (no timeout handling)"""
+
+    async def generate(self, prompt, timeout=None):
+        """
+        Generate a response, cancelling the underlying request on timeout
+
+        Raises:
+            TimeoutError: No response within the timeout
+            LLMError: The provider rejected the request
+        """
+        self.calls += 1
+        try:
+            return await asyncio.wait_for(self._generate(prompt), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"LLM call timed out after {timeout or self.timeout}s") from None
+
+    async def aclose(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def stats(self):
+        return {"provider": type(self).__name__, "model": self.model,
+                "calls": self.calls, "timeouts": self.timeouts}
+
+
+class _HTTPClient(AsyncLLMClient):
+    def __init__(self, base_url, headers, model=DEFAULT_MODEL, timeout=10.0,
+                 max_connections=4, keepalive_expiry=60.0):
+        """
+        Shared httpx connection pool for HTTP providers
+
+        The pool is created lazily inside the running event loop and reused
+        for every call, so only the first request pays for TCP/TLS setup.
+        """
+        super().__init__(model, timeout)
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_connections,
+                                   keepalive_expiry=keepalive_expiry)
+        self._http = None
+
+    def _client(self):
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(base_url=self.base_url, headers=self.headers,
+                                           limits=self.limits, timeout=None)
+        return self._http
+
+    async def _post(self, path, payload):
+        response = await self._client().post(path, json=payload)
+        if response.status_code >= 400:
+            raise LLMError(f"{response.status_code} from {path}: {response.text[:200]}",
+                           response.status_code)
+        return response.json()
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+class GeminiClient(_HTTPClient):
+    def __init__(self, api_key, base_url=GEMINI_BASE_URL, prefix_cache=None, **kwargs):
+        """
+        Gemini generateContent over a pooled keep-alive connection
+
+        Args:
+            prefix_cache (PrefixCache): Registry of cachedContents handles;
+                without one, every call sends the full prompt
+        """
+        super().__init__(base_url, {"x-goog-api-key": api_key or ""}, **kwargs)
+        self.prefix_cache = prefix_cache
+
+    async def _create_cached_prefix(self, prefix):
+        data = await self._post("/cachedContents", {
+            "model": f"models/{self.model}",
+            "systemInstruction": {"parts": [{"text": prefix}]},
+            "ttl": f"{self.prefix_cache.ttl:g}s",
+        })
+        return data["name"]
+
+    async def _generate(self, prompt):
+        prefix = getattr(prompt, "prefix", None)
+        if prefix and self.prefix_cache is not None:
+            key = prefix_key(self.model, prefix)
+            handle = await self.prefix_cache.handle(key, prefix, lambda: self._create_cached_prefix(prefix))
+            if handle:
+                try:
+                    data = await self._post(f"/models/{self.model}:generateContent", {
+                        "cachedContent": handle,
+                        "contents": [{"role": "user", "parts": [{"text": prompt.suffix}]}],
+                    })
+                except LLMError as e:
+                    if e.status not in (400, 403, 404):
+                        raise
+                    # Expired or deleted on the provider side: send it all
+                    self.prefix_cache.invalidate(key)
+                else:
+                    response = self._response(data)
+                    self.prefix_cache.record(response.cached_tokens)
+                    return response
+        return self._response(await self._post(f"/models/{self.model}:generateContent",
+                                               {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}))
+
+    @staticmethod
+    def _response(data):
+        try:
+            parts = data["candidates"][0]["content"]["parts"]
+        except (KeyError, IndexError) as e:
+            raise LLMError(f"Unexpected Gemini response: {str(data)[:200]}") from e
+        usage = data.get("usageMetadata", {})
+        return LLMResponse("".join(part.get("text", "") for part in parts), data,
+                           usage.get("totalTokenCount"), usage.get("cachedContentTokenCount"))
+
+    def stats(self):
+        stats = super().stats()
+        if self.prefix_cache is not None:
+            stats["prefix_cache"] = self.prefix_cache.stats()
+        return stats
+
+
+class OpenAICompatibleClient(_HTTPClient):
+    def __init__(self, api_key, base_url=OPENAI_BASE_URL, **kwargs):
+        """OpenAI-style /chat/completions over a pooled keep-alive connection"""
+        super().__init__(base_url, {"Authorization": f"Bearer {api_key or ''}"}, **kwargs)
+
+    async def _generate(self, prompt):
+        # The provider caches long repeated prompt prefixes by itself
+        data = await self._post("/chat/completions", {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+        })
+        try:
+            text = data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError) as e:
+            raise LLMError(f"Unexpected chat completion response: {str(data)[:200]}") from e
+        usage = data.get("usage") or {}
+        return LLMResponse(text or "", data, usage.get("total_tokens"),
+                           (usage.get("prompt_tokens_details") or {}).get("cached_tokens"))
+
+
+class ExecutorLLMClient(AsyncLLMClient):
+    def __init__(self, generate_fn, model=DEFAULT_MODEL, timeout=10.0, max_workers=2):
+        """
+        Adapter for synchronous SDKs
+
+        Calls run on a small dedicated executor rather than the loop's
+        default pool. A call that times out while still queued is
+        cancelled; one already running cannot be interrupted, but it only
+        occupies one of max_workers threads and is counted as abandoned.
+
+        Args:
+            generate_fn: Callable (model, prompt) -> object with a .text attribute
+            max_workers (int): Maximum concurrent SDK calls
+        """
+        super().__init__(model, timeout)
+        self.generate_fn = generate_fn
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-sync")
+        self.abandoned = 0
+
+    async def _generate(self, prompt):
+        return await asyncio.wrap_future(self._executor.submit(self.generate_fn, self.model, prompt))
+
+    async def generate(self, prompt, timeout=None):
+        # Not via _generate: a timed-out call needs its executor future
+        self.calls += 1
+        future = self._executor.submit(self.generate_fn, self.model, prompt)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if not future.cancel():
+                self.abandoned += 1
+            raise TimeoutError(f"LLM call timed out after {timeout or self.timeout}s") from None
+
+    async def aclose(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({"max_workers": self.max_workers, "abandoned": self.abandoned})
+        return stats
+
+
+def genai_sdk_client(api_key, **kwargs):
+    """Wrap the synchronous google-genai SDK in an ExecutorLLMClient"""
+    from google import genai
+
+    sdk = genai.Client(api_key=api_key)
+    return ExecutorLLMClient(
+        lambda model, prompt: sdk.models.generate_content(model=model, contents=prompt), **kwargs)
+
+
+def create_client(provider=None, api_key=None, base_url=None, model=None, timeout=None):
+    """
+    Build the client selected by the environment
+
+    LLM_PROVIDER: gemini (default), openai or genai-sdk
+    LLM_BASE_URL: override the API endpoint, e.g. the local stand-in server
+    LLM_MODEL, LLM_TIMEOUT: model name and default timeout in seconds
+    LLM_PREFIX_CACHE*: Gemini prompt prefix caching (see prompt_cache)
+    """
+    provider = (provider or os.getenv("LLM_PROVIDER", "gemini")).lower()
+    base_url = base_url or os.getenv("LLM_BASE_URL")
+    kwargs = {
+        "model": model or os.getenv("LLM_MODEL", DEFAULT_MODEL),
+        "timeout": timeout or float(os.getenv("LLM_TIMEOUT", "10")),
+    }
+    if provider == "gemini":
+        return GeminiClient(api_key or os.getenv("GEMINI_API_KEY"),
+                            base_url=base_url or GEMINI_BASE_URL,
+                            prefix_cache=prefix_cache_from_env(), **kwargs)
+    if provider == "openai":
+        return OpenAICompatibleClient(api_key or os.getenv("OPENAI_API_KEY"),
+                                      base_url=base_url or OPENAI_BASE_URL, **kwargs)
+    if provider == "genai-sdk":
+        return genai_sdk_client(api_key or os.getenv("GEMINI_API_KEY"), **kwargs)
+    raise ValueError(f"Unknown LLM provider: {provider}")
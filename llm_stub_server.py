@@ -0,0 +1,209 @@
+"""
+Local LLM Stand-in Server for PowerPoint Automation Agent
+Serves Gemini generateContent and OpenAI chat/completions endpoints with
+scripted replies and configurable latency, so the agent and the LLM client
+can be exercised without network access or an API key. Gemini cachedContents
+handles are honoured: a cached prefix is stored once and prepended to every
+request that references it until it expires
+
+Usage:
+    python llm_stub_server.py --port 8089 --delay 0.2 --reply "FINAL_ANSWER: [42]"
+    LLM_BASE_URL=http://127.0.0.1:8089/v1beta python powerpoint_working_agent.py
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import socket
+import threading
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class StubLLMServer:
+    def __init__(self, replies=("FINAL_ANSWER: [42]",), delay=0.0, host="127.0.0.1", port=0,
+                 max_cache_ttl=None):
+        """
+        Scripted LLM endpoint
+
+        Args:
+            replies (list): Reply texts, returned in order and cycled
+            delay (float): Seconds each request takes to answer
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free port
+            max_cache_ttl (float): Cap on the TTL of cached prefixes, e.g.
+                to make them expire early; None honours the requested TTL
+        """
+        self.delay = delay
+        self.max_cache_ttl = max_cache_ttl
+        self.host = host
+        self.port = port or self._free_port(host)
+        self._replies = itertools.cycle(list(replies))
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.connections = set()
+        self.prompts = []
+        self.caches = {}        # name -> (cached text, expires at)
+        self.cached_requests = 0
+        self._server = None
+        self._thread = None
+        self.app = Starlette(routes=[
+            Route("/v1beta/models/{model}:generateContent", self._gemini, methods=["POST"]),
+            Route("/v1beta/cachedContents", self._create_cache, methods=["POST"]),
+            Route("/v1/chat/completions", self._openai, methods=["POST"]),
+            Route("/stats", self._stats, methods=["GET"]),
+        ])
+
+    @staticmethod
+    def _free_port(host):
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
+    @property
+    def gemini_url(self):
+        return f"http://{self.host}:{self.port}/v1beta"
+
+    @property
+    def openai_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def _answer(self, request, prompt):
+        """Wait out the delay, stopping early if the client goes away"""
+        with self._lock:
+            self.requests += 1
+            self.connections.add(request.client)
+            self.prompts.append(prompt)
+            reply = next(self._replies)
+        deadline = time.monotonic() + self.delay
+        while time.monotonic() < deadline:
+            if await request.is_disconnected():
+                with self._lock:
+                    self.abandoned += 1
+                return None
+            await asyncio.sleep(min(0.02, max(0.0, deadline - time.monotonic())))
+        with self._lock:
+            self.completed += 1
+        return reply
+
+    @staticmethod
+    def _gemini_text(body):
+        contents = body.get("contents", [])
+        instruction = body.get("systemInstruction")
+        if instruction:
+            contents = [instruction] + contents
+        return "".join(part.get("text", "") for content in contents for part in content.get("parts", []))
+
+    async def _create_cache(self, request: Request):
+        body = await request.json()
+        text = self._gemini_text(body)
+        ttl = float(str(body.get("ttl", "3600s")).rstrip("s"))
+        if self.max_cache_ttl is not None:
+            ttl = min(ttl, self.max_cache_ttl)
+        with self._lock:
+            name = f"cachedContents/stub{len(self.caches) + 1}"
+            self.caches[name] = (text, time.monotonic() + ttl)
+        expires = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + ttl))
+        return JSONResponse({"name": name, "model": body.get("model", ""), "expireTime": expires,
+                             "usageMetadata": {"totalTokenCount": len(text) // 4}})
+
+    async def _gemini(self, request: Request):
+        body = await request.json()
+        prompt = self._gemini_text(body)
+        cached = ""
+        name = body.get("cachedContent")
+        if name:
+            with self._lock:
+                cached, expires = self.caches.get(name, ("", 0.0))
+                if time.monotonic() >= expires:
+                    self.caches.pop(name, None)
+                    return JSONResponse({"error": {"code": 404, "status": "NOT_FOUND",
+                                                   "message": f"CachedContent not found: {name}"}},
+                                        status_code=404)
+                self.cached_requests += 1
+            prompt = cached + prompt
+        reply = await self._answer(request, prompt)
+        usage = {"promptTokenCount": len(prompt) // 4,
+                 "candidatesTokenCount": len(reply or "") // 4,
+                 "totalTokenCount": (len(prompt) + len(reply or "")) // 4}
+        if cached:
+            usage["cachedContentTokenCount"] = len(cached) // 4
+        return JSONResponse({
+            "candidates": [{"content": {"role": "model", "parts": [{"text": reply or ""}]},
+                            "finishReason": "STOP"}],
+            "usageMetadata": usage,
+            "modelVersion": request.path_params["model"],
+        })
+
+    async def _openai(self, request: Request):
+        body = await request.json()
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+        reply = await self._answer(request, prompt)
+        return JSONResponse({
+            "object": "chat.completion",
+            "model": body.get("model", ""),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": reply or ""}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(reply or "") // 4,
+                      "total_tokens": (len(prompt) + len(reply or "")) // 4},
+        })
+
+    async def _stats(self, request: Request):
+        return JSONResponse(self.stats())
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "completed": self.completed,
+                    "abandoned": self.abandoned, "connections": len(self.connections),
+                    "caches": len(self.caches), "cached_requests": self.cached_requests}
+
+    def start(self):
+        """Serve in a background thread and return once the port is listening"""
+        config = uvicorn.Config(self.app, host=self.host, port=self.port,
+                                log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"Stand-in LLM server failed to start on port {self.port}")
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Gemini/OpenAI-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--reply", action="append", help="reply text (repeat to cycle through several)")
+    parser.add_argument("--replies", help="JSON file containing a list of reply texts")
+    args = parser.parse_args()
+
+    replies = args.reply or ["FINAL_ANSWER: [42]"]
+    if args.replies:
+        with open(args.replies, encoding="utf-8") as f:
+            replies = json.load(f)
+    server = StubLLMServer(replies, delay=args.delay, host=args.host, port=args.port)
+    print(f"Gemini endpoint: {server.gemini_url}  OpenAI endpoint: {server.openai_url}")
+    uvicorn.run(server.app, host=args.host, port=args.port, log_level="warning")
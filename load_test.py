@@ -0,0 +1,266 @@
+"""
+Load Test Module for PowerPoint MCP Server
+Spawns N server processes over the stdio MCP transport, each driven by its
+own client process running a share of M concurrent clients, sends a weighted
+mix of math and rendering calls, and reports throughput, latency percentiles
+and CPU/RSS per process as the counts scale. Rendering writes .pptx files to
+a temporary directory, so no PowerPoint is needed
+
+Usage:
+    python load_test.py --processes 1,2,4 --clients 4,16,64 --duration 5
+    python load_test.py --mix math=1,render=1 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "powerpoint_working_mcp_server.py")
+DEFAULT_MIX = {"math": 9, "render": 1}
+WORDS = ("INDIA", "POWERPOINT", "LATENCY", "THROUGHPUT", "MCP")
+
+# Servers under load: no PowerPoint prewarm, quiet logs, no strategy file
+SERVER_ENV = {"PPT_POOL_PREWARM": "0", "PPT_MCP_LOG_LEVEL": "ERROR", "FASTMCP_LOG_LEVEL": "WARNING",
+              "PPT_STRATEGY_STATS": ""}
+
+
+def math_call(rng, client, directory):
+    """A random call to one of the pure math tools"""
+    choice = rng.randrange(5)
+    if choice == 0:
+        return "add", {"a": rng.randint(0, 10**6), "b": rng.randint(0, 10**6)}
+    if choice == 1:
+        return "multiply", {"a": rng.randint(0, 10**6), "b": rng.randint(0, 10**6)}
+    if choice == 2:
+        return "power", {"a": rng.randint(2, 9), "b": rng.randint(2, 64)}
+    if choice == 3:
+        return "strings_to_chars_to_int", {"string": rng.choice(WORDS)}
+    return "int_list_to_exponential_sum", {"int_list": [rng.randint(60, 90) for _ in range(5)]}
+
+
+def render_call(rng, client, directory):
+    """A deck or shape-layout render to a .pptx file (no PowerPoint involved)"""
+    path = os.path.join(directory, f"client{client}-{rng.randrange(2)}.pptx")
+    if rng.random() < 0.5:
+        rows = [{"value": rng.randint(1, 10**9), "title": f"Result {i}"} for i in range(rng.randint(1, 8))]
+        return "render_deck", {"rows": rows, "output_path": path}
+    items = [f"Item {i}" for i in range(rng.randint(5, 40))]
+    return "place_shapes", {"items": items, "layout": rng.choice(("grid", "flow")), "output_path": path}
+
+
+CALL_KINDS = {"math": math_call, "render": render_call}
+
+
+def parse_mix(text):
+    """
+    Parse "math=9,render=1" into call-kind weights
+
+    Raises:
+        ValueError: Unknown kind or non-positive total weight
+    """
+    mix = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in CALL_KINDS:
+            raise ValueError(f"Unknown call kind {kind!r}; expected one of {', '.join(CALL_KINDS)}")
+        mix[kind] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0 or min(mix.values()) < 0:
+        raise ValueError(f"Invalid mix {text!r}")
+    return mix
+
+
+def parse_counts(text):
+    return sorted({int(part) for part in text.split(",") if part.strip()})
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies):
+    """Call count and p50/p95/p99/max latency in milliseconds"""
+    values = sorted(latencies)
+    summary = {"calls": len(values)}
+    for label, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99), ("max_ms", 1.0)):
+        value = percentile(values, fraction)
+        summary[label] = round(value * 1000, 3) if value is not None else None
+    return summary
+
+
+def _result_failed(result):
+    if getattr(result, "isError", False):
+        return True
+    content = getattr(result, "content", None) or []
+    text = getattr(content[0], "text", "") if content else ""
+    return text.startswith("ERROR")
+
+
+async def _server_process_stats(session):
+    result = await session.call_tool("server_metrics", {})
+    return json.loads(result.content[0].text)["process"]
+
+
+async def _drive(server_index, clients, barrier, warmup, duration, mix, seed, directory):
+    """Start one server process, then run its clients until the window closes"""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=[SERVER_SCRIPT],
+                                   env=dict(os.environ, **SERVER_ENV))
+    kinds, weights = list(mix), list(mix.values())
+    samples = []          # (kind, seconds, failed) for calls started inside the window
+
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.call_tool("add", {"a": 1, "b": 1})   # first-call imports
+            # All drivers start together once every server is up
+            await asyncio.to_thread(barrier.wait)
+            measure_from = time.perf_counter() + warmup
+            stop_at = measure_from + duration
+
+            before = await _server_process_stats(session)
+            cpu_started = time.process_time()
+
+            async def client(client_id):
+                rng = random.Random(seed * 1_000_003 + client_id)
+                while True:
+                    started = time.perf_counter()
+                    if started >= stop_at:
+                        return
+                    kind = rng.choices(kinds, weights)[0]
+                    name, arguments = CALL_KINDS[kind](rng, client_id, directory)
+                    try:
+                        failed = _result_failed(await session.call_tool(name, arguments))
+                    except Exception:
+                        failed = True
+                    if started >= measure_from:
+                        samples.append((kind, time.perf_counter() - started, failed))
+
+            await asyncio.gather(*(client(server_index * 100_000 + i) for i in range(clients)))
+            window = time.perf_counter() - measure_from
+            after = await _server_process_stats(session)
+            client_cpu = time.process_time() - cpu_started
+
+    return {
+        "server_pid": after["pid"],
+        "clients": clients,
+        "samples": samples,
+        "window_seconds": window,
+        # CPU over the whole run (warmup included), as a share of one core
+        "server_cpu_percent": round((after["cpu_seconds"] - before["cpu_seconds"]) / (window + warmup) * 100, 1),
+        "server_rss_bytes": after["rss_bytes"],
+        "server_peak_rss_bytes": after["peak_rss_bytes"],
+        "client_cpu_percent": round(client_cpu / (window + warmup) * 100, 1),
+    }
+
+
+def _driver_main(job):
+    """Entry point of one driver process (must be importable for spawn)"""
+    return asyncio.run(_drive(**job))
+
+
+def run_point(processes, clients, duration=5.0, warmup=1.0, mix=None, seed=0, startup_timeout=60.0):
+    """
+    Measure one (server processes, clients) combination
+
+    Clients are spread evenly over the server processes; each server is
+    driven from its own client process, so the harness is not the bottleneck.
+
+    Returns:
+        dict: Throughput, overall and per-kind latency, and per-process usage
+    """
+    mix = dict(mix or DEFAULT_MIX)
+    shares = [clients // processes + (1 if i < clients % processes else 0) for i in range(processes)]
+    shares = [share for share in shares if share]
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory, context.Manager() as manager:
+        barrier = manager.Barrier(len(shares), timeout=startup_timeout)
+        jobs = [{"server_index": i, "clients": share, "barrier": barrier, "warmup": warmup,
+                 "duration": duration, "mix": mix, "seed": seed, "directory": directory}
+                for i, share in enumerate(shares)]
+        with ProcessPoolExecutor(max_workers=len(jobs), mp_context=context) as executor:
+            drivers = list(executor.map(_driver_main, jobs, timeout=startup_timeout + warmup + duration))
+
+    samples = [sample for driver in drivers for sample in driver.pop("samples")]
+    window = max(driver["window_seconds"] for driver in drivers)
+    by_kind = {}
+    for kind, seconds, _ in samples:
+        by_kind.setdefault(kind, []).append(seconds)
+    return {
+        "processes": processes,
+        "clients": clients,
+        "duration_seconds": round(window, 3),
+        "errors": sum(failed for _, _, failed in samples),
+        "throughput_per_second": round(len(samples) / window, 1) if window > 0 else None,
+        "latency": latency_summary([seconds for _, seconds, _ in samples]),
+        "latency_by_kind": {kind: latency_summary(values) for kind, values in sorted(by_kind.items())},
+        "per_process": drivers,
+    }
+
+
+def _mb(value):
+    return f"{value / 2**20:.0f}" if value else "n/a"
+
+
+def print_report(results):
+    print(f"{'procs':>5}{'clients':>8}{'calls':>9}{'errors':>7}{'calls/s':>10}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'srv cpu%':>10}{'srv rss MB':>12}{'drv cpu%':>10}")
+    print("-" * 98)
+    for result in results:
+        latency = result["latency"]
+        per_process = result["per_process"]
+        cpu = max(p["server_cpu_percent"] for p in per_process)
+        rss = max((p["server_rss_bytes"] or 0) for p in per_process)
+        driver_cpu = max(p["client_cpu_percent"] for p in per_process)
+        print(f"{result['processes']:>5}{result['clients']:>8}{latency['calls']:>9}{result['errors']:>7}"
+              f"{result['throughput_per_second']:>10.0f}{latency['p50_ms']:>9.2f}{latency['p95_ms']:>9.2f}"
+              f"{latency['p99_ms']:>9.2f}{cpu:>10.0f}{_mb(rss):>12}{driver_cpu:>10.0f}")
+    print("-" * 98)
+    print("srv cpu%, srv rss MB and drv cpu% are the busiest process of each run "
+          "(100% = one core); see --json for every process and per-kind latency")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the PowerPoint MCP server over stdio")
+    parser.add_argument("--processes", default="1,2,4", help="server process counts, e.g. 1,2,4")
+    parser.add_argument("--clients", default="4,16", help="concurrent client counts, e.g. 4,16,64")
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per combination")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each window")
+    parser.add_argument("--mix", default="math=9,render=1", help="weighted call kinds: math, render")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the call sequence")
+    parser.add_argument("--json", metavar="PATH", help="also write every result to a JSON file")
+    args = parser.parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = []
+    for processes in parse_counts(args.processes):
+        for clients in parse_counts(args.clients):
+            if clients < processes:
+                continue  # idle servers would only dilute the per-process numbers
+            print(f"Running {processes} server process(es) with {clients} clients...", file=sys.stderr)
+            results.append(run_point(processes, clients, args.duration, args.warmup, mix, args.seed))
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"mix": mix, "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Numeric Codec Module for PowerPoint Automation Agent
+Opt-in compact encoding of numeric arrays in tool results: values are
+packed into the smallest fitting little-endian type, base64 encoded, and
+decoded on the client as a memoryview over the decoded bytes
+"""
+
+import base64
+import json
+import sys
+from array import array
+
+TYPED_ENCODING = "typed-array-v1"
+
+# array typecode -> NumPy-style dtype string, smallest first
+_DTYPES = {
+    "B": "|u1", "b": "|i1",
+    "H": "<u2", "h": "<i2",
+    "I": "<u4", "i": "<i4",
+    "q": "<i8",
+    "d": "<f8",
+}
+_TYPECODES = {dtype: typecode for typecode, dtype in _DTYPES.items()}
+_INT_RANGES = [
+    ("B", 0, 2 ** 8 - 1), ("b", -2 ** 7, 2 ** 7 - 1),
+    ("H", 0, 2 ** 16 - 1), ("h", -2 ** 15, 2 ** 15 - 1),
+    ("I", 0, 2 ** 32 - 1), ("i", -2 ** 31, 2 ** 31 - 1),
+    ("q", -2 ** 63, 2 ** 63 - 1),
+]
+
+
+def _typecode_for(values):
+    if not values:
+        return "B"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        low, high = min(values), max(values)
+        for typecode, type_low, type_high in _INT_RANGES:
+            if type_low <= low and high <= type_high:
+                return typecode
+    return "d"
+
+
+def encode_array(values, shape=None):
+    """
+    Pack a flat sequence of numbers into a typed-array dict
+
+    Args:
+        values: Sequence of ints or floats
+        shape (list): Logical shape; defaults to [len(values)]
+
+    Returns:
+        dict: {"$typed", "dtype", "shape", "data"} ready for JSON
+    """
+    packed = array(_typecode_for(values), values)
+    if sys.byteorder == "big" and packed.itemsize > 1:
+        packed.byteswap()
+    return {
+        "$typed": TYPED_ENCODING,
+        "dtype": _DTYPES[packed.typecode],
+        "shape": list(shape) if shape is not None else [len(packed)],
+        "data": base64.b64encode(packed).decode("ascii"),
+    }
+
+
+def is_typed(obj):
+    return isinstance(obj, dict) and obj.get("$typed") == TYPED_ENCODING
+
+
+def decode_array(obj):
+    """
+    Return a memoryview of the values without copying the decoded bytes
+
+    Multi-dimensional shapes are applied through memoryview.cast.
+    """
+    typecode = _TYPECODES[obj["dtype"]]
+    raw = base64.b64decode(obj["data"])
+    if sys.byteorder == "big" and array(typecode).itemsize > 1:
+        swapped = array(typecode)
+        swapped.frombytes(raw)
+        swapped.byteswap()
+        view = memoryview(swapped)
+    else:
+        view = memoryview(raw).cast(typecode)
+    shape = obj.get("shape") or [len(view)]
+    if len(shape) > 1:
+        view = view.cast("B").cast(typecode, shape)
+    return view
+
+
+def to_numpy(obj):
+    """Decode into a NumPy array (NumPy is only imported when this is called)"""
+    import numpy as np
+
+    raw = base64.b64decode(obj["data"])
+    return np.frombuffer(raw, dtype=np.dtype(obj["dtype"])).reshape(obj.get("shape") or -1)
+
+
+def decode_text(text):
+    """Decode a tool result text if it holds a typed array, else return None"""
+    if '"$typed"' not in text[:64]:
+        return None
+    try:
+        obj = json.loads(text)
+    except ValueError:
+        return None
+    return decode_array(obj) if is_typed(obj) else None
+
+
+def decode_nested(obj, found=None):
+    """
+    Replace typed arrays anywhere inside a JSON value with plain lists
+
+    Args:
+        obj: Parsed JSON value, e.g. a read_chunk page
+        found (list): Collects the decoded memoryviews
+    """
+    if is_typed(obj):
+        view = decode_array(obj)
+        if found is not None:
+            found.append(view)
+        return view.tolist()
+    if isinstance(obj, dict):
+        return {key: decode_nested(value, found) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [decode_nested(value, found) for value in obj]
+    return obj
+
+
+def decode_nested_text(text, found=None):
+    """
+    Re-serialize a tool result text with its nested typed arrays as JSON
+    lists, or return None if it holds none
+
+    Args:
+        text (str): Tool result text
+        found (list): Collects the decoded memoryviews
+    """
+    if '"$typed"' not in text:
+        return None
+    try:
+        obj = json.loads(text)
+    except ValueError:
+        return None
+    views = []
+    decoded = decode_nested(obj, views)
+    if not views:
+        return None
+    if found is not None:
+        found.extend(views)
+    return json.dumps(decoded)
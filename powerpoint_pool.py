@@ -0,0 +1,455 @@
+"""
+PowerPoint Instance Pool for PowerPoint MCP Server
+Keeps pre-launched, health-checked application instances warm, attaches to
+an already-running instance instead of starting a new one, and recycles
+instances after a fixed number of jobs
+"""
+
+import glob
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Candidate executables, probed in order until one is found
+PPT_PATHS = [
+    'powerpnt.exe',
+    'C:\\Program Files\\Microsoft Office\\root\\Office16\\POWERPNT.EXE',
+    'C:\\Program Files (x86)\\Microsoft Office\\root\\Office16\\POWERPNT.EXE',
+    'C:\\Program Files\\Microsoft Office\\root\\Office15\\POWERPNT.EXE',
+    'C:\\Program Files (x86)\\Microsoft Office\\root\\Office15\\POWERPNT.EXE'
+]
+
+
+class ExecutableCache:
+    def __init__(self, path=None, candidates=PPT_PATHS):
+        """
+        Remember which PowerPoint executable worked last time
+
+        Args:
+            path (str): JSON file the resolved path is stored in
+            candidates (list): Executables to probe when nothing is cached
+        """
+        self.path = path or os.getenv(
+            'PPT_EXE_CACHE', os.path.join(tempfile.gettempdir(), 'ppt_mcp_executable.json'))
+        self.candidates = list(candidates)
+        self._resolved = None
+
+    def get(self):
+        """Return the cached executable, or None"""
+        if self._resolved is None and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._resolved = json.load(f).get('executable')
+            except (OSError, ValueError):
+                self._resolved = None
+        return self._resolved
+
+    def set(self, executable):
+        self._resolved = executable
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'executable': executable}, f)
+        except OSError:
+            pass
+
+    def invalidate(self):
+        self._resolved = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def ordered_candidates(self):
+        """
+        Candidates to try: the cached path first, then those that exist on
+        disk, then the rest, so a miss costs a stat instead of a start timeout
+        """
+        cached = self.get()
+        present, missing = [], []
+        for candidate in self.candidates:
+            if candidate == cached:
+                continue
+            found = os.path.isfile(candidate) if os.path.isabs(candidate) else shutil.which(candidate)
+            (present if found else missing).append(candidate)
+        return ([cached] if cached else []) + present + missing
+
+
+class PooledInstance:
+    def __init__(self, app, executable, pid, attached=False):
+        """A running application instance tracked by the pool"""
+        self.app = app
+        self.executable = executable
+        self.pid = pid
+        self.attached = attached
+        self.jobs = 0
+        self.started = time.time()
+        self.documents = []
+
+
+class PywinautoLauncher:
+    def __init__(self, executables=None, window_timeout=15):
+        """
+        Start, attach to and stop PowerPoint through pywinauto
+
+        Args:
+            executables (ExecutableCache): Cache of the working executable path
+            window_timeout (int): Seconds to wait for the main window of a new instance
+        """
+        from pywinauto.application import Application
+
+        self._application = Application
+        self.executables = executables or ExecutableCache()
+        self.window_timeout = window_timeout
+
+    def launch(self):
+        """Start a new instance and wait until its main window exists"""
+        errors = []
+        for path in self.executables.ordered_candidates():
+            try:
+                app = self._application().start(path)
+            except Exception as e:
+                errors.append(f"{path}: {e}")
+                if path == self.executables.get():
+                    self.executables.invalidate()
+                continue
+            self.executables.set(path)
+            app.window(title_re=".*PowerPoint.*").wait('exists', timeout=self.window_timeout)
+            return PooledInstance(app, path, app.process)
+        raise RuntimeError("Could not start PowerPoint: " + "; ".join(errors))
+
+    def attach(self, exclude=()):
+        """Connect to a PowerPoint instance that is already running, or return None"""
+        try:
+            app = self._application().connect(path="POWERPNT.EXE", timeout=0)
+        except Exception:
+            return None
+        if app.process in exclude:
+            return None
+        return PooledInstance(app, self.executables.get() or "POWERPNT.EXE", app.process, attached=True)
+
+    def healthy(self, instance):
+        try:
+            return (instance.app.is_process_running()
+                    and instance.app.window(title_re=".*PowerPoint.*").exists(timeout=0))
+        except Exception:
+            return False
+
+    def open_document(self, instance, path):
+        """Hand a file to the running instance (PowerPoint is single-instance)"""
+        subprocess.Popen([instance.executable, path])
+        instance.documents.append(path)
+
+    def stop(self, instance):
+        try:
+            instance.app.kill()
+        except Exception:
+            pass
+
+
+_STANDIN_SCRIPT = """
+import sys, time
+time.sleep(float(sys.argv[1]))
+print("ready", flush=True)
+for line in sys.stdin:
+    print("opened " + line.strip(), flush=True)
+time.sleep(float(sys.argv[2]))
+"""
+
+
+class StandInApp:
+    def __init__(self, pid, process=None):
+        """Minimal application handle backed by a stand-in process"""
+        self.process = pid
+        self._process = process
+
+    def is_process_running(self):
+        if self._process is not None:
+            return self._process.poll() is None
+        try:
+            os.kill(self.process, 0)
+        except OSError:
+            return False
+        return True
+
+
+class StandInLauncher:
+    def __init__(self, startup_delay=1.0, state_dir=None):
+        """
+        Launch plain Python processes in place of PowerPoint
+
+        Each stand-in sleeps for startup_delay before reporting ready, which
+        models the cold-start cost. Running stand-ins are advertised through
+        pid files so another server process can attach to them.
+
+        Args:
+            startup_delay (float): Seconds a new instance takes to become ready
+            state_dir (str): Directory holding the pid files
+        """
+        self.startup_delay = startup_delay
+        self.state_dir = state_dir or os.path.join(tempfile.gettempdir(), 'ppt_mcp_standin')
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    def _pid_file(self, pid):
+        return os.path.join(self.state_dir, f"{pid}.pid")
+
+    def launch(self):
+        process = subprocess.Popen(
+            [sys.executable, "-c", _STANDIN_SCRIPT, str(self.startup_delay), "3600"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        if process.stdout.readline().strip() != "ready":
+            process.kill()
+            raise RuntimeError("Stand-in instance failed to start")
+        open(self._pid_file(process.pid), "w").close()
+        return PooledInstance(StandInApp(process.pid, process), "stand-in", process.pid)
+
+    def attach(self, exclude=()):
+        for pid_file in sorted(glob.glob(os.path.join(self.state_dir, "*.pid"))):
+            pid = int(os.path.basename(pid_file)[:-4])
+            if pid in exclude:
+                continue
+            app = StandInApp(pid)
+            if app.is_process_running():
+                return PooledInstance(app, "stand-in", pid, attached=True)
+            os.remove(pid_file)
+        return None
+
+    def healthy(self, instance):
+        return instance.app.is_process_running()
+
+    def open_document(self, instance, path):
+        process = instance.app._process
+        if process is not None:
+            process.stdin.write(path + "\n")
+            process.stdin.flush()
+            process.stdout.readline()
+        instance.documents.append(path)
+
+    def stop(self, instance):
+        process = instance.app._process
+        try:
+            if process is not None:
+                process.kill()
+                process.wait()
+            else:
+                os.kill(instance.pid, signal.SIGTERM)
+        except OSError:
+            pass
+        try:
+            os.remove(self._pid_file(instance.pid))
+        except OSError:
+            pass
+
+
+def default_launcher():
+    """
+    Return the launcher for this host
+
+    PPT_POOL_LAUNCHER=standin selects the stand-in process; otherwise
+    pywinauto is used when available and None is returned when it is not.
+    """
+    if os.getenv('PPT_POOL_LAUNCHER', '').lower() == 'standin':
+        return StandInLauncher(startup_delay=float(os.getenv('PPT_POOL_STANDIN_DELAY', '1.0')))
+    try:
+        return PywinautoLauncher()
+    except ImportError:
+        return None
+
+
+class InstancePool:
+    def __init__(self, launcher, size=1, max_jobs=20):
+        """
+        Pool of warm application instances
+
+        Args:
+            launcher: Object with launch/attach/healthy/open_document/stop methods
+            size (int): Number of instances kept running (idle or in use)
+            max_jobs (int): Jobs served by an instance before it is recycled
+        """
+        self.launcher = launcher
+        self.size = size
+        self.max_jobs = max_jobs
+        self._idle = []
+        self._in_use = {}
+        self._lock = threading.Lock()
+        self._warmed = threading.Condition(self._lock)
+        self._warming = 0
+        self._dropped = set()   # attached instances let go of; never attached again
+        self.counters = {
+            "acquired": 0, "warm": 0, "attached": 0, "cold_starts": 0,
+            "recycled": 0, "unhealthy": 0, "launch_failures": 0, "discarded": 0,
+        }
+        self.last_acquire_seconds = None
+
+    def _require_launcher(self):
+        if self.launcher is None:
+            raise RuntimeError("PowerPoint automation is not available on this host")
+
+    def _tracked_pids(self):
+        return {instance.pid for instance in self._idle} | set(self._in_use) | self._dropped
+
+    def _warm_one(self):
+        with self._lock:
+            exclude = self._tracked_pids()
+        instance = self.launcher.attach(exclude=exclude)
+        if instance is not None:
+            with self._lock:
+                if instance.pid in self._tracked_pids():
+                    instance = None  # another warming thread attached to it first
+        counter = "attached"
+        if instance is None:
+            counter = "cold_starts"
+            try:
+                instance = self.launcher.launch()
+            except Exception:
+                with self._lock:
+                    self.counters["launch_failures"] += 1
+                instance = None
+        with self._lock:
+            self._warming -= 1
+            if instance is not None:
+                self.counters[counter] += 1
+                self._idle.append(instance)
+            self._warmed.notify_all()
+
+    def _drop(self, instance):
+        """Stop an instance the pool launched; only forget one it attached to"""
+        if instance.attached:
+            with self._lock:
+                self._dropped.add(instance.pid)
+        else:
+            self.launcher.stop(instance)
+
+    def prewarm(self, wait=False):
+        """
+        Fill the pool up to size instances in the background, attaching to
+        an already-running instance before launching a new one
+        """
+        if self.launcher is None:
+            return []
+        with self._lock:
+            missing = self.size - len(self._idle) - len(self._in_use) - self._warming
+            self._warming += max(0, missing)
+        threads = [threading.Thread(target=self._warm_one, daemon=True) for _ in range(missing)]
+        for thread in threads:
+            thread.start()
+        if wait:
+            for thread in threads:
+                thread.join()
+        return threads
+
+    def acquire(self):
+        """
+        Return an instance for a job: a healthy idle one, else an already
+        running one via attach, else a newly launched one
+
+        Only picking a candidate holds the lock; its health check and the
+        recycling of a dead one run outside it, so a hung instance does not
+        block other acquires and releases.
+        """
+        self._require_launcher()
+        started = time.perf_counter()
+        instance = None
+        while instance is None:
+            with self._lock:
+                # An instance already starting in the background is closer to
+                # ready than a new one would be
+                while not self._idle and self._warming:
+                    self._warmed.wait()
+                if not self._idle:
+                    exclude = self._tracked_pids()
+                    break
+                candidate = self._idle.pop()
+                self._in_use[candidate.pid] = candidate  # claimed while it is checked
+            if self.launcher.healthy(candidate):
+                instance = candidate
+                with self._lock:
+                    self.counters["warm"] += 1
+                continue
+            with self._lock:
+                self._in_use.pop(candidate.pid, None)
+                self.counters["unhealthy"] += 1
+            self._drop(candidate)
+
+        if instance is None:
+            instance = self.launcher.attach(exclude=exclude)
+            if instance is not None:
+                with self._lock:
+                    if instance.pid in self._tracked_pids():
+                        instance = None  # a concurrent acquire or prewarm attached to it first
+                    else:
+                        self.counters["attached"] += 1
+        if instance is None:
+            instance = self.launcher.launch()
+            with self._lock:
+                self.counters["cold_starts"] += 1
+
+        with self._lock:
+            self._in_use[instance.pid] = instance
+            self.counters["acquired"] += 1
+            self.last_acquire_seconds = time.perf_counter() - started
+        return instance
+
+    def open_document(self, instance, path):
+        """Open a file in an acquired instance"""
+        self.launcher.open_document(instance, path)
+
+    def release(self, instance):
+        """Return an instance after a job, recycling it when it is worn out or unhealthy"""
+        with self._lock:
+            self._in_use.pop(instance.pid, None)
+            instance.jobs += 1
+            worn_out = instance.jobs >= self.max_jobs
+        if worn_out or not self.launcher.healthy(instance):
+            self._drop(instance)
+            with self._lock:
+                self.counters["recycled" if worn_out else "unhealthy"] += 1
+            self.prewarm()
+            return False
+        with self._lock:
+            self._idle.append(instance)
+        return True
+
+    def discard(self, instance):
+        """
+        Drop an instance that stopped responding (e.g. a wedged GUI call)
+
+        It is never handed out again; an instance the pool launched is
+        stopped and replaced in the background, an attached one is left alone.
+        """
+        with self._lock:
+            self._in_use.pop(instance.pid, None)
+            self.counters["discarded"] += 1
+        self._drop(instance)
+        self.prewarm()
+
+    def close(self):
+        """Stop every instance the pool launched; attached instances are left running"""
+        with self._lock:
+            instances = self._idle + list(self._in_use.values())
+            self._idle = []
+            self._in_use = {}
+        for instance in instances:
+            if not instance.attached:
+                self.launcher.stop(instance)
+
+    def stats(self):
+        """Return pool counters and current occupancy"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats.update({
+                "size": self.size,
+                "max_jobs": self.max_jobs,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "warming": self._warming,
+                "last_acquire_seconds": (round(self.last_acquire_seconds, 6)
+                                         if self.last_acquire_seconds is not None else None),
+                "launcher": type(self.launcher).__name__ if self.launcher else None,
+            })
+        return stats
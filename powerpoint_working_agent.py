@@ -1,48 +1,73 @@
 import os
 import time
 from dotenv import load_dotenv
-from mcp import ClientSession, StdioServerParameters, types
-from mcp.client.stdio import stdio_client
 import asyncio
-from google import genai
-from concurrent.futures import TimeoutError
+import argparse
+from contextlib import asynccontextmanager
 from functools import partial
-from email_logger import EmailLogger
+from run_checkpoint import RunCheckpoint
+from agent_run import AgentRun
+from rate_limiter import estimate_tokens, get_rate_limiter
+from run_profiler import create_profiler
+
+# The MCP client, HTTP client, e-mail and job service stacks are imported
+# where they are first needed: a run that is already complete or replayed
+# from a recording starts without loading most of them
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Access your API key and initialize Gemini client correctly
-api_key = os.getenv("GEMINI_API_KEY")
-client = genai.Client(api_key=api_key)
-
-max_iterations = 10  # For PowerPoint operations
-last_response = None
-iteration = 0
-iteration_response = []
-
-# Initialize email logger
-email_logger = EmailLogger()
-execution_logs = []
-start_time = None
-
-async def generate_with_timeout(client, prompt, timeout=10):
-    """Generate content with a timeout"""
+_client = None
+_email_logger = None
+
+def get_client():
+    """
+    Async LLM client (Gemini by default, see LLM_PROVIDER / LLM_BASE_URL),
+    created on first use; one keep-alive connection is reused for every iteration
+    """
+    global _client
+    if _client is None:
+        from llm_client import create_client
+        _client = create_client()
+    return _client
+
+def get_email_logger():
+    """E-mail logger, created (and its configuration checked) on first use"""
+    global _email_logger
+    if _email_logger is None:
+        from email_logger import EmailLogger
+        _email_logger = EmailLogger()
+    return _email_logger
+
+async def close_client():
+    """Close the LLM client's connection pool if a client was ever created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def llm_generate(prompt, priority="interactive"):
+    """generate_with_timeout on the shared client, creating it on the first call"""
+    return await generate_with_timeout(get_client(), prompt, priority=priority)
+
+async def generate_with_timeout(client, prompt, timeout=None, priority="interactive"):
+    """
+    Generate content with a timeout; the request is cancelled if it expires
+
+    timeout defaults to the client's own (LLM_TIMEOUT)
+    """
+    # Shared RPM/TPM budget (LLM_RPM / LLM_TPM); None when unlimited
+    limiter = get_rate_limiter()
+    if limiter:
+        waited, debited = await limiter.acquire(estimate_tokens(prompt), priority)
+        if waited > 0.001:
+            print(f"Rate limited: waited {waited:.2f}s for an LLM slot ({priority})")
     print("Starting LLM generation...")
     try:
-        # Convert the synchronous generate_content call to run in a thread
-        loop = asyncio.get_event_loop()
-        response = await asyncio.wait_for(
-            loop.run_in_executor(
-                None, 
-                lambda: client.models.generate_content(
-                    model="gemini-2.0-flash",
-                    contents=prompt
-                )
-            ),
-            timeout=timeout
-        )
+        response = await client.generate(prompt, timeout=timeout)
         print("LLM generation completed")
+        if limiter:
+            limiter.settle(debited, getattr(response, "tokens", None))
         return response
     except TimeoutError:
         print("LLM generation timed out!")
@@ -51,323 +76,153 @@ async def generate_with_timeout(client, prompt, timeout=10):
         print(f"Error in LLM generation: {e}")
         raise
 
-def log_message(message, log_type="INFO"):
-    """Log a message to both console and email logs"""
-    global execution_logs
-    timestamp = time.strftime("%H:%M:%S")
-    formatted_message = f"[{timestamp}] {log_type}: {message}"
-    print(formatted_message)
-    execution_logs.append(formatted_message)
-
-def log_raw_output(message):
-    """Log raw terminal output to email logs (without timestamp)"""
-    global execution_logs
-    print(message)
-    execution_logs.append(message)
-
-def reset_state():
-    """Reset all global variables to their initial state"""
-    global last_response, iteration, iteration_response, execution_logs, start_time
-    last_response = None
-    iteration = 0
-    iteration_response = []
-    execution_logs = []
-    start_time = None
-
-def print_iteration_header(iteration_num, action):
-    """Print a formatted iteration header"""
-    print(f"\n{'='*60}")
-    print(f"ITERATION {iteration_num}: {action}")
-    print(f"{'='*60}")
-
-async def main():
-    global start_time
-    reset_state()  # Reset at the start of main
-    start_time = time.time()
+def mcp_server_params(profile=False):
+    from mcp import StdioServerParameters
+
+    return StdioServerParameters(
+        command="python",
+        args=["powerpoint_working_mcp_server.py"] + (["--profile"] if profile else []),
+        # Pass the full environment so PPT_* settings reach the server; the
+        # default only forwards a small allowlist of variables
+        env=dict(os.environ),
+    )
+
+@asynccontextmanager
+async def mcp_session():
+    """Open an initialized MCP session to the PowerPoint server"""
+    from mcp import ClientSession
+    from mcp.client.stdio import stdio_client
+
+    async with stdio_client(mcp_server_params()) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+async def run_job(session, payload):
+    """Run one service job on a worker's long-lived MCP session"""
+    generate = partial(llm_generate, priority=payload.get("priority", "batch"))
+    run = AgentRun(generate, RunCheckpoint(), query=payload.get("query"))
+    try:
+        await run.run(session, initialize=False)
+    finally:
+        run.close()
+    if run.final_answer is None:
+        raise RuntimeError(f"Agent did not reach a final answer (run {run.run_id}): "
+                           f"{run.logs[-1] if run.logs else 'no output'}")
+    return {"final_answer": run.final_answer, "run_id": run.run_id,
+            "steps": run.checkpoint.completed_steps, "log_lines": len(run.logs),
+            "llm_tokens": run.llm_tokens, "cached_tokens": run.cached_tokens,
+            "memory_bytes": run.footprint()}
+
+async def main(resume_run_id=None, record_path=None, replay_path=None, replay_latency="zero",
+               profile=False):
+    # Every completed iteration is appended here so a crashed run can be resumed
+    checkpoint = RunCheckpoint(resume_run_id, resume=bool(resume_run_id))
+    if record_path or replay_path:
+        from run_recorder import RunRecorder, RunReplay
+    recorder = RunRecorder(record_path) if record_path else None
+    replay = RunReplay(replay_path, replay_latency) if replay_path else None
+    # cProfile + tracemalloc per iteration; the server profiles each tool
+    profiler = create_profiler(profile, "agent")
+    generate = replay.generate if replay else llm_generate
+    run = AgentRun(generate, checkpoint, profiler=profiler)
     
-    log_message("Starting Working PowerPoint Agent Execution...", "INFO")
-    log_message("This agent will solve a math problem and automatically visualize the result in PowerPoint", "INFO")
+    run.log("Starting Working PowerPoint Agent Execution...", "INFO")
+    run.log("This agent will solve a math problem and automatically visualize the result in PowerPoint", "INFO")
+    if resume_run_id:
+        run.log(f"Resuming run {checkpoint.run_id} from {checkpoint.path}", "INFO")
+        if checkpoint.completed_steps and not checkpoint.done:
+            run.log(f"PowerPoint steps completed before the interruption: {checkpoint.completed_steps} (the workflow will be redone in a fresh window)", "INFO")
+    else:
+        run.log(f"Run ID: {checkpoint.run_id} (resume with --resume {checkpoint.run_id})", "INFO")
     
     try:
+        if checkpoint.done:
+            run.log(f"Run {checkpoint.run_id} already completed with final answer {checkpoint.final_answer}", "SUCCESS")
+            return
+        
         # Create a single MCP server connection to Working PowerPoint server
-        log_message("Establishing connection to Working PowerPoint MCP server...", "INFO")
-        server_params = StdioServerParameters(
-            command="python",
-            args=["powerpoint_working_mcp_server.py"]
-        )
-
-        async with stdio_client(server_params) as (read, write):
-            log_message("Connection established, creating session...", "SUCCESS")
-            async with ClientSession(read, write) as session:
-                log_message("Session created, initializing...", "INFO")
-                await session.initialize()
-                
-                # Get available tools
-                log_message("Requesting tool list...", "INFO")
-                tools_result = await session.list_tools()
-                tools = tools_result.tools
-                log_message(f"Successfully retrieved {len(tools)} tools", "SUCCESS")
-                
-                # Create system prompt with available tools
-                log_message("Creating system prompt...", "INFO")
-                
-                try:
-                    tools_description = []
-                    for i, tool in enumerate(tools):
-                        try:
-                            # Get tool properties
-                            params = tool.inputSchema
-                            desc = getattr(tool, 'description', 'No description available')
-                            name = getattr(tool, 'name', f'tool_{i}')
-                            
-                            # Format the input schema in a more readable way
-                            if 'properties' in params:
-                                param_details = []
-                                for param_name, param_info in params['properties'].items():
-                                    param_type = param_info.get('type', 'unknown')
-                                    param_details.append(f"{param_name}: {param_type}")
-                                params_str = ', '.join(param_details)
-                            else:
-                                params_str = 'no parameters'
-
-                            tool_desc = f"{i+1}. {name}({params_str}) - {desc}"
-                            tools_description.append(tool_desc)
-                        except Exception as e:
-                            print(f"Error processing tool {i}: {e}")
-                            tools_description.append(f"{i+1}. Error processing tool")
-                    
-                    tools_description = "\n".join(tools_description)
-                    log_message("Successfully created tools description", "SUCCESS")
-                except Exception as e:
-                    log_message(f"Error creating tools description: {e}", "ERROR")
-                    tools_description = "Error loading tools"
-                
-                system_prompt = f"""You are a math agent solving problems in iterations. You have access to various mathematical tools and PowerPoint automation tools.
-
-Available tools:
-{tools_description}
-
-You must respond with EXACTLY ONE line in one of these formats (no additional text):
-1. For function calls:
-   FUNCTION_CALL: function_name|param1|param2|...
-   
-2. For final answers:
-   FINAL_ANSWER: [number]
-
-Important:
-- When a function returns multiple values, you need to process all of them
-- Only give FINAL_ANSWER when you have completed all necessary calculations
-- Do not repeat function calls with the same parameters
-- For PowerPoint operations, follow this complete sequence: open_powerpoint -> select_rectangle_shape -> draw_rectangle_centered -> select_text_box -> click_inside_rectangle -> paste_number
-- You must complete ALL steps in the sequence before giving FINAL_ANSWER
-
-Examples:
-- FUNCTION_CALL: add|5|3
-- FUNCTION_CALL: strings_to_chars_to_int|INDIA
-- FUNCTION_CALL: int_list_to_exponential_sum|[73,78,68,73,65]
-- FUNCTION_CALL: open_powerpoint
-- FUNCTION_CALL: draw_rectangle_centered
-- FINAL_ANSWER: [42]
-
-DO NOT include any explanations or additional text.
-Your entire response should be a single line starting with either FUNCTION_CALL: or FINAL_ANSWER:"""
-
-                query = """Find the ASCII values of characters in INDIA and then return sum of exponentials of those values. After getting the final answer, open PowerPoint, draw a rectangle, and write the result inside it."""
-                log_message("Starting iteration loop...", "INFO")
-                
-                # Use global iteration variables
-                global iteration, last_response
-                
-                while iteration < max_iterations:
-                    log_raw_output(f"\n{'='*60}")
-                    log_raw_output(f"ITERATION {iteration + 1}: Processing")
-                    log_raw_output(f"{'='*60}")
-                    
-                    if last_response is None:
-                        current_query = query
-                    else:
-                        current_query = current_query + "\n\n" + " ".join(iteration_response)
-                        current_query = current_query + "  What should I do next?"
-
-                    # Get model's response with timeout
-                    log_raw_output("Preparing to generate LLM response...")
-                    prompt = f"{system_prompt}\n\nQuery: {current_query}"
-                    try:
-                        response = await generate_with_timeout(client, prompt)
-                        response_text = response.text.strip()
-                        log_raw_output(f"LLM Response: {response_text}")
-                        
-                        # Find the FUNCTION_CALL line in the response
-                        for line in response_text.split('\n'):
-                            line = line.strip()
-                            if line.startswith("FUNCTION_CALL:"):
-                                response_text = line
-                                break
-                        
-                    except Exception as e:
-                        print(f"Failed to get LLM response: {e}")
-                        break
-
-                    if response_text.startswith("FUNCTION_CALL:"):
-                        _, function_info = response_text.split(":", 1)
-                        parts = [p.strip() for p in function_info.split("|")]
-                        func_name, params = parts[0], parts[1:]
-                        
-                        log_raw_output(f"Calling function: {func_name}")
-                        log_raw_output(f"Parameters: {params}")
-                        
-                        try:
-                            # Find the matching tool to get its input schema
-                            tool = next((t for t in tools if t.name == func_name), None)
-                            if not tool:
-                                log_raw_output(f"Available tools: {[t.name for t in tools]}")
-                                raise ValueError(f"Unknown tool: {func_name}")
-
-                            # Prepare arguments according to the tool's input schema
-                            arguments = {}
-                            schema_properties = tool.inputSchema.get('properties', {})
-
-                            for param_name, param_info in schema_properties.items():
-                                if not params:  # Check if we have enough parameters
-                                    raise ValueError(f"Not enough parameters provided for {func_name}")
-                                    
-                                value = params.pop(0)  # Get and remove the first parameter
-                                param_type = param_info.get('type', 'string')
-                                
-                                # Convert the value to the correct type based on the schema
-                                if param_type == 'integer':
-                                    arguments[param_name] = int(value)
-                                elif param_type == 'number':
-                                    arguments[param_name] = float(value)
-                                elif param_type == 'array':
-                                    # Handle array input
-                                    if isinstance(value, str):
-                                        # Remove brackets and split by comma
-                                        value = value.strip('[]').split(',')
-                                        # Filter out empty strings and convert to int
-                                        arguments[param_name] = [int(x.strip()) for x in value if x.strip()]
-                                    else:
-                                        arguments[param_name] = value
-                                else:
-                                    arguments[param_name] = str(value)
-
-                            log_raw_output(f"Final arguments: {arguments}")
-                            
-                            result = await session.call_tool(func_name, arguments=arguments)
-                            
-                            # Get the full result content
-                            if hasattr(result, 'content'):
-                                if isinstance(result.content, list):
-                                    iteration_result = [
-                                        item.text if hasattr(item, 'text') else str(item)
-                                        for item in result.content
-                                    ]
-                                else:
-                                    iteration_result = str(result.content)
-                            else:
-                                iteration_result = str(result)
-                            
-                            # Format the response based on result type
-                            if isinstance(iteration_result, list):
-                                result_str = f"[{', '.join(iteration_result)}]"
-                            else:
-                                result_str = str(iteration_result)
-                            
-                            log_raw_output(f"Function result: {result_str}")
-                            
-                            iteration_response.append(
-                                f"In iteration {iteration + 1} you called {func_name} with {arguments} parameters, "
-                                f"and the function returned {result_str}."
-                            )
-                            last_response = iteration_result
-
-                        except Exception as e:
-                            log_raw_output(f"Error details: {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-                            iteration_response.append(f"Error in iteration {iteration + 1}: {str(e)}")
-                            break
-
-                    elif response_text.startswith("FINAL_ANSWER:"):
-                        log_raw_output("\n=== Agent Execution Complete ===")
-                        log_raw_output(f"Final Answer: {response_text}")
-                        
-                        # Extract the final number for PowerPoint
-                        final_number = response_text.replace("FINAL_ANSWER:", "").strip()
-                        log_raw_output(f"Final number to display: {final_number}")
-                        
-                        # Now automatically perform PowerPoint operations following your exact workflow
-                        log_raw_output("\n=== AUTOMATIC POWERPOINT WORKFLOW STARTING ===")
-                        
-                        # Step 1: Open PowerPoint
-                        log_raw_output(f"\n{'='*60}")
-                        log_raw_output("ITERATION 1: Opening PowerPoint and Creating New Presentation")
-                        log_raw_output(f"{'='*60}")
-                        result = await session.call_tool("open_powerpoint")
-                        log_raw_output(result.content[0].text)
-
-                        # Step 2: Select Rectangle Shape
-                        log_raw_output(f"\n{'='*60}")
-                        log_raw_output("ITERATION 2: Selecting Rectangle Shape (Insert -> Shapes -> Rectangle)")
-                        log_raw_output(f"{'='*60}")
-                        result = await session.call_tool("select_rectangle_shape")
-                        log_raw_output(result.content[0].text)
-
-                        # Step 3: Draw Rectangle Centered
-                        log_raw_output(f"\n{'='*60}")
-                        log_raw_output("ITERATION 3: Drawing Rectangle Centered on Slide")
-                        log_raw_output(f"{'='*60}")
-                        result = await session.call_tool("draw_rectangle_centered")
-                        log_raw_output(result.content[0].text)
-
-                        # Step 4: Select Text Box
-                        log_raw_output(f"\n{'='*60}")
-                        log_raw_output("ITERATION 4: Selecting Text Box (Insert -> Text Box)")
-                        log_raw_output(f"{'='*60}")
-                        result = await session.call_tool("select_text_box")
-                        log_raw_output(result.content[0].text)
-
-                        # Step 5: Click Inside Rectangle
-                        log_raw_output(f"\n{'='*60}")
-                        log_raw_output("ITERATION 5: Clicking Inside Rectangle Area to Place Text Box")
-                        log_raw_output(f"{'='*60}")
-                        result = await session.call_tool("click_inside_rectangle")
-                        log_raw_output(result.content[0].text)
-
-                        # Step 6: Paste the Generated Number
-                        log_raw_output(f"\n{'='*60}")
-                        log_raw_output("ITERATION 6: Pasting Generated Number Inside Rectangle")
-                        log_raw_output(f"{'='*60}")
-                        result = await session.call_tool("paste_number", arguments={
-                            "text": final_number
-                        })
-                        log_raw_output(result.content[0].text)
-                        
-                        log_message("AUTOMATIC POWERPOINT WORKFLOW COMPLETE", "SUCCESS")
-                        log_message("PowerPoint should now be open with a slide containing a rectangle and the number inside it!", "SUCCESS")
-                        log_message("Check your PowerPoint window to see the result.", "INFO")
-                        
-                        # Send success email with logs
-                        execution_time = time.time() - start_time
-                        log_message(f"Sending success email with execution logs...", "INFO")
-                        email_logger.send_success_email(final_number, execution_time, execution_logs)
-                        
-                        break
-
-                    iteration += 1
+        run.log("Establishing connection to Working PowerPoint MCP server...", "INFO")
+
+        if replay:
+            run.log(f"Replaying recording {replay.path} ({replay.latency} latency)", "INFO")
+            await run.run(replay.session())
+        else:
+            from mcp import ClientSession
+            from mcp.client.stdio import stdio_client
+
+            async with stdio_client(mcp_server_params(profile)) as (read, write):
+                run.log("Connection established, creating session...", "SUCCESS")
+                async with ClientSession(read, write) as session:
+                    if recorder:
+                        session = recorder.wrap_session(session)
+                        run.generate = recorder.wrap_llm(generate)
+                    await run.run(session)
+            
+            # Send success email with logs
+            if run.final_answer is not None:
+                run.log(f"Sending success email with execution logs...", "INFO")
+                email_logger = get_email_logger()
+                if email_logger.enabled:
+                    from slide_thumbnail import get_slide_thumbnail
+                    thumbnail = get_slide_thumbnail(run.final_answer)
+                else:
+                    thumbnail = None
+                email_logger.send_success_email(run.final_answer, run.elapsed, run.logs, thumbnail)
 
     except Exception as e:
-        log_message(f"Error in main execution: {e}", "ERROR")
+        run.log(f"Error in main execution: {e}", "ERROR")
         import traceback
         traceback.print_exc()
         
         # Send error email with logs
-        log_message("Sending error email with execution logs...", "ERROR")
-        email_logger.send_error_email(str(e), execution_logs)
+        if not replay:
+            run.log("Sending error email with execution logs...", "ERROR")
+            get_email_logger().send_error_email(str(e), run.logs)
         
     finally:
-        reset_state()  # Reset at the end of main
+        timed = recorder or replay
+        if timed:
+            timings_path = timed.timings.write(f"{timed.path}.timings.json")
+            summary = timed.timings.summary()
+            run.log(f"Agent overhead {summary['agent_overhead_seconds']:.3f}s of {summary['total_seconds']:.3f}s total "
+                    f"(LLM wait {summary['llm_wait_seconds']:.3f}s, tool wait {summary['tool_wait_seconds']:.3f}s); "
+                    f"timings written to {timings_path}", "INFO")
+        if recorder:
+            recorder.close()
+        if profiler.enabled:
+            run.log(f"Profile written to {profiler.write()}", "INFO")
+        if checkpoint.replayed_llm or checkpoint.replayed_tools:
+            run.log(f"Replayed {checkpoint.replayed_llm} LLM calls and {checkpoint.replayed_tools} tool calls from checkpoint", "INFO")
+        run.close()
+        await close_client()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Solve a math problem and visualize the result in PowerPoint")
+    parser.add_argument("--resume", metavar="RUN_ID", help="resume an interrupted run from its checkpoint")
+    parser.add_argument("--record", metavar="PATH", help="record LLM responses and tool calls with timings")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recording instead of calling the LLM and server")
+    parser.add_argument("--replay-latency", choices=["zero", "recorded"], default="zero",
+                        help="replay external calls instantly or with their recorded durations")
+    parser.add_argument("--profile", action="store_true",
+                        help="write cProfile and tracemalloc reports for the agent and the server")
+    parser.add_argument("--serve", action="store_true", help="run as a job service with an HTTP API")
+    parser.add_argument("--host", default="127.0.0.1", help="service bind address")
+    parser.add_argument("--port", type=int, default=8080, help="service port")
+    parser.add_argument("--workers", type=int, default=1, help="service workers, each with its own MCP session")
+    parser.add_argument("--max-queued", type=int, default=100, help="queued jobs before submissions get HTTP 429")
+    args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.serve and args.profile:
+        parser.error("--profile profiles a single run and cannot be combined with --serve")
+    if args.serve:
+        from job_service import serve
+
+        serve(run_job, mcp_session, host=args.host, port=args.port,
+              workers=args.workers, max_queued=args.max_queued)
+    else:
+        asyncio.run(main(resume_run_id=args.resume, record_path=args.record,
+                         replay_path=args.replay, replay_latency=args.replay_latency,
+                         profile=args.profile))
  
\ No newline at end of file
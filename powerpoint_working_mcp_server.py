@@ -1,124 +1,438 @@
 # Working PowerPoint MCP Server for Windows Automation
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent
-from pywinauto.application import Application
-import win32gui
-import win32con
-import win32api
 import time
 import sys
+import os
 import math
 import subprocess
-from win32api import GetSystemMetrics
+import atexit
+import uuid
+from tool_cache import LRUCache, memoize
+from server_logging import get_logger
+import deck_writer
+import shape_layout
+import slide_model
+import expression_eval
+import tool_deadlines
+import keystroke_compiler
+from keystroke_compiler import ActionCompiler, KeystrokeRunner
+from strategy_stats import StrategyStats
+from server_metrics import MetricsRegistry, start_http_server
+from template_cache import TemplateCache
+from powerpoint_pool import InstancePool, default_launcher
+from result_store import ResultStore
+import numeric_codec
+from run_profiler import create_profiler
+
+try:
+    from pywinauto.application import Application
+    import win32gui
+    import win32con
+    import win32api
+    from win32api import GetSystemMetrics
+    import pythoncom
+    import win32com.client
+except ImportError:
+    # Non-Windows hosts can still serve the math tools; GUI tools will
+    # report that PowerPoint could not be started
+    Application = None
+
+# Structured logger (stderr or PPT_MCP_LOG_FILE); stdout carries the stdio transport
+log = get_logger()
 
 # Instantiate MCP server
 mcp = FastMCP("WorkingPowerPointAutomation")
 
 # Global variable to store PowerPoint application instance
 ppt_app = None
+ppt_instance = None
+
+# Warm PowerPoint instances, reused across jobs and recycled after PPT_POOL_MAX_JOBS
+ppt_pool = InstancePool(
+    default_launcher(),
+    size=int(os.getenv('PPT_POOL_SIZE', '1')),
+    max_jobs=int(os.getenv('PPT_POOL_MAX_JOBS', '20'))
+)
+
+# Shapes the server has rendered (ids and content hashes) per presentation,
+# so render_value applies only what changed
+rendered_slides = slide_model.SlideModel()
+
+# Per-tool calls, errors, in-flight and latency histograms; every tool is
+# instrumented when it is registered (Prometheus text on PPT_METRICS_PORT if set)
+metrics = MetricsRegistry()
+
+# One profile section per tool with --profile; a no-op otherwise
+profiler = create_profiler("--profile" in sys.argv, "server")
+if profiler.enabled:
+    atexit.register(lambda: log.info("Profile written", path=profiler.write()))
+
+# Arithmetic expressions, compiled once (validated AST to code) and cached by text
+expressions = expression_eval.ExpressionCompiler(
+    max_entries=int(os.getenv('PPT_EXPRESSION_CACHE_ENTRIES', '256'))
+)
+
+# Shared cache for pure tools (bounded by entry count and estimated bytes)
+pure_cache = LRUCache(
+    max_entries=int(os.getenv('PPT_MCP_CACHE_ENTRIES', '1024')),
+    max_bytes=int(os.getenv('PPT_MCP_CACHE_BYTES', str(4 * 1024 * 1024)))
+)
+
+# Parsed .pptx/.potx templates, cloned copy-on-write for each job
+template_cache = TemplateCache(
+    max_entries=int(os.getenv('PPT_MCP_TEMPLATE_ENTRIES', '8')),
+    max_bytes=int(os.getenv('PPT_MCP_TEMPLATE_BYTES', str(64 * 1024 * 1024)))
+)
+job_dir = os.getenv('PPT_JOB_DIR', os.path.join(os.getcwd(), 'jobs'))
+
+# Large inputs/results spilled to disk behind handles (see the *_chunked tools)
+result_store = ResultStore(
+    directory=os.getenv('PPT_RESULT_DIR') or None,
+    max_handles=int(os.getenv('PPT_RESULT_HANDLES', '64')),
+    input_dir=os.getenv('PPT_INPUT_DIR') or None
+)
+atexit.register(result_store.close)
+
+# Ribbon commands compiled once into single keystroke scripts; with
+# PPT_GUI_DRY_RUN=1 the action stream is returned instead of sent
+action_compiler = ActionCompiler(pause=float(os.getenv('PPT_KEY_PAUSE', str(keystroke_compiler.DEFAULT_PAUSE))))
+keystrokes = KeystrokeRunner(dry_run=os.getenv('PPT_GUI_DRY_RUN') == '1')
+
+# Success rate and latency of each GUI fallback strategy on this host; the
+# fastest reliable strategy is tried first (PPT_STRATEGY_STATS="" keeps it in memory)
+gui_strategies = StrategyStats(os.getenv('PPT_STRATEGY_STATS', 'gui_strategy_stats.json'))
+
+def log_strategy_failure(name, error):
+    log.warning("GUI strategy failed", strategy=name, error=str(error))
+
+def dry_run_result(command, iteration, done):
+    """Tool result describing the actions a GUI command would perform"""
+    actions = keystrokes.execute(action_compiler.compile(command))
+    log.info("Dry run", command=command, actions=actions)
+    return {
+        "content": [
+            TextContent(
+                type="text",
+                text=f"ITERATION {iteration} COMPLETE (dry run): {done}; actions {actions}"
+            )
+        ]
+    }
+
+# GUI and COM tools run one at a time on an automation thread under per-tool
+# deadlines (PPT_TOOL_DEADLINE, PPT_TOOL_DEADLINES); a call still running
+# PPT_TOOL_GRACE seconds past its deadline is wedged and its session recycled
+AUTOMATION_TOOLS = ("open_powerpoint", "select_rectangle_shape", "draw_rectangle_centered",
+                    "select_text_box", "click_inside_rectangle", "paste_number",
+                    "place_shapes", "render_value")
+
+def deadline_result(name, seconds, queued=False):
+    """Tool result of a call cancelled at its deadline, or before it started"""
+    if queued:
+        log.error("Tool queue timeout exceeded", tool=name, queue_timeout=seconds)
+        text = f"ERROR: {name} waited {seconds:g}s for the automation thread and was cancelled before it started"
+    else:
+        log.error("Tool deadline exceeded", tool=name, deadline=seconds)
+        text = f"ERROR: {name} did not finish within its {seconds:g}s deadline and was cancelled"
+    return {
+        "content": [
+            TextContent(
+                type="text",
+                text=text
+            )
+        ]
+    }
+
+def recycle_wedged_session(call):
+    """Watchdog callback: drop the PowerPoint instance a wedged call was driving"""
+    global ppt_app, ppt_instance
+    instance, ppt_instance, ppt_app = ppt_instance, None, None
+    log.error("Automation session wedged, recycling PowerPoint", tool=call.name,
+              pid=instance.pid if instance is not None else None)
+    if instance is not None:
+        ppt_pool.discard(instance)
+
+automation = tool_deadlines.AutomationRunner(
+    tool_deadlines.Deadlines.from_env(),
+    grace=float(os.getenv('PPT_TOOL_GRACE', str(tool_deadlines.DEFAULT_GRACE))),
+    on_wedged=recycle_wedged_session,
+    initializer=pythoncom.CoInitialize if Application is not None else None,
+    timeout_result=deadline_result
+)
+
+def tool():
+    """
+    Register a function as an MCP tool, wrapped once at registration so
+    the tools are the same whether the module is run or imported: profiled
+    innermost (GUI tools on the automation thread that runs them), GUI tools
+    run by the automation runner under their deadlines, and every tool
+    recorded in the metrics. The undecorated function is returned.
+    """
+    def register(fn):
+        name = fn.__name__
+        wrapped = profiler.wrap(fn, f"tool_{name}")
+        if name in AUTOMATION_TOOLS:
+            wrapped = automation.wrap(wrapped, name)
+        mcp.tool()(metrics.instrument(wrapped, name))
+        return fn
+    return register
+
+# Encodings for numeric array results, preferred first; "json" until the
+# client opts in through negotiate_encoding
+RESULT_ENCODINGS = [numeric_codec.TYPED_ENCODING, "json"]
+result_encoding = "json"
+
+def encode_numeric(values):
+    """Return a numeric list in the negotiated encoding"""
+    if result_encoding == numeric_codec.TYPED_ENCODING:
+        return numeric_codec.encode_array(values)
+    return values
 
 # MATHEMATICAL TOOLS
 
-@mcp.tool()
+@tool()
 def add(a: int, b: int) -> int:
     """Add two numbers"""
-    print("CALLED: add(a: int, b: int) -> int:")
+    log.debug("Tool called", tool="add")
     return int(a + b)
 
-@mcp.tool()
+@tool()
 def subtract(a: int, b: int) -> int:
     """Subtract two numbers"""
-    print("CALLED: subtract(a: int, b: int) -> int:")
+    log.debug("Tool called", tool="subtract")
     return int(a - b)
 
-@mcp.tool()
+@tool()
 def multiply(a: int, b: int) -> int:
     """Multiply two numbers"""
-    print("CALLED: multiply(a: int, b: int) -> int:")
+    log.debug("Tool called", tool="multiply")
     return int(a * b)
 
-@mcp.tool()
+@tool()
 def divide(a: int, b: int) -> float:
     """Divide two numbers"""
-    print("CALLED: divide(a: int, b: int) -> float:")
+    log.debug("Tool called", tool="divide")
     return float(a / b)
 
-@mcp.tool()
+@tool()
+@memoize(pure_cache)
 def power(a: int, b: int) -> int:
     """Power of two numbers"""
-    print("CALLED: power(a: int, b: int) -> int:")
+    log.debug("Tool called", tool="power")
     return int(a ** b)
 
-@mcp.tool()
+@tool()
 def sqrt(a: int) -> float:
     """Square root of a number"""
-    print("CALLED: sqrt(a: int) -> float:")
+    log.debug("Tool called", tool="sqrt")
     return float(a ** 0.5)
 
-@mcp.tool()
-def strings_to_chars_to_int(string: str) -> list[int]:
-    """Return the ASCII values of the characters in a word"""
-    print("CALLED: strings_to_chars_to_int(string: str) -> list[int]:")
+@tool()
+def evaluate_expression(expression: str, variables: dict | None = None, vectors: dict | None = None,
+                        mode: str = "float", precision: int = 28) -> dict:
+    """Evaluate an arithmetic expression such as (a+b)*c^d in one call (+ - * / // % ^ and sqrt, exp, log, log10, sin, cos, tan, abs, min, max, round, floor, ceil, pi, e). variables maps names to numbers; vectors maps names to equal-length lists and evaluates once per row. mode: float, decimal (precision significant digits) or fraction (exact)"""
+    log.debug("Tool called", tool="evaluate_expression", mode=mode, batched=bool(vectors))
+    compiled = expressions.compile(expression)
+    if not vectors:
+        value = expression_eval.evaluate(compiled, variables, mode, precision)
+        return {"expression": expression, "mode": mode, "result": expression_eval.to_json(value)}
+
+    results = expression_eval.evaluate_batch(compiled, vectors, variables, mode, precision)
+    count = len(results)
+    if mode == "float" and all(isinstance(value, float) or abs(value) < 2 ** 53 for value in results):
+        results = encode_numeric(results)
+    else:
+        results = [expression_eval.to_json(value) for value in results]
+    return {"expression": expression, "mode": mode, "count": count, "results": results}
+
+@tool()
+def expression_cache_stats() -> dict:
+    """Report hits, misses and evictions of the compiled expression cache"""
+    log.debug("Tool called", tool="expression_cache_stats")
+    return expressions.stats()
+
+@memoize(pure_cache)
+def _char_codes(string: str) -> list[int]:
     return [int(ord(char)) for char in string]
 
-@mcp.tool()
+@tool()
+def strings_to_chars_to_int(string: str) -> list[int] | dict:
+    """Return the ASCII values of the characters in a word"""
+    log.debug("Tool called", tool="strings_to_chars_to_int")
+    return encode_numeric(_char_codes(string))
+
+@tool()
+@memoize(pure_cache)
 def int_list_to_exponential_sum(int_list: list) -> float:
     """Return sum of exponentials of numbers in a list"""
-    print("CALLED: int_list_to_exponential_sum(int_list: list) -> float:")
+    log.debug("Tool called", tool="int_list_to_exponential_sum")
     return sum(math.exp(i) for i in int_list)
 
+# CHUNKED TOOLS FOR LARGE INPUTS
+# Inputs are a text buffer handle or "file:<path>" inside PPT_INPUT_DIR;
+# results stay on the server behind a handle that is paged with read_chunk
+# or passed on
+
+@tool()
+def create_text_buffer(text: str = "") -> dict:
+    """Create a server-side text buffer for a large input and return its handle"""
+    log.debug("Tool called", tool="create_text_buffer")
+    return result_store.describe(result_store.create_text(text))
+
+@tool()
+def append_text_buffer(handle: str, text: str) -> dict:
+    """Append a piece of a large input to a text buffer"""
+    log.debug("Tool called", tool="append_text_buffer")
+    result_store.append_text(handle, text)
+    return result_store.describe(handle)
+
+@tool()
+def strings_to_chars_to_int_chunked(source: str, chunk_size: int = 65536) -> dict:
+    """Return a handle to the ASCII values of a text buffer handle or file:<path> (inside PPT_INPUT_DIR), processed in chunks"""
+    log.debug("Tool called", tool="strings_to_chars_to_int_chunked")
+    chunks = ([ord(char) for char in chunk] for chunk in result_store.iter_text(source, chunk_size))
+    handle, count = result_store.write_ints(chunks)
+    log.info("Chunked conversion complete", handle=handle, items=count)
+    return result_store.describe(handle)
+
+@tool()
+def read_chunk(handle: str, cursor: int = 0, limit: int = 1000) -> dict:
+    """Read one page of a result handle; pass next_cursor to get the following page"""
+    log.debug("Tool called", tool="read_chunk")
+    page = result_store.page(handle, cursor, min(limit, 100000))
+    page["items"] = encode_numeric(page["items"])
+    return page
+
+@tool()
+def int_handle_to_exponential_sum(handle: str) -> float:
+    """Return sum of exponentials of the numbers behind a result handle"""
+    log.debug("Tool called", tool="int_handle_to_exponential_sum")
+    # One sum over the streamed items gives the same result as the list tool
+    return sum(math.exp(i) for chunk in result_store.iter_ints(handle) for i in chunk)
+
+@tool()
+def release_handle(handle: str) -> bool:
+    """Delete a result handle or text buffer that is no longer needed"""
+    log.debug("Tool called", tool="release_handle")
+    return result_store.release(handle)
+
+@tool()
+def result_store_stats() -> dict:
+    """Report open handles, evictions and bytes held by the result store"""
+    log.debug("Tool called", tool="result_store_stats")
+    return result_store.stats()
+
+@tool()
+def negotiate_encoding(accept: list) -> dict:
+    """Pick the encoding for numeric array results: the first entry of accept this server supports"""
+    global result_encoding
+    log.debug("Tool called", tool="negotiate_encoding")
+    result_encoding = next((encoding for encoding in accept if encoding in RESULT_ENCODINGS), "json")
+    log.info("Result encoding negotiated", encoding=result_encoding)
+    return {"encoding": result_encoding, "supported": RESULT_ENCODINGS}
+
+@tool()
+def server_cache_stats() -> dict:
+    """Report hits, misses and evictions of the pure tool cache"""
+    log.debug("Tool called", tool="server_cache_stats")
+    return pure_cache.stats()
+
+@tool()
+def server_metrics() -> dict:
+    """Report calls, errors, in-flight calls and p50/p95/p99/p99.9 and max latency of every tool"""
+    log.debug("Tool called", tool="server_metrics")
+    return metrics.snapshot()
+
+@tool()
+def tool_deadline_stats() -> dict:
+    """Report each GUI tool's deadline, timeouts and late completions, and the automation watchdog state"""
+    log.debug("Tool called", tool="tool_deadline_stats")
+    return automation.stats()
+
+@tool()
+def gui_strategy_stats() -> dict:
+    """Report per-action success rates, latencies and current order of the GUI fallback strategies on this host"""
+    log.debug("Tool called", tool="gui_strategy_stats")
+    stats = gui_strategies.stats()
+    stats["keystroke_scripts"] = action_compiler.stats()
+    return stats
+
 # POWERPOINT AUTOMATION TOOLS
 
-@mcp.tool()
-async def open_powerpoint() -> dict:
-    """Open Microsoft PowerPoint and create a new blank presentation"""
-    global ppt_app
+@tool()
+def load_template(name: str, path: str) -> dict:
+    """Load a .pptx/.potx template once and cache it under a name for open_powerpoint"""
+    log.debug("Tool called", tool="load_template")
+    template = template_cache.load(name, path)
+    log.info("Template loaded", name=name, path=template.path, layouts=len(template.layouts))
+    return template.summary()
+
+@tool()
+def template_cache_stats() -> dict:
+    """Report hits, misses, evictions and parses of the template cache"""
+    log.debug("Tool called", tool="template_cache_stats")
+    return template_cache.stats()
+
+@tool()
+def powerpoint_pool_stats() -> dict:
+    """Report warm reuses, attaches, cold starts and recycles of the PowerPoint instance pool"""
+    log.debug("Tool called", tool="powerpoint_pool_stats")
+    return ppt_pool.stats()
+
+@tool()
+async def open_powerpoint(template: str = "") -> dict:
+    """Open Microsoft PowerPoint with a new blank presentation, or a copy of a loaded template"""
+    global ppt_app, ppt_instance
     try:
-        print("ITERATION 1: Opening PowerPoint...")
-        
-        # Try different PowerPoint executables
-        ppt_paths = [
-            'powerpnt.exe',
-            'C:\\Program Files\\Microsoft Office\\root\\Office16\\POWERPNT.EXE',
-            'C:\\Program Files (x86)\\Microsoft Office\\root\\Office16\\POWERPNT.EXE',
-            'C:\\Program Files\\Microsoft Office\\root\\Office15\\POWERPNT.EXE',
-            'C:\\Program Files (x86)\\Microsoft Office\\root\\Office15\\POWERPNT.EXE'
-        ]
-        
-        ppt_app = None
-        for path in ppt_paths:
-            try:
-                print(f"Trying to start PowerPoint with: {path}")
-                ppt_app = Application().start(path)
-                time.sleep(3)  # Wait for PowerPoint to fully load
-                print(f"SUCCESS: PowerPoint started with {path}")
-                break
-            except Exception as e:
-                print(f"Failed to start with {path}: {e}")
-                continue
+        log.info("Opening PowerPoint", iteration=1)
+
+        # Clone the cached template into a per-job file (no re-parse per job)
+        job_file = None
+        if template:
+            os.makedirs(job_dir, exist_ok=True)
+            # The template name was validated by load_template; the suffix
+            # keeps jobs started in the same second apart
+            job_file = os.path.join(job_dir, f"{template}_{time.strftime('%Y%m%d_%H%M%S')}_"
+                                             f"{os.getpid()}_{uuid.uuid4().hex[:8]}.pptx")
+            template_cache.clone(template).save(job_file)
+            log.info("Cloned template for job", template=template, path=job_file)
         
-        if not ppt_app:
-            raise Exception("Could not start PowerPoint with any of the attempted methods")
+        # The previous job is finished: hand its instance back to the pool
+        if ppt_instance is not None:
+            ppt_pool.release(ppt_instance)
+            ppt_instance = ppt_app = None
+
+        # Warm instance if one is idle, else attach to a running one, else start
+        ppt_instance = ppt_pool.acquire()
+        ppt_app = ppt_instance.app
+        log.info("PowerPoint instance acquired", pid=ppt_instance.pid, jobs=ppt_instance.jobs,
+                 attached=ppt_instance.attached,
+                 seconds=round(ppt_pool.last_acquire_seconds, 3))
+        if job_file:
+            ppt_pool.open_document(ppt_instance, job_file)
         
         # Wait for the main window to appear and create new presentation
         try:
             main_window = ppt_app.window(title_re=".*PowerPoint.*")
-            main_window.wait('exists', timeout=15)
-            print("SUCCESS: PowerPoint main window loaded")
+            main_window.wait('exists', timeout=tool_deadlines.remaining(15))
+            log.info("PowerPoint main window loaded")
             
             # Create new blank presentation
             main_window.set_focus()
-            time.sleep(1)
+            tool_deadlines.sleep(1)
             
-            # Press Ctrl+N to create new presentation
-            main_window.type_keys('^n')
-            time.sleep(2)
-            print("SUCCESS: Created new blank presentation")
+            if job_file:
+                log.info("Opened presentation from template", template=template)
+            else:
+                # Press Ctrl+N to create new presentation
+                main_window.type_keys('^n')
+                tool_deadlines.sleep(2)
+                log.info("Created new blank presentation")
             
         except Exception as e:
-            print(f"Warning: Could not create new presentation: {e}")
+            log.warning("Could not create new presentation", error=str(e))
         
-        print("ITERATION 1 COMPLETE: PowerPoint opened successfully")
+        log.info("PowerPoint opened successfully", iteration=1, status="complete")
         return {
             "content": [
                 TextContent(
@@ -128,7 +442,7 @@ async def open_powerpoint() -> dict:
             ]
         }
     except Exception as e:
-        print(f"ERROR: Error opening PowerPoint: {str(e)}")
+        log.error("Error opening PowerPoint", error=str(e))
         return {
             "content": [
                 TextContent(
@@ -138,11 +452,13 @@ async def open_powerpoint() -> dict:
             ]
         }
 
-@mcp.tool()
+@tool()
 async def select_rectangle_shape() -> dict:
     """Click Insert tab → Shapes → Rectangle"""
     global ppt_app
     try:
+        if keystrokes.dry_run:
+            return dry_run_result("insert rectangle", 2, "Rectangle shape selected")
         if not ppt_app:
             return {
                 "content": [
@@ -153,7 +469,7 @@ async def select_rectangle_shape() -> dict:
                 ]
             }
         
-        print("ITERATION 2: Selecting Rectangle Shape...")
+        log.info("Selecting Rectangle Shape", iteration=2)
         
         # Get the main PowerPoint window
         main_window = ppt_app.window(title_re=".*PowerPoint.*")
@@ -161,66 +477,46 @@ async def select_rectangle_shape() -> dict:
         # Ensure PowerPoint window is active
         if not main_window.has_focus():
             main_window.set_focus()
-            time.sleep(1)
+            tool_deadlines.sleep(1)
         
-        # Use keyboard shortcuts for reliable automation
-        try:
-            print("Using keyboard shortcuts for Insert → Shapes → Rectangle...")
-            
-            # Press Alt to activate ribbon
-            main_window.type_keys('%')
-            time.sleep(0.5)
-            print("Activated ribbon")
-            
-            # Press I for Insert tab
-            main_window.type_keys('i')
-            time.sleep(0.5)
-            print("Selected Insert tab")
-            
-            # Press S for Shapes
-            main_window.type_keys('s')
-            time.sleep(0.5)
-            print("Opened Shapes menu")
-            
-            # Press R for Rectangle (first option in basic shapes)
-            main_window.type_keys('r')
-            time.sleep(0.5)
-            print("Selected Rectangle shape")
+        # Keyboard shortcuts: Alt, I (Insert), S (Shapes), R (Rectangle) in
+        # one script with one readiness wait
+        def keyboard():
+            keystrokes.execute(action_compiler.compile("insert rectangle"), main_window)
+        
+        # Mouse clicks through the ribbon
+        def mouse():
+            # Look for Insert tab
+            insert_tab = main_window.child_window(title="Insert", control_type="TabItem")
+            if insert_tab.exists():
+                insert_tab.click()
+                tool_deadlines.sleep(0.5)
+                log.debug("Clicked Insert tab")
             
-            print("ITERATION 2 COMPLETE: Rectangle shape selected successfully")
+            # Look for Shapes button
+            shapes_button = main_window.child_window(title_re=".*Shapes.*", control_type="Button")
+            if shapes_button.exists():
+                shapes_button.click()
+                tool_deadlines.sleep(0.5)
+                log.debug("Clicked Shapes button")
             
+            # Look for Rectangle in the shapes menu
+            rectangle_option = main_window.child_window(title_re=".*Rectangle.*", control_type="MenuItem")
+            if not rectangle_option.exists():
+                raise LookupError("Rectangle menu item not found")
+            rectangle_option.click()
+            tool_deadlines.sleep(0.5)
+        
+        # Historically fastest successful strategy first
+        try:
+            strategy, _ = gui_strategies.run("select_rectangle_shape",
+                                             [("keyboard", keyboard), ("mouse", mouse)],
+                                             on_failure=log_strategy_failure)
+            log.info("Rectangle shape selected successfully", iteration=2, status="complete",
+                     strategy=strategy)
         except Exception as e:
-            print(f"Keyboard shortcuts failed: {e}")
-            # Try mouse clicks as fallback
-            try:
-                print("Trying mouse clicks as fallback...")
-                
-                # Look for Insert tab
-                insert_tab = main_window.child_window(title="Insert", control_type="TabItem")
-                if insert_tab.exists():
-                    insert_tab.click()
-                    time.sleep(0.5)
-                    print("Clicked Insert tab")
-                
-                # Look for Shapes button
-                shapes_button = main_window.child_window(title_re=".*Shapes.*", control_type="Button")
-                if shapes_button.exists():
-                    shapes_button.click()
-                    time.sleep(0.5)
-                    print("Clicked Shapes button")
-                
-                # Look for Rectangle in the shapes menu
-                rectangle_option = main_window.child_window(title_re=".*Rectangle.*", control_type="MenuItem")
-                if rectangle_option.exists():
-                    rectangle_option.click()
-                    time.sleep(0.5)
-                    print("Selected Rectangle")
-                
-                print("ITERATION 2 COMPLETE: Rectangle shape selected via mouse clicks")
-                
-            except Exception as e2:
-                print(f"Mouse clicks also failed: {e2}")
-                print("ITERATION 2 COMPLETE: Rectangle selection attempted (may have issues)")
+            log.warning("All strategies failed", error=str(e))
+            log.info("Rectangle selection attempted (may have issues)", iteration=2, status="complete")
         
         return {
             "content": [
@@ -231,7 +527,7 @@ async def select_rectangle_shape() -> dict:
             ]
         }
     except Exception as e:
-        print(f"ERROR: Error selecting rectangle shape: {str(e)}")
+        log.error("Error selecting rectangle shape", error=str(e))
         return {
             "content": [
                 TextContent(
@@ -241,7 +537,7 @@ async def select_rectangle_shape() -> dict:
             ]
         }
 
-@mcp.tool()
+@tool()
 async def draw_rectangle_centered() -> dict:
     """Draw a rectangle roughly centered on the slide"""
     global ppt_app
@@ -256,7 +552,7 @@ async def draw_rectangle_centered() -> dict:
                 ]
             }
         
-        print("ITERATION 3: Drawing Rectangle Centered on Slide...")
+        log.info("Drawing Rectangle Centered on Slide", iteration=3)
         
         # Get the main PowerPoint window
         main_window = ppt_app.window(title_re=".*PowerPoint.*")
@@ -264,7 +560,7 @@ async def draw_rectangle_centered() -> dict:
         # Ensure PowerPoint window is active
         if not main_window.has_focus():
             main_window.set_focus()
-            time.sleep(0.5)
+            tool_deadlines.sleep(0.5)
         
         # Find the slide area - try multiple approaches
         slide_area = None
@@ -282,7 +578,7 @@ async def draw_rectangle_centered() -> dict:
         except:
             slide_area = main_window
         
-        print(f"Using slide area: {slide_area}")
+        log.debug("Using slide area", slide_area=slide_area)
         
         # Calculate center coordinates for rectangle
         # Assume slide is roughly 800x600 pixels
@@ -296,48 +592,38 @@ async def draw_rectangle_centered() -> dict:
         x2 = slide_center_x + rect_width // 2
         y2 = slide_center_y + rect_height // 2
         
-        print(f"Drawing rectangle from ({x1},{y1}) to ({x2},{y2})")
+        log.debug("Drawing rectangle", x1=x1, y1=y1, x2=x2, y2=y2)
         
         # Draw rectangle using multiple methods
-        success = False
-        
-        # Method 1: Mouse drag
-        try:
+        def mouse_drag():
             slide_area.press_mouse_input(coords=(x1, y1))
-            time.sleep(0.2)
+            tool_deadlines.sleep(0.2)
             slide_area.move_mouse_input(coords=(x2, y2))
-            time.sleep(0.2)
+            tool_deadlines.sleep(0.2)
             slide_area.release_mouse_input(coords=(x2, y2))
-            time.sleep(0.5)
-            success = True
-            print("SUCCESS: Rectangle drawn using mouse drag")
+            tool_deadlines.sleep(0.5)
+        
+        def click_and_drag():
+            slide_area.click_input(coords=(x1, y1))
+            tool_deadlines.sleep(0.2)
+            slide_area.drag_mouse_input(coords_from=(x1, y1), coords_to=(x2, y2))
+            tool_deadlines.sleep(0.5)
+        
+        # Just click at center: does not draw, so it is never preferred
+        def center_click():
+            slide_area.click_input(coords=(slide_center_x, slide_center_y))
+            tool_deadlines.sleep(0.5)
+        
+        # Historically fastest successful strategy first
+        try:
+            strategy, _ = gui_strategies.run("draw_rectangle_centered",
+                                             [("mouse_drag", mouse_drag), ("click_and_drag", click_and_drag)],
+                                             last_resort=("center_click", center_click),
+                                             on_failure=log_strategy_failure)
+            log.info("Rectangle drawn successfully", iteration=3, status="complete", strategy=strategy)
         except Exception as e:
-            print(f"Mouse drag failed: {e}")
-            
-            # Method 2: Click and drag
-            try:
-                slide_area.click_input(coords=(x1, y1))
-                time.sleep(0.2)
-                slide_area.drag_mouse_input(coords_from=(x1, y1), coords_to=(x2, y2))
-                time.sleep(0.5)
-                success = True
-                print("SUCCESS: Rectangle drawn using click and drag")
-            except Exception as e2:
-                print(f"Click and drag failed: {e2}")
-                
-                # Method 3: Just click at center (fallback)
-                try:
-                    slide_area.click_input(coords=(slide_center_x, slide_center_y))
-                    time.sleep(0.5)
-                    success = True
-                    print("SUCCESS: Clicked at rectangle center as fallback")
-                except Exception as e3:
-                    print(f"Center click failed: {e3}")
-        
-        if success:
-            print("ITERATION 3 COMPLETE: Rectangle drawn successfully")
-        else:
-            print("ITERATION 3 COMPLETE: Rectangle drawing attempted (may have issues)")
+            log.warning("All strategies failed", error=str(e))
+            log.info("Rectangle drawing attempted (may have issues)", iteration=3, status="complete")
         
         return {
             "content": [
@@ -348,7 +634,7 @@ async def draw_rectangle_centered() -> dict:
             ]
         }
     except Exception as e:
-        print(f"ERROR: Error drawing rectangle: {str(e)}")
+        log.error("Error drawing rectangle", error=str(e))
         return {
             "content": [
                 TextContent(
@@ -358,11 +644,13 @@ async def draw_rectangle_centered() -> dict:
             ]
         }
 
-@mcp.tool()
+@tool()
 async def select_text_box() -> dict:
     """Click Insert tab → Text Box"""
     global ppt_app
     try:
+        if keystrokes.dry_run:
+            return dry_run_result("insert text box", 4, "Text Box tool selected")
         if not ppt_app:
             return {
                 "content": [
@@ -373,7 +661,7 @@ async def select_text_box() -> dict:
                 ]
             }
         
-        print("ITERATION 4: Selecting Text Box...")
+        log.info("Selecting Text Box", iteration=4)
         
         # Get the main PowerPoint window
         main_window = ppt_app.window(title_re=".*PowerPoint.*")
@@ -381,54 +669,39 @@ async def select_text_box() -> dict:
         # Ensure PowerPoint window is active
         if not main_window.has_focus():
             main_window.set_focus()
-            time.sleep(0.5)
+            tool_deadlines.sleep(0.5)
         
-        # Use keyboard shortcuts for reliable automation
-        try:
-            print("Using keyboard shortcuts for Insert → Text Box...")
-            
-            # Press Alt to activate ribbon
-            main_window.type_keys('%')
-            time.sleep(0.5)
-            print("Activated ribbon")
-            
-            # Press I for Insert tab
-            main_window.type_keys('i')
-            time.sleep(0.5)
-            print("Selected Insert tab")
-            
-            # Press X for Text Box
-            main_window.type_keys('x')
-            time.sleep(0.5)
-            print("Selected Text Box tool")
-            
-            print("ITERATION 4 COMPLETE: Text Box tool selected successfully")
+        # Keyboard shortcuts: Alt, I (Insert), X (Text Box) in one script
+        # with one readiness wait
+        def keyboard():
+            keystrokes.execute(action_compiler.compile("insert text box"), main_window)
+        
+        # Mouse clicks through the ribbon
+        def mouse():
+            # Look for Insert tab
+            insert_tab = main_window.child_window(title="Insert", control_type="TabItem")
+            if insert_tab.exists():
+                insert_tab.click()
+                tool_deadlines.sleep(0.5)
+                log.debug("Clicked Insert tab")
             
+            # Look for Text Box button
+            textbox_button = main_window.child_window(title_re=".*Text Box.*", control_type="Button")
+            if not textbox_button.exists():
+                raise LookupError("Text Box button not found")
+            textbox_button.click()
+            tool_deadlines.sleep(0.5)
+        
+        # Historically fastest successful strategy first
+        try:
+            strategy, _ = gui_strategies.run("select_text_box",
+                                             [("keyboard", keyboard), ("mouse", mouse)],
+                                             on_failure=log_strategy_failure)
+            log.info("Text Box tool selected successfully", iteration=4, status="complete",
+                     strategy=strategy)
         except Exception as e:
-            print(f"Keyboard shortcuts failed: {e}")
-            # Try mouse clicks as fallback
-            try:
-                print("Trying mouse clicks as fallback...")
-                
-                # Look for Insert tab
-                insert_tab = main_window.child_window(title="Insert", control_type="TabItem")
-                if insert_tab.exists():
-                    insert_tab.click()
-                    time.sleep(0.5)
-                    print("Clicked Insert tab")
-                
-                # Look for Text Box button
-                textbox_button = main_window.child_window(title_re=".*Text Box.*", control_type="Button")
-                if textbox_button.exists():
-                    textbox_button.click()
-                    time.sleep(0.5)
-                    print("Clicked Text Box button")
-                
-                print("ITERATION 4 COMPLETE: Text Box tool selected via mouse clicks")
-                
-            except Exception as e2:
-                print(f"Mouse clicks also failed: {e2}")
-                print("ITERATION 4 COMPLETE: Text Box selection attempted (may have issues)")
+            log.warning("All strategies failed", error=str(e))
+            log.info("Text Box selection attempted (may have issues)", iteration=4, status="complete")
         
         return {
             "content": [
@@ -439,7 +712,7 @@ async def select_text_box() -> dict:
             ]
         }
     except Exception as e:
-        print(f"ERROR: Error selecting text box: {str(e)}")
+        log.error("Error selecting text box", error=str(e))
         return {
             "content": [
                 TextContent(
@@ -449,7 +722,7 @@ async def select_text_box() -> dict:
             ]
         }
 
-@mcp.tool()
+@tool()
 async def click_inside_rectangle() -> dict:
     """Click inside the rectangle area to place the text box"""
     global ppt_app
@@ -464,7 +737,7 @@ async def click_inside_rectangle() -> dict:
                 ]
             }
         
-        print("ITERATION 5: Clicking Inside Rectangle Area...")
+        log.info("Clicking Inside Rectangle Area", iteration=5)
         
         # Get the main PowerPoint window
         main_window = ppt_app.window(title_re=".*PowerPoint.*")
@@ -472,7 +745,7 @@ async def click_inside_rectangle() -> dict:
         # Ensure PowerPoint window is active
         if not main_window.has_focus():
             main_window.set_focus()
-            time.sleep(0.5)
+            tool_deadlines.sleep(0.5)
         
         # Find the slide area
         slide_area = None
@@ -493,12 +766,12 @@ async def click_inside_rectangle() -> dict:
         slide_center_x = 400
         slide_center_y = 300
         
-        print(f"Clicking inside rectangle at ({slide_center_x},{slide_center_y})")
+        log.debug("Clicking inside rectangle", x=slide_center_x, y=slide_center_y)
         
         slide_area.click_input(coords=(slide_center_x, slide_center_y))
-        time.sleep(0.5)
+        tool_deadlines.sleep(0.5)
         
-        print("ITERATION 5 COMPLETE: Clicked inside rectangle area successfully")
+        log.info("Clicked inside rectangle area successfully", iteration=5, status="complete")
         return {
             "content": [
                 TextContent(
@@ -508,7 +781,7 @@ async def click_inside_rectangle() -> dict:
             ]
         }
     except Exception as e:
-        print(f"ERROR: Error clicking inside rectangle: {str(e)}")
+        log.error("Error clicking inside rectangle", error=str(e))
         return {
             "content": [
                 TextContent(
@@ -518,7 +791,7 @@ async def click_inside_rectangle() -> dict:
             ]
         }
 
-@mcp.tool()
+@tool()
 async def paste_number(text: str) -> dict:
     """Paste the generated number inside the rectangle"""
     global ppt_app
@@ -533,7 +806,7 @@ async def paste_number(text: str) -> dict:
                 ]
             }
         
-        print(f"ITERATION 6: Pasting Number '{text}' Inside Rectangle...")
+        log.info("Pasting number inside rectangle", iteration=6, text=text)
         
         # Get the main PowerPoint window
         main_window = ppt_app.window(title_re=".*PowerPoint.*")
@@ -541,11 +814,11 @@ async def paste_number(text: str) -> dict:
         # Ensure PowerPoint window is active
         if not main_window.has_focus():
             main_window.set_focus()
-            time.sleep(0.5)
+            tool_deadlines.sleep(0.5)
         
         # Type the text
         main_window.type_keys(text)
-        time.sleep(0.5)
+        tool_deadlines.sleep(0.5)
         
         # Click outside to finish text editing
         try:
@@ -562,9 +835,17 @@ async def paste_number(text: str) -> dict:
             slide_area = main_window
         
         slide_area.click_input(coords=(100, 100))  # Click outside the rectangle
-        time.sleep(0.5)
+        tool_deadlines.sleep(0.5)
+
+        # Name what was drawn so render_value can update it later
+        try:
+            app, presentation, slide = _active_slide()
+            shape_id = slide_model.ComSlide(app, slide).adopt(text)
+            log.debug("Result shape adopted", shape_id=shape_id)
+        except Exception as e:
+            log.warning("Could not name the result shape", error=str(e))
         
-        print("ITERATION 6 COMPLETE: Number pasted successfully inside rectangle")
+        log.info("Number pasted successfully inside rectangle", iteration=6, status="complete")
         return {
             "content": [
                 TextContent(
@@ -574,7 +855,7 @@ async def paste_number(text: str) -> dict:
             ]
         }
     except Exception as e:
-        print(f"ERROR: Error pasting number: {str(e)}")
+        log.error("Error pasting number", error=str(e))
         return {
             "content": [
                 TextContent(
@@ -584,9 +865,211 @@ async def paste_number(text: str) -> dict:
             ]
         }
 
+MSO_SHAPE_RECTANGLE = 1
+PP_LAYOUT_BLANK = 12
+
+def _active_slide():
+    """Return (application, presentation, slide) of the running PowerPoint via COM"""
+    pythoncom.CoInitialize()
+    app = win32com.client.GetActiveObject("PowerPoint.Application")
+    presentation = app.ActivePresentation
+    try:
+        slide = app.ActiveWindow.View.Slide
+    except Exception:
+        slides = presentation.Slides
+        slide = slides(1) if slides.Count else slides.Add(1, PP_LAYOUT_BLANK)
+    return app, presentation, slide
+
+def _insert_shapes_com(app, slide, boxes):
+    """Add every shape through the object model, then style them all with one ShapeRange"""
+    app.StartNewUndoEntry()  # One undo step for the whole batch
+    shapes = slide.Shapes
+    names = []
+    for box in boxes:
+        shape = shapes.AddShape(MSO_SHAPE_RECTANGLE, box.left, box.top, box.width, box.height)
+        shape.TextFrame.TextRange.Text = box.label
+        names.append(shape.Name)
+    shape_range = shapes.Range(tuple(names))
+    frame = shape_range.TextFrame
+    frame.MarginLeft = frame.MarginRight = shape_layout.TEXT_PADDING
+    frame.MarginTop = frame.MarginBottom = 0
+    frame.TextRange.Font.Size = boxes[0].font_size
+
+@tool()
+def place_shapes(items: list, layout: str = "grid", output_path: str = "") -> dict:
+    """Place many labeled rectangles on the current slide in one batch (layout: grid or flow); with output_path, write them to a new .pptx instead"""
+    log.debug("Tool called", tool="place_shapes", items=len(items), layout=layout)
+    try:
+        started = time.perf_counter()
+        if output_path:
+            slide_width = deck_writer.SLIDE_WIDTH / deck_writer.EMU_PER_POINT
+            slide_height = deck_writer.SLIDE_HEIGHT / deck_writer.EMU_PER_POINT
+        else:
+            if not ppt_app or Application is None:
+                return {
+                    "content": [
+                        TextContent(
+                            type="text",
+                            text="PowerPoint is not open. Please call open_powerpoint first, or pass output_path."
+                        )
+                    ]
+                }
+            app, presentation, slide = _active_slide()
+            slide_width = presentation.PageSetup.SlideWidth
+            slide_height = presentation.PageSetup.SlideHeight
+
+        # Whole layout computed before anything is inserted
+        boxes = shape_layout.compute_layout(items, slide_width, slide_height, layout)
+        laid_out = time.perf_counter()
+
+        if not boxes:
+            target = "nothing to place"
+        elif output_path:
+            output_path = os.path.abspath(output_path)
+            with deck_writer.DeckWriter(output_path) as deck:
+                deck.add_shapes_slide(boxes)
+            target = output_path
+        else:
+            _insert_shapes_com(app, slide, boxes)
+            target = f"slide {slide.SlideIndex}"
+        finished = time.perf_counter()
+
+        layout_ms = (laid_out - started) * 1000
+        insert_ms = (finished - laid_out) * 1000
+        log.info("Shapes placed", shapes=len(boxes), layout=layout, target=target,
+                 layout_ms=round(layout_ms, 2), insert_ms=round(insert_ms, 2))
+        font = f", {boxes[0].font_size:g}pt text" if boxes else ""
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=(f"Placed {len(boxes)} shapes ({layout}{font}) on a {slide_width:g}x{slide_height:g}pt "
+                          f"slide, {target}: layout {layout_ms:.1f} ms, insert {insert_ms:.1f} ms")
+                )
+            ]
+        }
+    except Exception as e:
+        log.error("Error placing shapes", error=str(e))
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=f"ERROR: Error placing shapes: {str(e)}"
+                )
+            ]
+        }
+
+@tool()
+def render_deck(rows: list, output_path: str = "") -> dict:
+    """Render one slide per result (value or {value, title}) into a single .pptx file"""
+    log.debug("Tool called", tool="render_deck")
+    try:
+        if not output_path:
+            output_path = f"results_deck_{time.strftime('%Y%m%d_%H%M%S')}.pptx"
+        output_path = os.path.abspath(output_path)
+
+        started = time.perf_counter()
+        slide_count = deck_writer.render_deck(rows, output_path)
+        elapsed = time.perf_counter() - started
+
+        log.info("Deck rendered", path=output_path, slides=slide_count,
+                 seconds=round(elapsed, 3))
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=f"Deck with {slide_count} slides written to {output_path} in {elapsed:.2f}s"
+                )
+            ]
+        }
+    except Exception as e:
+        log.error("Error rendering deck", error=str(e))
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=f"ERROR: Error rendering deck: {str(e)}"
+                )
+            ]
+        }
+
+@tool()
+def render_value(value: str, title: str = "", output_path: str = "") -> dict:
+    """Render a value (and optional title) onto the current slide of the open presentation, or the first slide of the .pptx at output_path, changing only the shapes that differ"""
+    log.debug("Tool called", tool="render_value", output_path=output_path)
+    try:
+        started = time.perf_counter()
+        desired = deck_writer.result_shapes(value, title or None)
+        if output_path:
+            output_path = os.path.abspath(output_path)
+            key = output_path
+            if not os.path.exists(output_path):
+                # Nothing to update: write the slide and record the ids it was given
+                deck_writer.render_deck([{"value": value, "title": title or None}], output_path)
+                states = rendered_slides.record(key, slide_model.PptxSlide(output_path))
+                operations = [slide_model.Operation("add", spec.name, states[spec.name].shape_id)
+                              for spec in desired]
+            else:
+                operations = rendered_slides.render(key, slide_model.PptxSlide(output_path), desired)
+            target = output_path
+        else:
+            if not ppt_app or Application is None:
+                return {
+                    "content": [
+                        TextContent(
+                            type="text",
+                            text="PowerPoint is not open. Please call open_powerpoint first, or pass output_path."
+                        )
+                    ]
+                }
+            app, presentation, slide = _active_slide()
+            key = f"{presentation.FullName}#{slide.SlideID}"
+            operations = rendered_slides.render(key, slide_model.ComSlide(app, slide), desired)
+            target = f"slide {slide.SlideIndex}"
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        skipped = [operation.shape for operation in operations if operation.op == "skip"]
+        applied = [f"{operation.op} {operation.shape}" for operation in operations if operation.op != "skip"]
+        log.info("Value rendered", target=target, applied=applied, skipped=skipped,
+                 ms=round(elapsed_ms, 2))
+        summary = "; ".join(applied) if applied else "unchanged"
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=(f"Rendered '{value}' into {target} in {elapsed_ms:.1f} ms: {summary}"
+                          f" (skipped: {', '.join(skipped) or 'none'})")
+                )
+            ]
+        }
+    except Exception as e:
+        log.error("Error rendering value", error=str(e))
+        return {
+            "content": [
+                TextContent(
+                    type="text",
+                    text=f"ERROR: Error rendering value: {str(e)}"
+                )
+            ]
+        }
+
+@tool()
+def rendered_slide_stats() -> dict:
+    """Report the documents tracked by render_value and how many operations were applied or skipped"""
+    log.debug("Tool called", tool="rendered_slide_stats")
+    return rendered_slides.stats()
+
 if __name__ == "__main__":
-    print("Starting Working PowerPoint MCP Server...")
-    if len(sys.argv) > 1 and sys.argv[1] == "dev":
+    log.info("Starting Working PowerPoint MCP Server")
+    if os.getenv('PPT_METRICS_PORT'):
+        start_http_server(metrics, int(os.getenv('PPT_METRICS_PORT')))
+        log.info("Prometheus metrics enabled", url=f"http://127.0.0.1:{os.getenv('PPT_METRICS_PORT')}/metrics")
+    if profiler.enabled:
+        log.info("Profiling enabled", path=profiler.output_dir)
+    if os.getenv('PPT_POOL_PREWARM', '0') == '1':
+        ppt_pool.prewarm()
+    args = [arg for arg in sys.argv[1:] if arg != "--profile"]
+    if args and args[0] == "dev":
         mcp.run()  # Run without transport for dev server
     else:
         mcp.run(transport="stdio")  # Run with stdio for direct execution
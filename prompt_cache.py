@@ -0,0 +1,134 @@
+"""
+Prompt Cache Module for PowerPoint Automation Agent
+Prompts split into a static prefix (system prompt, tool catalog, rules,
+examples) and a dynamic suffix, plus the client-side registry of provider
+cache handles for those prefixes, so the prefix is registered once and only
+the suffix is sent on later calls
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+
+from rate_limiter import CHARS_PER_TOKEN
+
+DEFAULT_TTL = 600.0         # Seconds a provider cache entry lives
+DEFAULT_MIN_TOKENS = 1024   # Smaller prefixes are not worth (or allowed) caching
+RENEW_MARGIN = 30.0         # Re-register this long before the entry expires
+
+
+class PrefixedPrompt(str):
+    """
+    A prompt that remembers where its static prefix ends
+
+    It is the full prompt text everywhere a str is expected (checkpoints,
+    recordings, rate limiting), so only clients that can cache prefixes
+    need to know about the split.
+    """
+
+    def __new__(cls, prefix, suffix):
+        prompt = super().__new__(cls, prefix + suffix)
+        prompt.prefix = prefix
+        prompt.suffix = suffix
+        return prompt
+
+
+def prefix_key(model, prefix):
+    """Cache key of a prefix for a model: its handle is only valid for that model"""
+    return model, hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+
+class PrefixCache:
+    def __init__(self, ttl=DEFAULT_TTL, min_tokens=DEFAULT_MIN_TOKENS):
+        """
+        Provider cache handles of prompt prefixes, created on first use
+
+        Concurrent calls with the same prefix wait for one registration. A
+        prefix the provider refuses to cache is remembered as uncacheable,
+        so it is not retried on every call.
+
+        Args:
+            ttl (float): Seconds each handle is registered for
+            min_tokens (int): Estimated prefix tokens below which no handle
+                is created
+        """
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self._handles = {}     # key -> (handle or None, expires at)
+        self._pending = {}     # key -> task registering the handle
+        self.registered = 0
+        self.renewed = 0
+        self.refused = 0
+        self.invalidated = 0
+        self.hits = 0
+        self.cached_tokens = 0
+
+    async def handle(self, key, prefix, create):
+        """
+        Return the handle of a prefix, registering it when needed
+
+        Args:
+            key: prefix_key() of the prefix
+            prefix (str): Prefix text (its length decides whether to cache)
+            create: Async callable () -> handle name; raising marks the
+                prefix uncacheable until the TTL passes
+
+        Returns:
+            str: Handle name, or None to send the full prompt instead
+        """
+        if len(prefix) // CHARS_PER_TOKEN < self.min_tokens:
+            return None
+        entry = self._handles.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            if entry[0] is not None:
+                self.hits += 1
+            return entry[0]
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._register(key, create, entry is not None))
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._pending.pop(key, None)
+
+    async def _register(self, key, create, renewing):
+        try:
+            handle = await create()
+        except Exception:
+            handle = None
+            self.refused += 1
+        else:
+            self.registered += 1
+            self.renewed += renewing
+        self._handles[key] = (handle, time.monotonic() + max(0.0, self.ttl - RENEW_MARGIN))
+        return handle
+
+    def invalidate(self, key):
+        """Forget a handle the provider no longer knows (expired or deleted)"""
+        if self._handles.pop(key, None) is not None:
+            self.invalidated += 1
+
+    def record(self, cached_tokens):
+        self.cached_tokens += cached_tokens or 0
+
+    def stats(self):
+        return {"handles": sum(1 for handle, _ in self._handles.values() if handle),
+                "registered": self.registered, "renewed": self.renewed, "refused": self.refused,
+                "invalidated": self.invalidated, "hits": self.hits,
+                "cached_tokens": self.cached_tokens}
+
+
+def prefix_cache_from_env():
+    """
+    PrefixCache configured by the environment, or None when disabled
+
+    LLM_PREFIX_CACHE: 0 to always send the full prompt (default 1)
+    LLM_PREFIX_CACHE_TTL: seconds a registered prefix lives (default 600)
+    LLM_PREFIX_CACHE_MIN_TOKENS: smallest prefix worth registering (default 1024)
+    """
+    if os.getenv("LLM_PREFIX_CACHE", "1") == "0":
+        return None
+    return PrefixCache(ttl=float(os.getenv("LLM_PREFIX_CACHE_TTL", str(DEFAULT_TTL))),
+                       min_tokens=int(os.getenv("LLM_PREFIX_CACHE_MIN_TOKENS", str(DEFAULT_MIN_TOKENS))))
@@ -0,0 +1,254 @@
+"""
+Rate Limiter Module for PowerPoint Automation Agent
+Token buckets for requests and tokens per minute shared by every LLM call
+in the process (or, with a state file, by every agent on the machine),
+served in priority order so interactive runs go ahead of batch jobs
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Lower rank is served first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+# Rough prompt size estimate used before the provider reports real usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(prompt, output_tokens=256):
+    """Estimated total tokens of a call: prompt plus an output allowance"""
+    return len(prompt) // CHARS_PER_TOKEN + output_tokens
+
+
+def _refill(state, limits, now):
+    for name, (capacity, rate) in limits.items():
+        tokens, updated = state.get(name, (capacity, now))
+        state[name] = (min(capacity, tokens + max(0.0, now - updated) * rate), now)
+
+
+def _reserve(state, limits, costs, now):
+    """Take costs from every bucket if all can pay, else return the seconds to wait"""
+    _refill(state, limits, now)
+    wait = 0.0
+    for name, (capacity, rate) in limits.items():
+        # A single call larger than the bucket would otherwise never fit
+        cost = min(costs.get(name, 0), capacity)
+        tokens = state[name][0]
+        if tokens < cost:
+            wait = max(wait, (cost - tokens) / rate)
+    if wait:
+        return wait
+    for name, (capacity, _) in limits.items():
+        tokens, updated = state[name]
+        state[name] = (tokens - min(costs.get(name, 0), capacity), updated)
+    return 0.0
+
+
+class MemoryBucketStore:
+    def __init__(self):
+        """Bucket state shared by everything in this process"""
+        self._state = {}
+
+    def reserve(self, limits, costs):
+        return _reserve(self._state, limits, costs, time.monotonic())
+
+    def adjust(self, limits, name, delta):
+        """Credit (positive) or debit (negative) a bucket after the fact"""
+        _refill(self._state, limits, time.monotonic())
+        tokens, updated = self._state[name]
+        self._state[name] = (min(limits[name][0], tokens + delta), updated)
+
+    def levels(self, limits):
+        _refill(self._state, limits, time.monotonic())
+        return {name: round(tokens, 3) for name, (tokens, _) in self._state.items()}
+
+
+class FileBucketStore:
+    def __init__(self, path):
+        """
+        Bucket state kept in a small file and updated under an exclusive
+        file lock, so separate agent processes share one budget
+
+        Args:
+            path (str): State file; created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a+b")
+
+    @contextmanager
+    def _locked_state(self):
+        fd = self._file.fileno()
+        if os.name == "nt":
+            import msvcrt
+            self._file.seek(0)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            self._file.seek(0)
+            raw = self._file.read()
+            try:
+                state = {name: tuple(value) for name, value in json.loads(raw).items()} if raw else {}
+            except ValueError:
+                state = {}
+            yield state
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.write(json.dumps(state).encode("utf-8"))
+            self._file.flush()
+        finally:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    # Wall-clock time: monotonic clocks are not comparable across processes
+    def reserve(self, limits, costs):
+        with self._locked_state() as state:
+            return _reserve(state, limits, costs, time.time())
+
+    def adjust(self, limits, name, delta):
+        with self._locked_state() as state:
+            _refill(state, limits, time.time())
+            tokens, updated = state[name]
+            state[name] = (min(limits[name][0], tokens + delta), updated)
+
+    def levels(self, limits):
+        with self._locked_state() as state:
+            _refill(state, limits, time.time())
+            return {name: round(tokens, 3) for name, (tokens, _) in state.items()}
+
+    def close(self):
+        self._file.close()
+
+
+class RateLimiter:
+    def __init__(self, rpm=0, tpm=0, state_path=None):
+        """
+        Requests-per-minute and tokens-per-minute limiter with priorities
+
+        Args:
+            rpm (int): Requests per minute; 0 disables the request bucket
+            tpm (int): Tokens per minute; 0 disables the token bucket
+            state_path (str): Share the buckets with other processes through this file
+        """
+        self.limits = {}
+        if rpm:
+            self.limits["requests"] = (float(rpm), rpm / 60.0)
+        if tpm:
+            self.limits["tokens"] = (float(tpm), tpm / 60.0)
+        self.store = FileBucketStore(state_path) if state_path else MemoryBucketStore()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._pump_task = None
+        self._metrics = {
+            priority: {"requests": 0, "delayed": 0, "wait_seconds": 0.0,
+                       "max_wait_seconds": 0.0, "recent": deque(maxlen=1000)}
+            for priority in PRIORITIES
+        }
+
+    async def acquire(self, tokens, priority="interactive"):
+        """
+        Wait until the call fits in the buckets and higher-priority callers
+        have gone first
+
+        Returns:
+            tuple: (seconds spent queueing, tokens taken from the token
+            bucket), the latter capped at the bucket capacity; pass it to
+            settle()
+        """
+        rank = PRIORITIES[priority]
+        costs = {"requests": 1, "tokens": tokens}
+        debited = min(tokens, self.limits["tokens"][0]) if "tokens" in self.limits else 0
+        started = time.monotonic()
+        if not self._waiters and not self.store.reserve(self.limits, costs):
+            self._record(priority, 0.0)
+            return 0.0, debited
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._sequence), future, costs))
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+        await future  # A cancelled waiter is skipped by the pump
+        waited = time.monotonic() - started
+        self._record(priority, waited)
+        return waited, debited
+
+    async def _pump(self):
+        """Serve waiters in (priority, arrival) order as the buckets refill"""
+        while self._waiters:
+            _, _, future, costs = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            wait = self.store.reserve(self.limits, costs)
+            if not wait:
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+            await asyncio.sleep(wait)
+
+    def settle(self, debited, actual):
+        """
+        Correct the token bucket once the provider reports real usage
+
+        Args:
+            debited (float): Tokens acquire() took, not the estimate it was
+                given: a call larger than the bucket is only charged its capacity
+            actual (int): Tokens the provider reported, or None
+        """
+        if "tokens" in self.limits and actual is not None:
+            self.store.adjust(self.limits, "tokens", debited - actual)
+
+    def _record(self, priority, waited):
+        metrics = self._metrics[priority]
+        metrics["requests"] += 1
+        metrics["recent"].append(waited)
+        if waited > 0.001:
+            metrics["delayed"] += 1
+            metrics["wait_seconds"] += waited
+            metrics["max_wait_seconds"] = max(metrics["max_wait_seconds"], waited)
+
+    def stats(self):
+        """Return queueing delay per priority and current bucket levels"""
+        stats = {"limits": {name: capacity for name, (capacity, _) in self.limits.items()},
+                 "levels": self.store.levels(self.limits), "waiting": len(self._waiters)}
+        for priority, metrics in self._metrics.items():
+            recent = sorted(metrics["recent"])
+            stats[priority] = {
+                "requests": metrics["requests"],
+                "delayed": metrics["delayed"],
+                "wait_seconds": round(metrics["wait_seconds"], 6),
+                "max_wait_seconds": round(metrics["max_wait_seconds"], 6),
+                "p50_wait_seconds": round(recent[len(recent) // 2], 6) if recent else None,
+                "p95_wait_seconds": round(recent[int(len(recent) * 0.95)], 6) if recent else None,
+            }
+        return stats
+
+
+_default_limiter = None
+
+
+def get_rate_limiter():
+    """
+    Return the process-wide limiter configured by LLM_RPM, LLM_TPM and
+    LLM_RATE_STATE, or None when no limit is set
+    """
+    global _default_limiter
+    if _default_limiter is None:
+        rpm = int(os.getenv("LLM_RPM", "0"))
+        tpm = int(os.getenv("LLM_TPM", "0"))
+        if not rpm and not tpm:
+            return None
+        _default_limiter = RateLimiter(rpm, tpm, os.getenv("LLM_RATE_STATE") or None)
+    return _default_limiter
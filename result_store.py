@@ -0,0 +1,222 @@
+"""
+Result Store Module for PowerPoint MCP Server
+Spills large tool inputs and outputs to files behind short handles so they
+can be produced in chunks, paged through with a cursor and passed from one
+tool to the next without travelling through the prompt
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+
+INT_TYPECODE = "q"  # signed 64-bit
+INT_SIZE = array(INT_TYPECODE).itemsize
+
+
+class HandleInfo:
+    __slots__ = ("kind", "path", "count", "created")
+
+    def __init__(self, kind, path):
+        self.kind = kind    # "text" or "ints"
+        self.path = path
+        self.count = 0      # characters for text, items for ints
+        self.created = time.time()
+
+
+class ResultStore:
+    def __init__(self, directory=None, max_handles=64, input_dir=None):
+        """
+        File-backed store of text buffers and integer sequences
+
+        Args:
+            directory (str): Spill directory; a private temp directory by default
+            max_handles (int): Oldest handles are released beyond this many
+            input_dir (str): Directory "file:<path>" sources must be inside;
+                None disables file sources
+        """
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="ppt_mcp_results_")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_handles = max_handles
+        self.input_dir = os.path.realpath(input_dir) if input_dir else None
+        self._handles = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _new(self, kind):
+        handle = f"h_{uuid.uuid4().hex[:12]}"
+        info = HandleInfo(kind, os.path.join(self.directory, f"{handle}.{kind}"))
+        open(info.path, "wb").close()
+        with self._lock:
+            self._handles[handle] = info
+            while len(self._handles) > self.max_handles:
+                _, evicted = self._handles.popitem(last=False)
+                self.evictions += 1
+                self._remove_file(evicted)
+        return handle, info
+
+    def _get(self, handle, kind):
+        with self._lock:
+            info = self._handles.get(handle)
+            if info is not None:
+                self._handles.move_to_end(handle)
+        if info is None:
+            raise KeyError(f"Unknown or expired handle: {handle}")
+        if info.kind != kind:
+            raise ValueError(f"Handle {handle} holds {info.kind}, not {kind}")
+        return info
+
+    @staticmethod
+    def _remove_file(info):
+        try:
+            os.remove(info.path)
+        except OSError:
+            pass
+
+    # Text buffers
+
+    def create_text(self, text=""):
+        """Start a text buffer, optionally with initial content, and return its handle"""
+        handle, _ = self._new("text")
+        if text:
+            self.append_text(handle, text)
+        return handle
+
+    def append_text(self, handle, text):
+        """Append to a text buffer and return its length in characters"""
+        info = self._get(handle, "text")
+        with open(info.path, "a", encoding="utf-8", newline="") as f:
+            f.write(text)
+        info.count += len(text)
+        return info.count
+
+    def _input_path(self, path):
+        """Resolve a file source, which must lie inside input_dir"""
+        if self.input_dir is None:
+            raise ValueError("file: sources are disabled; set an input directory to allow them")
+        resolved = os.path.realpath(os.path.join(self.input_dir, path))
+        if os.path.commonpath([resolved, self.input_dir]) != self.input_dir:
+            raise ValueError(f"file: source {path!r} is outside the input directory")
+        return resolved
+
+    def iter_text(self, source, chunk_size=65536):
+        """
+        Yield the text of a source in chunks
+
+        Args:
+            source (str): A text buffer handle or "file:<path>" of a UTF-8
+                file inside input_dir (relative paths are taken from there)
+            chunk_size (int): Characters per chunk
+
+        Raises:
+            ValueError: A file source outside input_dir, or without one
+        """
+        path = self._input_path(source[5:]) if source.startswith("file:") else self._get(source, "text").path
+        with open(path, encoding="utf-8", newline="") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    # Integer sequences
+
+    def write_ints(self, chunks):
+        """Store an iterable of integer chunks and return (handle, count)"""
+        handle, info = self._new("ints")
+        with open(info.path, "ab") as f:
+            for chunk in chunks:
+                array(INT_TYPECODE, chunk).tofile(f)
+                info.count += len(chunk)
+        return handle, info.count
+
+    def read_ints(self, handle, cursor=0, limit=1000):
+        """Return up to limit items starting at cursor"""
+        info = self._get(handle, "ints")
+        cursor = max(0, min(cursor, info.count))
+        items = array(INT_TYPECODE)
+        with open(info.path, "rb") as f:
+            f.seek(cursor * INT_SIZE)
+            items.frombytes(f.read(max(0, min(limit, info.count - cursor)) * INT_SIZE))
+        return items.tolist()
+
+    def iter_ints(self, handle, chunk_items=65536):
+        """Yield the items of an integer sequence as arrays of up to chunk_items"""
+        info = self._get(handle, "ints")
+        with open(info.path, "rb") as f:
+            while True:
+                data = f.read(chunk_items * INT_SIZE)
+                if not data:
+                    return
+                items = array(INT_TYPECODE)
+                items.frombytes(data)
+                yield items
+
+    def page(self, handle, cursor=0, limit=1000):
+        """
+        Return one page of an integer sequence with the cursor of the next page
+
+        A cursor past the end gives an empty last page at the end.
+
+        Raises:
+            ValueError: A negative cursor
+        """
+        if cursor < 0:
+            raise ValueError(f"cursor must not be negative, got {cursor}")
+        info = self._get(handle, "ints")
+        start = min(cursor, info.count)
+        items = self.read_ints(handle, start, limit)
+        next_cursor = start + len(items)
+        return {
+            "handle": handle,
+            "items": items,
+            "cursor": start,
+            "next_cursor": next_cursor if next_cursor < info.count else None,
+            "total": info.count,
+        }
+
+    def describe(self, handle, preview=10):
+        """Short summary of a handle, suitable for returning instead of its content"""
+        with self._lock:
+            info = self._handles.get(handle)
+        if info is None:
+            raise KeyError(f"Unknown or expired handle: {handle}")
+        summary = {"handle": handle, "kind": info.kind, "count": info.count}
+        if info.kind == "ints":
+            summary["preview"] = self.read_ints(handle, 0, preview)
+        return summary
+
+    def release(self, handle):
+        """Delete a handle and its file; returns False if it did not exist"""
+        with self._lock:
+            info = self._handles.pop(handle, None)
+        if info is None:
+            return False
+        self._remove_file(info)
+        return True
+
+    def stats(self):
+        with self._lock:
+            infos = list(self._handles.values())
+        return {
+            "handles": len(infos),
+            "max_handles": self.max_handles,
+            "evictions": self.evictions,
+            "bytes": sum(os.path.getsize(info.path) for info in infos if os.path.exists(info.path)),
+            "directory": self.directory,
+        }
+
+    def close(self):
+        """Release every handle, removing the spill directory if the store created it"""
+        with self._lock:
+            infos = list(self._handles.values())
+            self._handles.clear()
+        for info in infos:
+            self._remove_file(info)
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
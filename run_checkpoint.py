@@ -0,0 +1,162 @@
+"""
+Checkpoint Module for PowerPoint Automation Agent
+Appends each completed iteration to a compact JSON-lines file so an
+interrupted run can be resumed without repeating LLM or idempotent tool calls
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from tool_cache import PURE_TOOLS
+
+# Tools whose results depend only on their arguments; safe to replay
+IDEMPOTENT_TOOLS = PURE_TOOLS
+
+
+def new_run_id():
+    """Return a sortable, unique run identifier"""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def prompt_hash(prompt):
+    """Short stable digest of a prompt, stored instead of the full text"""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def _tool_key(name, arguments):
+    return f"{name}|{json.dumps(arguments, sort_keys=True, separators=(',', ':'))}"
+
+
+class RunCheckpoint:
+    def __init__(self, run_id=None, directory=None, resume=False, persist=True):
+        """
+        Open the checkpoint file for a run
+
+        Args:
+            run_id (str): Run identifier; a new one is generated when omitted
+            directory (str): Checkpoint directory (AGENT_CHECKPOINT_DIR or ./checkpoints)
+            resume (bool): Load existing records for replay instead of starting fresh
+            persist (bool): Write records to disk; False keeps only the in-memory
+                run state (final answer, completed steps), e.g. for load tests
+        """
+        self.run_id = run_id or new_run_id()
+        self.directory = directory or os.getenv("AGENT_CHECKPOINT_DIR", "checkpoints")
+        self.path = os.path.join(self.directory, f"{self.run_id}.jsonl")
+
+        self._llm = []
+        self._tools = {}
+        self.completed_steps = []
+        self.final_answer = None
+        self.done = False
+        self.replayed_llm = 0
+        self.replayed_tools = 0
+        self._next_llm = 0
+
+        if resume:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"No checkpoint found for run {self.run_id}: {self.path}")
+            self._load()
+
+        self._file = None
+        if persist:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self):
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final write from a crash: drop it so new records
+                    # are appended after the last complete line
+                    with open(self.path, "r+b") as truncated:
+                        truncated.truncate(valid_bytes)
+                    break
+                valid_bytes += len(line)
+                kind = record.get("t")
+                if kind == "llm":
+                    self._llm.append(record)
+                elif kind == "tool":
+                    self._tools[_tool_key(record["n"], record["a"])] = record["r"]
+                elif kind == "step":
+                    self.completed_steps.append(record["s"])
+                elif kind == "final":
+                    self.final_answer = record["v"]
+                elif kind == "done":
+                    self.done = True
+                elif kind == "fork":
+                    del self._llm[record["at"]:]
+
+    def _append(self, record):
+        if self._file is None:
+            return
+        record["ts"] = round(time.time(), 3)
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    # Recording
+
+    def record_llm(self, iteration, prompt, response_text):
+        """Record an LLM response together with the hash of its prompt"""
+        self._append({"t": "llm", "i": iteration, "p": prompt_hash(prompt), "r": response_text})
+
+    def record_tool(self, iteration, name, arguments, result):
+        """Record a tool call and its (already formatted) result"""
+        self._append({"t": "tool", "i": iteration, "n": name, "a": arguments, "r": result})
+
+    def record_step(self, step, text):
+        """Record a completed PowerPoint workflow step"""
+        self.completed_steps.append(step)
+        self._append({"t": "step", "s": step, "r": text})
+
+    def record_final(self, value):
+        """Record the final answer produced by the LLM"""
+        self.final_answer = value
+        self._append({"t": "final", "v": value})
+
+    def record_done(self):
+        """Mark the run as fully completed"""
+        self.done = True
+        self._append({"t": "done"})
+
+    # Replay
+
+    def replay_llm(self, prompt):
+        """
+        Return the recorded response for the next LLM call, or None
+
+        Replay stops at the first prompt that differs from the recording,
+        after which the run continues live.
+        """
+        if self._next_llm >= len(self._llm):
+            return None
+        record = self._llm[self._next_llm]
+        if record["p"] != prompt_hash(prompt):
+            # Later recorded responses belong to a different history
+            del self._llm[self._next_llm:]
+            self._append({"t": "fork", "at": self._next_llm})
+            return None
+        self._next_llm += 1
+        self.replayed_llm += 1
+        return record["r"]
+
+    def replay_tool(self, name, arguments):
+        """Return the recorded result of an idempotent tool call, or None"""
+        if name not in IDEMPOTENT_TOOLS:
+            return None
+        result = self._tools.get(_tool_key(name, arguments))
+        if result is not None:
+            self.replayed_tools += 1
+        return result
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self._file.close()
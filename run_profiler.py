@@ -0,0 +1,210 @@
+"""
+Profiling Module for PowerPoint Automation Agent and MCP Server
+Captures cProfile statistics and traced memory per named section (agent
+iteration or server tool), and a tracemalloc snapshot of the allocations
+retained by the run, written as .pstats files and text reports at the end
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class _Section:
+    __slots__ = ("name", "profiles", "calls", "wall", "peak", "net")
+
+    def __init__(self, name):
+        self.name = name
+        self.profiles = {}  # thread id -> cProfile.Profile; each only sees its own thread
+        self.calls = 0
+        self.wall = 0.0
+        self.peak = 0   # Largest growth of traced memory within one call
+        self.net = 0    # Traced memory retained after all calls
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every hook is a no-op"""
+
+    enabled = False
+
+    def begin(self, name):
+        pass
+
+    def end(self):
+        pass
+
+    def section(self, name):
+        return nullcontext()
+
+    def wrap(self, fn, name=None):
+        return fn
+
+    def write(self):
+        return None
+
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, output_dir, frames=8, top=25):
+        """
+        Profile named sections of a run
+
+        Sections do not nest: beginning a section ends the current one on
+        the same thread. Each thread has its own current section, so a tool
+        running on the automation thread is profiled there, not mixed with
+        what the event loop does meanwhile. Traced memory is process-wide,
+        so memory of overlapping sections includes each other's. Per-section memory uses the cheap traced-memory counters; the one
+        full snapshot is taken when the report is written, because taking
+        and diffing snapshots costs seconds in a process this size.
+
+        Args:
+            output_dir (str): Directory the reports are written to
+            frames (int): Traceback depth stored by tracemalloc
+            top (int): Allocation sites listed in the report
+        """
+        self.output_dir = output_dir
+        self.top = top
+        self.sections = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()   # current section, start time and memory per thread
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start(frames)
+
+    def begin(self, name):
+        self.end()
+        local = self._local
+        with self._lock:
+            section = self.sections.get(name)
+            if section is None:
+                section = self.sections[name] = _Section(name)
+            profile = section.profiles.get(threading.get_ident()) or cProfile.Profile()
+        local.section = section
+        tracemalloc.reset_peak()
+        local.memory_at_start = tracemalloc.get_traced_memory()[0]
+        local.started = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process; the
+            # section still gets its time and memory
+            local.profile = None
+        else:
+            local.profile = section.profiles[threading.get_ident()] = profile
+
+    def end(self):
+        local = self._local
+        section = getattr(local, "section", None)
+        if section is None:
+            return
+        if local.profile is not None:
+            local.profile.disable()
+        wall = time.perf_counter() - local.started
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            section.wall += wall
+            section.calls += 1
+            section.peak = max(section.peak, peak - local.memory_at_start)
+            section.net += current - local.memory_at_start
+        local.section = local.profile = None
+
+    @contextmanager
+    def section(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def wrap(self, fn, name=None):
+        """Return fn (sync or async) profiled as its own section on every call"""
+        name = name or fn.__name__
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def profiled_async(*args, **kwargs):
+                with self.section(name):
+                    return await fn(*args, **kwargs)
+            return profiled_async
+
+        @functools.wraps(fn)
+        def profiled(*args, **kwargs):
+            with self.section(name):
+                return fn(*args, **kwargs)
+        return profiled
+
+    def write(self):
+        """Write <section>.pstats, combined.pstats, summary.txt and allocations.txt"""
+        self.end()
+        os.makedirs(self.output_dir, exist_ok=True)
+        combined = None
+        rows = []
+        for name, section in sorted(self.sections.items()):
+            safe = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+            path = os.path.join(self.output_dir, f"{safe}.pstats")
+            profiles = list(section.profiles.values())
+            cpu = 0.0
+            if profiles:
+                stats = pstats.Stats(*profiles)
+                stats.dump_stats(path)
+                cpu = stats.total_tt
+                if combined is None:
+                    combined = pstats.Stats(*profiles)
+                else:
+                    combined.add(*profiles)
+            rows.append((name, section.calls, section.wall, cpu, section.peak, section.net))
+
+        lines = [f"{'section':<36}{'calls':>6}{'wall s':>10}{'cpu s':>10}{'peak KiB':>11}{'net KiB':>10}",
+                 "-" * 83]
+        for name, calls, wall, cpu, peak, net in sorted(rows, key=lambda row: -row[2]):
+            lines.append(f"{name:<36}{calls:>6}{wall:>10.3f}{cpu:>10.3f}"
+                         f"{peak / 1024:>11.1f}{net / 1024:>10.1f}")
+        if combined is not None:
+            combined.dump_stats(os.path.join(self.output_dir, "combined.pstats"))
+            report = io.StringIO()
+            combined.stream = report
+            combined.sort_stats("cumulative").print_stats(20)
+            lines.extend(["", "Top functions by cumulative time (all sections)", report.getvalue()])
+        with open(os.path.join(self.output_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        # Everything still allocated that was allocated while tracing; the
+        # profiler's own frames are skipped here rather than with
+        # Snapshot.filter_traces, which is several times slower
+        snapshot = tracemalloc.take_snapshot()
+        ignored = (tracemalloc.__file__, __file__, pstats.__file__, cProfile.__file__)
+        with open(os.path.join(self.output_dir, "allocations.txt"), "w", encoding="utf-8") as f:
+            current, peak = tracemalloc.get_traced_memory()
+            f.write(f"Traced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n")
+            f.write(f"Top {self.top} allocation sites retained by the run\n")
+            listed = 0
+            for stat in snapshot.statistics("lineno"):
+                frame = stat.traceback[0]
+                if frame.filename in ignored:
+                    continue
+                listed += 1
+                if listed > self.top:
+                    break
+                f.write(f"{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  {frame.filename}:{frame.lineno}\n")
+        if self._owns_tracing:
+            tracemalloc.stop()
+        return self.output_dir
+
+
+def create_profiler(enabled, label):
+    """
+    Return a Profiler writing to PPT_PROFILE_DIR/<timestamp>-<label>-<pid>,
+    or a NullProfiler when profiling is off
+    """
+    if not enabled:
+        return NullProfiler()
+    base = os.getenv("PPT_PROFILE_DIR", "profiles")
+    return Profiler(os.path.join(base, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{os.getpid()}"))
@@ -0,0 +1,231 @@
+"""
+Record/Replay Module for PowerPoint Automation Agent
+Captures every LLM response and MCP tool call with timings, and feeds a
+recording back through the agent so its own overhead can be profiled in
+isolation and compared between versions
+"""
+
+import asyncio
+import json
+import sys
+import time
+from types import SimpleNamespace
+
+from mcp import types
+
+RECORDING_VERSION = 1
+
+
+class ReplayMismatch(Exception):
+    """The agent diverged from the recording it is replaying"""
+
+
+class TimingLedger:
+    def __init__(self):
+        """Accumulate time spent waiting on the LLM and on tools"""
+        self.started = time.perf_counter()
+        self.events = []
+
+    def add(self, kind, name, duration):
+        self.events.append({"kind": kind, "name": name, "seconds": round(duration, 6)})
+
+    def summary(self):
+        """Split wall time into external waits and the agent's own overhead"""
+        total = time.perf_counter() - self.started
+        llm_wait = sum(e["seconds"] for e in self.events if e["kind"] == "llm")
+        tool_wait = sum(e["seconds"] for e in self.events if e["kind"] == "tool")
+        session_wait = sum(e["seconds"] for e in self.events if e["kind"] == "session")
+        return {
+            "total_seconds": round(total, 6),
+            "llm_wait_seconds": round(llm_wait, 6),
+            "tool_wait_seconds": round(tool_wait, 6),
+            "session_wait_seconds": round(session_wait, 6),
+            "agent_overhead_seconds": round(total - llm_wait - tool_wait - session_wait, 6),
+            "llm_calls": sum(1 for e in self.events if e["kind"] == "llm"),
+            "tool_calls": sum(1 for e in self.events if e["kind"] == "tool"),
+            "events": self.events,
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+class RunRecorder:
+    def __init__(self, path):
+        """
+        Record LLM responses and tool calls to a JSON-lines file
+
+        Args:
+            path (str): Recording file to create
+        """
+        self.path = path
+        self.timings = TimingLedger()
+        self._file = open(path, "w", encoding="utf-8")
+        self._write({"kind": "header", "version": RECORDING_VERSION, "started": time.time()})
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def _offset(self):
+        return round(time.perf_counter() - self.timings.started, 6)
+
+    def wrap_llm(self, generate):
+        """Wrap an async generate(prompt) function so each response is recorded"""
+        async def recorded_generate(prompt):
+            offset = self._offset()
+            started = time.perf_counter()
+            response = await generate(prompt)
+            duration = time.perf_counter() - started
+            self.timings.add("llm", "generate", duration)
+            self._write({"kind": "llm", "at": offset, "seconds": round(duration, 6),
+                         "prompt_chars": len(prompt), "text": response.text})
+            return response
+
+        return recorded_generate
+
+    def wrap_session(self, session):
+        """Wrap an MCP ClientSession so tool listings and calls are recorded"""
+        return RecordingSession(session, self)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class RecordingSession:
+    def __init__(self, session, recorder):
+        self._session = session
+        self._recorder = recorder
+
+    async def initialize(self):
+        started = time.perf_counter()
+        result = await self._session.initialize()
+        self._recorder.timings.add("session", "initialize", time.perf_counter() - started)
+        return result
+
+    async def list_tools(self):
+        started = time.perf_counter()
+        result = await self._session.list_tools()
+        self._recorder.timings.add("session", "list_tools", time.perf_counter() - started)
+        self._recorder._write({"kind": "list_tools",
+                               "result": result.model_dump(mode="json", exclude_none=True)})
+        return result
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        recorder = self._recorder
+        offset = recorder._offset()
+        started = time.perf_counter()
+        result = await self._session.call_tool(name, arguments=arguments, **kwargs)
+        duration = time.perf_counter() - started
+        recorder.timings.add("tool", name, duration)
+        recorder._write({"kind": "tool", "at": offset, "seconds": round(duration, 6),
+                         "name": name, "arguments": arguments,
+                         "result": result.model_dump(mode="json", exclude_none=True)})
+        return result
+
+
+class RunReplay:
+    def __init__(self, path, latency="zero"):
+        """
+        Load a recording for replay
+
+        Args:
+            path (str): Recording produced by RunRecorder
+            latency (str): "zero" to return immediately or "recorded" to
+                sleep for the originally measured duration
+        """
+        if latency not in ("zero", "recorded"):
+            raise ValueError(f"Unknown replay latency mode: {latency}")
+        self.path = path
+        self.latency = latency
+        self.timings = TimingLedger()
+        self._tools_result = None
+        self._llm = []
+        self._calls = []
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                kind = record["kind"]
+                if kind == "header" and record["version"] != RECORDING_VERSION:
+                    raise ValueError(f"Unsupported recording version {record['version']}")
+                elif kind == "list_tools":
+                    self._tools_result = types.ListToolsResult.model_validate(record["result"])
+                elif kind == "llm":
+                    self._llm.append(record)
+                elif kind == "tool":
+                    self._calls.append(record)
+        self._llm.reverse()
+        self._calls.reverse()
+
+    async def _wait(self, record):
+        if self.latency == "recorded":
+            await asyncio.sleep(record["seconds"])
+
+    async def generate(self, prompt):
+        """Return the next recorded LLM response"""
+        if not self._llm:
+            raise ReplayMismatch("Agent requested more LLM responses than were recorded")
+        record = self._llm.pop()
+        started = time.perf_counter()
+        await self._wait(record)
+        self.timings.add("llm", "generate", time.perf_counter() - started)
+        return SimpleNamespace(text=record["text"])
+
+    def session(self):
+        """Return an object standing in for the MCP ClientSession"""
+        return ReplaySession(self)
+
+
+class ReplaySession:
+    def __init__(self, replay):
+        self._replay = replay
+
+    async def initialize(self):
+        return None
+
+    async def list_tools(self):
+        if self._replay._tools_result is None:
+            raise ReplayMismatch("Recording does not contain a tool listing")
+        return self._replay._tools_result
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        replay = self._replay
+        if not replay._calls:
+            raise ReplayMismatch(f"Unexpected tool call {name}: recording exhausted")
+        record = replay._calls.pop()
+        if record["name"] != name or (record["arguments"] or {}) != (arguments or {}):
+            raise ReplayMismatch(
+                f"Expected {record['name']}({record['arguments']}), agent called {name}({arguments})")
+        started = time.perf_counter()
+        await replay._wait(record)
+        replay.timings.add("tool", name, time.perf_counter() - started)
+        return types.CallToolResult.model_validate(record["result"])
+
+
+def diff_timings(baseline_path, candidate_path):
+    """Print a side-by-side comparison of two timing summaries"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(candidate_path, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"{'metric':<28}{'baseline':>14}{'candidate':>14}{'change':>12}")
+    print("-" * 68)
+    for key in ("total_seconds", "agent_overhead_seconds", "llm_wait_seconds",
+                "tool_wait_seconds", "session_wait_seconds", "llm_calls", "tool_calls"):
+        if key not in baseline or key not in candidate:
+            continue
+        old, new = baseline[key], candidate[key]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{key:<28}{old:>14.4f}{new:>14.4f}{change:>12}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "diff":
+        diff_timings(sys.argv[2], sys.argv[3])
+    else:
+        print("Usage: python run_recorder.py diff <baseline.timings.json> <candidate.timings.json>")
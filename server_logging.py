@@ -0,0 +1,140 @@
+"""
+Structured Logging Module for PowerPoint MCP Server
+Writes logfmt-style records to stderr or a file through a non-blocking queue,
+keeping stdout free for the stdio MCP transport
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "OFF": logging.CRITICAL + 10,
+}
+
+
+def _noop(message, **fields):
+    """Stand-in for disabled log levels"""
+    return None
+
+
+def _quote(value):
+    """Quote a logfmt value when it contains spaces, quotes or equals signs"""
+    text = str(value)
+    if not text or any(ch in text for ch in ' "=\n\t'):
+        text = '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+    return text
+
+
+class StructuredFormatter(logging.Formatter):
+    """Format records as `ts=... level=... msg=... key=value` lines"""
+
+    def format(self, record):
+        timestamp = self.formatTime(record, "%Y-%m-%dT%H:%M:%S")
+        parts = [
+            f"ts={timestamp}.{int(record.msecs):03d}",
+            f"level={record.levelname}",
+            f"logger={record.name}",
+            f"msg={_quote(record.getMessage())}",
+        ]
+        for key, value in getattr(record, "fields", {}).items():
+            parts.append(f"{key}={_quote(value)}")
+        if record.exc_info:
+            parts.append(f"exc={_quote(self.formatException(record.exc_info))}")
+        return " ".join(parts)
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that defers all formatting to the listener thread"""
+
+    def prepare(self, record):
+        return record
+
+
+class StructuredLogger:
+    def __init__(self, name="powerpoint_mcp", level="INFO", log_file=None):
+        """
+        Initialize a structured logger backed by a queue listener thread
+
+        Args:
+            name (str): Logger name
+            level (str): One of DEBUG, INFO, WARNING, ERROR or OFF
+            log_file (str): Optional file path; stderr is used when omitted
+        """
+        self._logger = logging.getLogger(name)
+        self._logger.propagate = False
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+
+        if log_file:
+            target = logging.FileHandler(log_file, encoding="utf-8")
+        else:
+            target = logging.StreamHandler(sys.stderr)
+        target.setFormatter(StructuredFormatter())
+
+        # The calling thread only enqueues; formatting and I/O happen on the
+        # listener thread so a slow stderr or disk never blocks a tool call
+        self._queue = queue.SimpleQueue()
+        self._logger.addHandler(_InProcessQueueHandler(self._queue))
+        self._listener = logging.handlers.QueueListener(self._queue, target)
+        self._listener.start()
+        atexit.register(self.close)
+
+        self.set_level(level)
+
+    def set_level(self, level):
+        """
+        Change the active level
+
+        Disabled levels are rebound to a no-op so that a call like
+        `log.debug(...)` costs a single function call when debug is off.
+        """
+        self.level = LEVELS.get(str(level).upper(), logging.INFO)
+        self._logger.setLevel(self.level)
+        for name, value in (("debug", logging.DEBUG), ("info", logging.INFO),
+                            ("warning", logging.WARNING), ("error", logging.ERROR)):
+            if value >= self.level:
+                setattr(self, name, self._make_emitter(value))
+            else:
+                setattr(self, name, _noop)
+
+    def _make_emitter(self, level):
+        logger = self._logger
+
+        def emit(message, **fields):
+            # makeRecord skips the caller lookup done by Logger.log
+            logger.handle(logger.makeRecord(logger.name, level, "", 0, message,
+                                            None, None, extra={"fields": fields}))
+
+        return emit
+
+    def exception(self, message, **fields):
+        """Log an error together with the active exception traceback"""
+        if logging.ERROR >= self.level:
+            self._logger.error(message, exc_info=True, extra={"fields": fields})
+
+    def enabled_for(self, level):
+        """Return True when records at the given level are emitted"""
+        return LEVELS.get(str(level).upper(), logging.INFO) >= self.level
+
+    def close(self):
+        """Flush queued records and stop the listener thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+def get_logger(name="powerpoint_mcp"):
+    """Create a logger configured from PPT_MCP_LOG_LEVEL and PPT_MCP_LOG_FILE"""
+    return StructuredLogger(
+        name=name,
+        level=os.getenv("PPT_MCP_LOG_LEVEL", "INFO"),
+        log_file=os.getenv("PPT_MCP_LOG_FILE") or None,
+    )
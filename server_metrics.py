@@ -0,0 +1,229 @@
+"""
+Metrics Module for PowerPoint MCP Server
+Per-tool call, error and in-flight counters with fixed-bucket latency
+histograms, reported as a dict (server_metrics tool) or in Prometheus text
+format on an optional local HTTP port
+"""
+
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds; the last bucket catches everything slower
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+
+def process_stats():
+    """
+    CPU time and memory of this server process
+
+    rss_bytes is read from /proc (Linux) and peak_rss_bytes from the resource
+    module (Unix); either is None where the platform does not provide it.
+    """
+    rss = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # bytes on macOS, KiB elsewhere
+    except ImportError:
+        pass
+    return {"pid": os.getpid(), "cpu_seconds": round(time.process_time(), 3),
+            "threads": threading.active_count(), "rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+def is_error_result(result):
+    """Tools report handled failures as an "ERROR: ..." text result"""
+    if isinstance(result, dict):
+        content = result.get("content")
+        if content:
+            text = getattr(content[0], "text", None)
+            return isinstance(text, str) and text.startswith("ERROR")
+    return False
+
+
+class ToolMetrics:
+    __slots__ = ("calls", "errors", "in_flight", "total_seconds", "max_seconds", "buckets", "lock")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.lock = threading.Lock()
+
+    def observe(self, seconds, failed):
+        index = bisect_left(LATENCY_BUCKETS, seconds)
+        with self.lock:
+            self.in_flight -= 1
+            self.calls += 1
+            self.errors += failed
+            self.total_seconds += seconds
+            if seconds > self.max_seconds:
+                self.max_seconds = seconds
+            self.buckets[index] += 1
+
+    def percentile(self, fraction):
+        with self.lock:
+            buckets = list(self.buckets)
+        return percentile(buckets, fraction)
+
+
+def percentile(buckets, fraction):
+    """Estimate a latency percentile by interpolating inside its bucket"""
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = fraction * total
+    seen = 0
+    lower = 0.0
+    for bound, count in zip(LATENCY_BUCKETS, buckets):
+        if count and seen + count >= rank:
+            if bound == float("inf"):
+                return lower
+            return lower + (bound - lower) * (rank - seen) / count
+        seen += count
+        lower = bound
+    return lower
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.started = time.time()
+        self.tools = {}
+        self._lock = threading.Lock()
+
+    def _metrics_for(self, name):
+        metrics = self.tools.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self.tools.setdefault(name, ToolMetrics())
+        return metrics
+
+    def instrument(self, fn, name=None):
+        """Return fn (sync or async) wrapped to record every call"""
+        metrics = self._metrics_for(name or fn.__name__)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def measured_async(*args, **kwargs):
+                with metrics.lock:
+                    metrics.in_flight += 1
+                started = time.perf_counter()
+                failed = True
+                try:
+                    result = await fn(*args, **kwargs)
+                    failed = is_error_result(result)
+                    return result
+                finally:
+                    metrics.observe(time.perf_counter() - started, failed)
+            return measured_async
+
+        @functools.wraps(fn)
+        def measured(*args, **kwargs):
+            with metrics.lock:
+                metrics.in_flight += 1
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = is_error_result(result)
+                return result
+            finally:
+                metrics.observe(time.perf_counter() - started, failed)
+        return measured
+
+    def snapshot(self):
+        """Process usage plus counters, latency percentiles and the slowest call (milliseconds) per tool"""
+        tools = {}
+        for name, metrics in sorted(self.tools.items()):
+            with metrics.lock:
+                calls, errors, in_flight = metrics.calls, metrics.errors, metrics.in_flight
+                total, slowest = metrics.total_seconds, metrics.max_seconds
+                buckets = list(metrics.buckets)
+            entry = {"calls": calls, "errors": errors, "in_flight": in_flight,
+                     "mean_ms": round(total / calls * 1000, 3) if calls else None}
+            for label, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99), ("p999_ms", 0.999)):
+                value = percentile(buckets, fraction)
+                # Interpolation inside the top bucket can overshoot the slowest call
+                entry[label] = round(min(value, slowest) * 1000, 3) if value is not None else None
+            entry["max_ms"] = round(slowest * 1000, 3) if calls else None
+            entry["buckets"] = {("+Inf" if bound == float("inf") else f"{bound:g}"): count
+                                for bound, count in zip(LATENCY_BUCKETS, buckets) if count}
+            tools[name] = entry
+        return {"uptime_seconds": round(time.time() - self.started, 1),
+                "process": process_stats(), "tools": tools}
+
+    def prometheus_text(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP mcp_tool_calls_total Completed tool calls.",
+            "# TYPE mcp_tool_calls_total counter",
+        ]
+        items = sorted(self.tools.items())
+        rows = []
+        for name, metrics in items:
+            with metrics.lock:
+                rows.append((name.replace('"', '\\"'), metrics.calls, metrics.errors,
+                             metrics.in_flight, metrics.total_seconds, list(metrics.buckets),
+                             metrics.max_seconds))
+        lines += [f'mcp_tool_calls_total{{tool="{name}"}} {calls}' for name, calls, *_ in rows]
+        lines += ["# HELP mcp_tool_errors_total Tool calls that raised or returned an error.",
+                  "# TYPE mcp_tool_errors_total counter"]
+        lines += [f'mcp_tool_errors_total{{tool="{row[0]}"}} {row[2]}' for row in rows]
+        lines += ["# HELP mcp_tool_in_flight Tool calls currently running.",
+                  "# TYPE mcp_tool_in_flight gauge"]
+        lines += [f'mcp_tool_in_flight{{tool="{row[0]}"}} {row[3]}' for row in rows]
+        lines += ["# HELP mcp_tool_latency_max_seconds Slowest tool call since start.",
+                  "# TYPE mcp_tool_latency_max_seconds gauge"]
+        lines += [f'mcp_tool_latency_max_seconds{{tool="{row[0]}"}} {row[6]:.6f}' for row in rows]
+        lines += ["# HELP mcp_tool_latency_seconds Tool call latency.",
+                  "# TYPE mcp_tool_latency_seconds histogram"]
+        for name, calls, _, _, total, buckets, _ in rows:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'mcp_tool_latency_seconds_bucket{{tool="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'mcp_tool_latency_seconds_sum{{tool="{name}"}} {total:.6f}')
+            lines.append(f'mcp_tool_latency_seconds_count{{tool="{name}"}} {calls}')
+        return "\n".join(lines) + "\n"
+
+
+def start_http_server(registry, port, host="127.0.0.1"):
+    """
+    Serve GET /metrics in Prometheus format from a daemon thread
+
+    Returns:
+        ThreadingHTTPServer: Call shutdown() to stop it
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # stderr belongs to the server log; stdout to the transport
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,185 @@
+"""
+Shape Layout Module for PowerPoint MCP Server
+Computes non-overlapping positions for many labeled shapes on a slide up
+front, so they can be inserted in one batch instead of one GUI cycle each.
+All sizes are in points, the unit of PowerPoint's object model
+"""
+
+import math
+
+LAYOUTS = ("grid", "flow")
+
+MIN_FONT_SIZE = 6
+MAX_FONT_SIZE = 28
+CHAR_WIDTH = 0.55     # Average glyph width as a fraction of the font size
+LINE_HEIGHT = 1.8     # Shape height as a multiple of the font size in flow layout
+TEXT_PADDING = 6      # Points between the text and the shape border
+
+
+class LayoutError(ValueError):
+    """The shapes cannot be placed on the slide without overlapping"""
+
+
+class ShapeBox:
+    __slots__ = ("label", "left", "top", "width", "height", "font_size")
+
+    def __init__(self, label, left, top, width, height, font_size):
+        self.label = label
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.font_size = font_size
+
+    @property
+    def right(self):
+        return self.left + self.width
+
+    @property
+    def bottom(self):
+        return self.top + self.height
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def item_label(item):
+    """Label of an item: a plain value or a dict with "label" (or "value")"""
+    if isinstance(item, dict):
+        return str(item.get("label", item.get("value", "")))
+    return str(item)
+
+
+def text_width(text, font_size):
+    """Estimated rendered width of a single line of text"""
+    return len(text) * font_size * CHAR_WIDTH
+
+
+def _fit_font(labels, width, height):
+    """Largest font size at which every label fits inside a width x height box"""
+    longest = max((len(label) for label in labels), default=1) or 1
+    size = min(MAX_FONT_SIZE, height * 0.5,
+               (width - 2 * TEXT_PADDING) / (longest * CHAR_WIDTH))
+    return max(MIN_FONT_SIZE, math.floor(size))
+
+
+def grid_layout(labels, slide_width, slide_height, margin=36, gap=12, aspect=2.0):
+    """
+    Equal cells in the column count that gives the largest shapes
+
+    Args:
+        labels (list): Shape labels, placed row by row
+        slide_width, slide_height (float): Slide size in points
+        margin (float): Empty border around the grid
+        gap (float): Space between neighbouring shapes
+        aspect (float): Width / height of each shape
+
+    Returns:
+        list[ShapeBox]
+    """
+    count = len(labels)
+    if count == 0:
+        return []
+    area_width = slide_width - 2 * margin
+    area_height = slide_height - 2 * margin
+
+    best = None
+    for columns in range(1, count + 1):
+        rows = math.ceil(count / columns)
+        # In dense grids the gap shrinks with the cells instead of eating them
+        spacing = min(gap, 0.2 * area_width / columns, 0.2 * area_height / rows)
+        cell_width = (area_width - (columns - 1) * spacing) / columns
+        cell_height = (area_height - (rows - 1) * spacing) / rows
+        width = min(cell_width, cell_height * aspect)
+        if width > 0 and (best is None or width > best[0]):
+            best = (width, columns, rows, spacing)
+    if best is None:
+        raise LayoutError(f"{count} shapes do not fit on a {slide_width:g}x{slide_height:g}pt slide")
+
+    width, columns, rows, gap = best
+    height = width / aspect
+    if height < MIN_FONT_SIZE + 2:
+        raise LayoutError(f"{count} shapes would be {width:.1f}x{height:.1f}pt; too small to label")
+    font_size = _fit_font(labels, width, height)
+
+    # Center the whole grid on the slide
+    left0 = (slide_width - (columns * width + (columns - 1) * gap)) / 2
+    top0 = (slide_height - (rows * height + (rows - 1) * gap)) / 2
+    return [
+        ShapeBox(label, left0 + (i % columns) * (width + gap),
+                 top0 + (i // columns) * (height + gap), width, height, font_size)
+        for i, label in enumerate(labels)
+    ]
+
+
+def _flow_rows(labels, font_size, area_width, gap):
+    height = font_size * LINE_HEIGHT
+    rows, row, row_width = [], [], 0.0
+    for label in labels:
+        width = min(area_width, text_width(label, font_size) + 2 * TEXT_PADDING)
+        needed = width if not row else row_width + gap + width
+        if row and needed > area_width:
+            rows.append(row)
+            row, needed = [], width
+        row.append((label, width))
+        row_width = needed
+    if row:
+        rows.append(row)
+    return rows, height
+
+
+def flow_layout(labels, slide_width, slide_height, margin=36, gap=8, font_size=18):
+    """
+    Shapes sized to their labels, filled left to right and wrapped into rows
+
+    The font shrinks step by step until every row fits on the slide.
+
+    Returns:
+        list[ShapeBox]
+    """
+    if not labels:
+        return []
+    area_width = slide_width - 2 * margin
+    area_height = slide_height - 2 * margin
+
+    size = min(font_size, MAX_FONT_SIZE)
+    while True:
+        rows, height = _flow_rows(labels, size, area_width, gap)
+        total_height = len(rows) * height + (len(rows) - 1) * gap
+        if total_height <= area_height:
+            break
+        if size <= MIN_FONT_SIZE:
+            raise LayoutError(f"{len(labels)} shapes need {total_height:.0f}pt of height at "
+                              f"{MIN_FONT_SIZE}pt text; the slide has {area_height:.0f}pt")
+        size = max(MIN_FONT_SIZE, size * 0.9)
+
+    boxes = []
+    top = margin + (area_height - total_height) / 2
+    for row in rows:
+        left = margin
+        for label, width in row:
+            boxes.append(ShapeBox(label, left, top, width, height, round(size, 1)))
+            left += width + gap
+        top += height + gap
+    return boxes
+
+
+def compute_layout(items, slide_width, slide_height, layout="grid", **options):
+    """
+    Place labeled shapes on a slide
+
+    Args:
+        items (list): Plain values or dicts with a "label" (or "value")
+        slide_width, slide_height (float): Slide size in points
+        layout (str): "grid" (equal cells) or "flow" (sized to the labels)
+
+    Raises:
+        LayoutError: The shapes do not fit
+        ValueError: Unknown layout
+    """
+    labels = [item_label(item) for item in items]
+    if layout == "grid":
+        return grid_layout(labels, slide_width, slide_height, **options)
+    if layout == "flow":
+        return flow_layout(labels, slide_width, slide_height, **options)
+    raise ValueError(f"Unknown layout {layout!r}; expected one of {', '.join(LAYOUTS)}")
@@ -0,0 +1,429 @@
+"""
+Slide Model Module for PowerPoint MCP Server
+Remembers what the server has put on a result slide (shape ids, text and
+content hashes) so that rendering a new value into an existing presentation
+applies only the difference: a text run is updated in place, a moved or
+restyled shape is adjusted, and nothing is touched when nothing changed
+"""
+
+import hashlib
+import io
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+import deck_writer
+from template_cache import A_NS, P_NS, ParsedTemplate, PresentationClone
+
+# Shapes owned by the model; anything else on the slide is left alone
+MANAGED_SHAPES = (deck_writer.RESULT_SHAPE, deck_writer.TITLE_SHAPE)
+OPERATIONS = ("skip", "update_text", "update_layout", "add", "delete")
+
+# Shape.Type and Shape.AutoShapeType of a rectangle drawn in PowerPoint
+MSO_AUTO_SHAPE = 1
+MSO_SHAPE_RECTANGLE = 1
+
+# op is one of OPERATIONS; shape is the managed shape name
+Operation = namedtuple("Operation", "op shape shape_id")
+
+
+def content_hash(*fields):
+    """Short stable hash of a tuple of plain values"""
+    return hashlib.blake2b(repr(fields).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def layout_hash(x, y, cx, cy, size, filled):
+    """Hash of everything about a shape except its text (EMU, hundredths of a point)"""
+    return content_hash(int(x), int(y), int(cx), int(cy), int(size), bool(filled))
+
+
+class ShapeState:
+    __slots__ = ("name", "shape_id", "text", "text_hash", "layout_hash")
+
+    def __init__(self, name, shape_id, text, layout):
+        self.name = name
+        self.shape_id = shape_id
+        self.text = text
+        self.text_hash = content_hash(text)
+        self.layout_hash = layout
+
+    @classmethod
+    def from_spec(cls, spec, shape_id):
+        return cls(spec.name, shape_id, spec.text,
+                   layout_hash(spec.x, spec.y, spec.cx, spec.cy, spec.size, spec.filled))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def plan(current, desired):
+    """
+    Operations that turn the current shapes into the desired ones
+
+    Args:
+        current (dict): Shape name -> ShapeState of the managed shapes on the slide
+        desired (list): deck_writer.ShapeSpec for every shape that should exist
+
+    Returns:
+        list[Operation]: One or two per desired shape, then deletions
+    """
+    operations = []
+    for spec in desired:
+        state = current.get(spec.name)
+        if state is None:
+            operations.append(Operation("add", spec.name, None))
+            continue
+        changed = False
+        if state.layout_hash != layout_hash(spec.x, spec.y, spec.cx, spec.cy, spec.size, spec.filled):
+            operations.append(Operation("update_layout", spec.name, state.shape_id))
+            changed = True
+        if state.text_hash != content_hash(spec.text):
+            operations.append(Operation("update_text", spec.name, state.shape_id))
+            changed = True
+        if not changed:
+            operations.append(Operation("skip", spec.name, state.shape_id))
+    wanted = {spec.name for spec in desired}
+    operations.extend(Operation("delete", name, state.shape_id)
+                      for name, state in current.items() if name not in wanted)
+    return operations
+
+
+class SlideModel:
+    def __init__(self):
+        """
+        Per-document record of the managed shapes and their hashes
+
+        A document's record is trusted while the backend's fingerprint
+        (file size and mtime, or the slide's shape ids) is unchanged;
+        otherwise the slide is scanned once to rebuild it.
+        """
+        self._documents = {}
+        self._lock = threading.Lock()
+        self.scans = 0
+        self.counts = dict.fromkeys(OPERATIONS, 0)
+
+    def render(self, key, backend, desired):
+        """
+        Bring a slide to the desired shapes, applying only the differences
+
+        Args:
+            key (str): Document and slide the record is kept under
+            backend: PptxSlide or ComSlide
+            desired (list): deck_writer.ShapeSpec list
+
+        Returns:
+            list[Operation]: Every operation, skips included
+        """
+        fingerprint = backend.fingerprint()
+        with self._lock:
+            entry = self._documents.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            current = entry[1]
+        else:
+            current = backend.scan()
+            with self._lock:
+                self.scans += 1
+
+        operations = plan(current, desired)
+        states = dict(current)
+        if any(operation.op != "skip" for operation in operations):
+            specs = {spec.name: spec for spec in desired}
+            backend.begin()
+            for index, operation in enumerate(operations):
+                spec = specs.get(operation.shape)
+                if operation.op == "add":
+                    shape_id = backend.add(spec)
+                    operations[index] = operation._replace(shape_id=shape_id)
+                    states[spec.name] = ShapeState.from_spec(spec, shape_id)
+                elif operation.op == "update_layout":
+                    backend.set_layout(operation.shape_id, spec)
+                    states[spec.name] = ShapeState.from_spec(spec, operation.shape_id)
+                elif operation.op == "update_text":
+                    backend.set_text(operation.shape_id, spec.text)
+                    states[spec.name] = ShapeState.from_spec(spec, operation.shape_id)
+                elif operation.op == "delete":
+                    backend.delete(operation.shape_id)
+                    del states[operation.shape]
+            backend.commit()
+            fingerprint = backend.fingerprint()
+
+        with self._lock:
+            self._documents[key] = (fingerprint, states)
+            for operation in operations:
+                self.counts[operation.op] += 1
+        return operations
+
+    def record(self, key, backend):
+        """
+        Scan a slide written outside the model and keep its managed shapes
+
+        Returns:
+            dict: Shape name -> ShapeState, with the ids the slide was given
+        """
+        states = backend.scan()
+        fingerprint = backend.fingerprint()
+        with self._lock:
+            self.scans += 1
+            self._documents[key] = (fingerprint, states)
+        return states
+
+    def shapes(self, key):
+        """The recorded shapes of a document, or None"""
+        with self._lock:
+            entry = self._documents.get(key)
+        return None if entry is None else {name: state.as_dict() for name, state in entry[1].items()}
+
+    def forget(self, key):
+        with self._lock:
+            self._documents.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"documents": len(self._documents), "scans": self.scans,
+                    "operations": dict(self.counts)}
+
+
+# .pptx backend
+
+def _namespaces(data):
+    """Every prefix -> URI declared in an XML document"""
+    return dict(event[1] for event in ET.iterparse(io.BytesIO(data), events=("start-ns",)))
+
+
+_ROOT_TAG = re.compile(rb"<(?!\?)[^>]*>")
+
+
+def _serialize(root, namespaces):
+    """
+    Serialize a slide keeping its original prefixes and declarations
+
+    ElementTree drops declarations no element uses, but prefixes such as
+    p14 may still be referenced from mc:Ignorable, so they are restored.
+    """
+    for prefix, uri in namespaces.items():
+        if prefix:
+            ET.register_namespace(prefix, uri)
+    data = ET.tostring(root, encoding="UTF-8", xml_declaration=True)
+    match = _ROOT_TAG.search(data)
+    tag = match.group(0)
+    missing = b"".join(f' xmlns:{prefix}="{uri}"'.encode("utf-8")
+                       for prefix, uri in namespaces.items()
+                       if prefix and f"xmlns:{prefix}=".encode("utf-8") not in tag)
+    if not missing:
+        return data
+    end = len(tag) - (2 if tag.endswith(b"/>") else 1)
+    return data[:match.start()] + tag[:end] + missing + tag[end:] + data[match.end():]
+
+
+def _fragment(xml):
+    """Parse shape XML built by deck_writer into an element"""
+    wrapper = f'<p:spTree xmlns:a="{A_NS[1:-1]}" xmlns:p="{P_NS[1:-1]}">{xml}</p:spTree>'
+    return ET.fromstring(wrapper)[0]
+
+
+class PptxSlide:
+    def __init__(self, path, slide_index=0):
+        """
+        One slide of a .pptx file, edited through a copy-on-write clone
+
+        Nothing is read until the slide is scanned or changed; on commit
+        only the slide part is re-compressed and every other part is
+        copied as stored.
+        """
+        self.path = path
+        self.slide_index = slide_index
+        self._clone = None
+        self._part = None
+        self._root = None
+        self._namespaces = None
+
+    def fingerprint(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load(self):
+        if self._root is not None:
+            return
+        template = ParsedTemplate(os.path.basename(self.path), self.path)
+        parts = template.slide_parts()
+        if self.slide_index >= len(parts):
+            raise IndexError(f"{self.path} has {len(parts)} slides; slide {self.slide_index + 1} requested")
+        self._clone = PresentationClone(template)
+        self._part = parts[self.slide_index]
+        data = self._clone.read(self._part)
+        self._namespaces = _namespaces(data)
+        self._root = ET.fromstring(data)
+
+    def _tree(self):
+        return self._root.find(f"{P_NS}cSld/{P_NS}spTree")
+
+    def _shapes(self):
+        """(element, id, name) of every top-level shape"""
+        for element in self._tree().findall(f"{P_NS}sp"):
+            properties = element.find(f"{P_NS}nvSpPr/{P_NS}cNvPr")
+            if properties is not None:
+                yield element, int(properties.get("id")), properties.get("name", "")
+
+    def _element(self, shape_id):
+        for element, number, _ in self._shapes():
+            if number == shape_id:
+                return element
+        raise KeyError(f"Shape {shape_id} not found on {self._part}")
+
+    def scan(self):
+        self._load()
+        states = {}
+        for element, shape_id, name in self._shapes():
+            if name not in MANAGED_SHAPES or name in states:
+                continue
+            text = "".join(node.text or "" for node in element.iter(f"{A_NS}t"))
+            offset = element.find(f"{P_NS}spPr/{A_NS}xfrm/{A_NS}off")
+            extent = element.find(f"{P_NS}spPr/{A_NS}xfrm/{A_NS}ext")
+            run = element.find(f".//{A_NS}rPr")
+            filled = element.find(f"{P_NS}spPr/{A_NS}solidFill") is not None
+            layout = layout_hash(
+                offset.get("x", 0) if offset is not None else 0,
+                offset.get("y", 0) if offset is not None else 0,
+                extent.get("cx", 0) if extent is not None else 0,
+                extent.get("cy", 0) if extent is not None else 0,
+                run.get("sz", 0) if run is not None else 0, filled)
+            states[name] = ShapeState(name, shape_id, text, layout)
+        return states
+
+    def begin(self):
+        self._load()
+
+    def set_text(self, shape_id, text):
+        """Replace the text of the first run, dropping any other runs and paragraphs"""
+        body = self._element(shape_id).find(f"{P_NS}txBody")
+        paragraphs = body.findall(f"{A_NS}p")
+        for paragraph in paragraphs[1:]:
+            body.remove(paragraph)
+        paragraph = paragraphs[0]
+        runs = paragraph.findall(f"{A_NS}r")
+        if not runs:
+            run = ET.SubElement(paragraph, f"{A_NS}r")
+            ET.SubElement(run, f"{A_NS}t")
+            runs = [run]
+        for child in list(paragraph):
+            if child is not runs[0] and child.tag in (f"{A_NS}r", f"{A_NS}br", f"{A_NS}fld"):
+                paragraph.remove(child)
+        runs[0].find(f"{A_NS}t").text = text
+
+    def set_layout(self, shape_id, spec):
+        """Rebuild the shape from its spec, keeping its id and place in the tree"""
+        tree = self._tree()
+        old = self._element(shape_id)
+        index = list(tree).index(old)
+        tree.remove(old)
+        tree.insert(index, _fragment(deck_writer.shape_xml(shape_id, spec)))
+
+    def add(self, spec):
+        ids = [int(node.get("id")) for node in self._root.iter(f"{P_NS}cNvPr") if node.get("id", "").isdigit()]
+        shape_id = max(ids, default=1) + 1
+        self._tree().append(_fragment(deck_writer.shape_xml(shape_id, spec)))
+        return shape_id
+
+    def delete(self, shape_id):
+        self._tree().remove(self._element(shape_id))
+
+    def commit(self):
+        """Write the changed slide back to the file (atomic replace)"""
+        self._clone.write(self._part, _serialize(self._root, self._namespaces))
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        self._clone.save(temp_path)
+        os.replace(temp_path, self.path)
+
+
+# PowerPoint object model backend
+
+def _is_rectangle(shape):
+    return shape.Type == MSO_AUTO_SHAPE and shape.AutoShapeType == MSO_SHAPE_RECTANGLE and shape.HasTextFrame
+
+
+class ComSlide:
+    def __init__(self, app, slide):
+        """A slide of the running PowerPoint, changed through its object model (points)"""
+        self.app = app
+        self.slide = slide
+
+    def fingerprint(self):
+        return tuple(sorted(shape.Id for shape in self.slide.Shapes))
+
+    def _shape(self, shape_id):
+        for shape in self.slide.Shapes:
+            if shape.Id == shape_id:
+                return shape
+        raise KeyError(f"Shape {shape_id} not found on slide {self.slide.SlideIndex}")
+
+    def scan(self):
+        emu = deck_writer.EMU_PER_POINT
+        states = {}
+        for shape in self.slide.Shapes:
+            if shape.Name not in MANAGED_SHAPES or shape.Name in states or not shape.HasTextFrame:
+                continue
+            text_range = shape.TextFrame.TextRange
+            layout = layout_hash(round(shape.Left * emu), round(shape.Top * emu),
+                                 round(shape.Width * emu), round(shape.Height * emu),
+                                 round(text_range.Font.Size * 100), shape.Fill.Visible)
+            states[shape.Name] = ShapeState(shape.Name, shape.Id, text_range.Text, layout)
+        return states
+
+    def adopt(self, text):
+        """
+        Make the shapes the GUI workflow drew the managed result shape
+
+        The workflow types the value into a text box over a drawn
+        rectangle: the text moves into the rectangle, the text box is
+        deleted and the rectangle is named RESULT_SHAPE, so the next scan
+        finds it. Returns the shape id, or None if no shape holds the text.
+        """
+        shapes = list(self.slide.Shapes)
+        holder = next((shape for shape in reversed(shapes) if shape.HasTextFrame
+                       and shape.TextFrame.TextRange.Text.strip() == text.strip()), None)
+        if holder is None:
+            return None
+        result = holder
+        if not _is_rectangle(holder):
+            rectangle = next((shape for shape in reversed(shapes) if shape.Id != holder.Id
+                              and _is_rectangle(shape) and shape.Name not in MANAGED_SHAPES
+                              and not shape.TextFrame.TextRange.Text.strip()), None)
+            if rectangle is not None:
+                rectangle.TextFrame.TextRange.Text = holder.TextFrame.TextRange.Text
+                holder.Delete()
+                result = rectangle
+        result.Name = deck_writer.RESULT_SHAPE
+        return result.Id
+
+    def begin(self):
+        self.app.StartNewUndoEntry()  # One undo step for the whole update
+
+    def set_text(self, shape_id, text):
+        # Assigning the range text keeps the run's formatting
+        self._shape(shape_id).TextFrame.TextRange.Text = text
+
+    def set_layout(self, shape_id, spec):
+        shape = self._shape(shape_id)
+        emu = deck_writer.EMU_PER_POINT
+        shape.Left, shape.Top = spec.x / emu, spec.y / emu
+        shape.Width, shape.Height = spec.cx / emu, spec.cy / emu
+        shape.TextFrame.TextRange.Font.Size = spec.size / 100
+        shape.Fill.Visible = shape.Line.Visible = bool(spec.filled)
+
+    def add(self, spec):
+        emu = deck_writer.EMU_PER_POINT
+        shape = self.slide.Shapes.AddShape(1, spec.x / emu, spec.y / emu,  # msoShapeRectangle
+                                           spec.cx / emu, spec.cy / emu)
+        shape.Name = spec.name
+        shape.TextFrame.TextRange.Text = spec.text
+        shape.TextFrame.TextRange.Font.Size = spec.size / 100
+        shape.Fill.Visible = shape.Line.Visible = bool(spec.filled)
+        return shape.Id
+
+    def delete(self, shape_id):
+        self._shape(shape_id).Delete()
+
+    def commit(self):
+        pass
@@ -0,0 +1,160 @@
+"""
+Slide Thumbnail Module for PowerPoint Automation Agent
+Rasterizes the generated slide (rectangle + text) to a small cached PNG
+"""
+
+import hashlib
+import io
+import os
+
+from deck_writer import RECT_HEIGHT, RECT_WIDTH, SLIDE_HEIGHT, SLIDE_WIDTH
+from tool_cache import LRUCache
+
+# Bump when the drawing code changes so stale cached thumbnails are ignored
+RENDER_VERSION = 1
+MAX_WIDTH = 800
+MAX_BYTES = 100 * 1024
+
+BACKGROUND = (255, 255, 255)
+RECT_FILL = (68, 114, 196)
+RECT_OUTLINE = (47, 82, 143)
+TEXT_COLOR = (255, 255, 255)
+
+
+def _load_font(size):
+    """Return a scalable font, falling back to Pillow's bitmap font"""
+    from PIL import ImageFont
+
+    for name in ("arial.ttf", "DejaVuSans.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+
+def render_slide_png(text, width=480):
+    """
+    Draw a slide with a centered filled rectangle containing the text
+
+    Args:
+        text (str): Text shown inside the rectangle
+        width (int): Thumbnail width in pixels (height follows the slide ratio)
+
+    Returns:
+        bytes: PNG image data
+    """
+    from PIL import Image, ImageDraw
+
+    width = max(64, min(int(width), MAX_WIDTH))
+    height = width * SLIDE_HEIGHT // SLIDE_WIDTH
+    rect_w = width * RECT_WIDTH // SLIDE_WIDTH
+    rect_h = height * RECT_HEIGHT // SLIDE_HEIGHT
+    x1 = (width - rect_w) // 2
+    y1 = (height - rect_h) // 2
+
+    image = Image.new("RGB", (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([x1, y1, x1 + rect_w, y1 + rect_h], fill=RECT_FILL,
+                   outline=RECT_OUTLINE, width=max(1, width // 240))
+
+    # Shrink the font until the text fits inside the rectangle
+    text = str(text)
+    size = max(8, rect_h // 3)
+    while True:
+        font = _load_font(size)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        if (right - left <= rect_w * 0.9 and bottom - top <= rect_h * 0.8) or size <= 8:
+            break
+        size -= max(1, size // 8)
+    draw.text((x1 + (rect_w - (right - left)) // 2 - left,
+               y1 + (rect_h - (bottom - top)) // 2 - top),
+              text, fill=TEXT_COLOR, font=font)
+
+    # Few flat colours: a palette PNG is a fraction of the RGB size
+    output = io.BytesIO()
+    image.quantize(colors=32).save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=None, max_entries=128, max_bytes=8 * 1024 * 1024):
+        """
+        Cache rendered thumbnails by content hash
+
+        Args:
+            cache_dir (str): Optional directory for persisting thumbnails across runs
+            max_entries (int): Maximum number of thumbnails kept in memory
+            max_bytes (int): Maximum total size of thumbnails kept in memory
+        """
+        self.cache_dir = cache_dir
+        self._memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.renders = 0
+
+    @staticmethod
+    def content_hash(text, width, max_bytes):
+        """Hash everything that affects the rendered image"""
+        key = f"{RENDER_VERSION}|{width}|{max_bytes}|{text}".encode("utf-8")
+        return hashlib.sha256(key).hexdigest()
+
+    def get(self, text, width=480, max_bytes=MAX_BYTES):
+        """
+        Return PNG bytes for the slide, rendering only on a cache miss
+
+        The image is re-rendered at smaller widths until it fits in max_bytes.
+        Returns None when Pillow is unavailable or the image cannot fit.
+        """
+        text = str(text)
+        digest = self.content_hash(text, width, max_bytes)
+        hit, png = self._memory.get(digest)
+        if hit:
+            return png
+
+        disk_path = os.path.join(self.cache_dir, f"{digest}.png") if self.cache_dir else None
+        if disk_path and os.path.exists(disk_path):
+            with open(disk_path, "rb") as f:
+                png = f.read()
+            self._memory.put(digest, png, size=len(png))
+            return png
+
+        try:
+            png = render_slide_png(text, width)
+            self.renders += 1
+            while len(png) > max_bytes and width > 64:
+                width //= 2
+                png = render_slide_png(text, width)
+                self.renders += 1
+        except ImportError:
+            print("Warning: Pillow not installed, slide thumbnail skipped.")
+            return None
+        if len(png) > max_bytes:
+            return None
+
+        self._memory.put(digest, png, size=len(png))
+        if disk_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{disk_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, disk_path)
+        return png
+
+    def stats(self):
+        """Return cache statistics including the number of actual renders"""
+        stats = self._memory.stats()
+        stats["renders"] = self.renders
+        return stats
+
+
+_default_cache = None
+
+
+def get_slide_thumbnail(text, width=480, max_bytes=MAX_BYTES):
+    """Render (or fetch from cache) the thumbnail for a slide showing text"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ThumbnailCache(cache_dir=os.getenv("THUMBNAIL_CACHE_DIR") or None)
+    return _default_cache.get(text, width, max_bytes)
@@ -0,0 +1,148 @@
+"""
+Strategy Statistics Module for PowerPoint MCP Server
+Records how each fallback strategy of a GUI action (keyboard, mouse, ...)
+performs on this host, persists the numbers, and orders the strategies so
+the historically fastest successful one is tried first
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+ALPHA = 0.3             # Weight of the newest attempt in the moving averages
+RELIABLE = 0.5          # Success rate above which a strategy outranks untried ones
+
+
+class StrategyStats:
+    def __init__(self, path=None, host=None, save_every=1):
+        """
+        Per-host, per-action statistics of GUI strategies
+
+        Args:
+            path (str): JSON file shared by all hosts (PPT_STRATEGY_STATS or
+                gui_strategy_stats.json); None or "" keeps the numbers in memory
+            host (str): Host key; the machine name by default
+            save_every (int): Write the file after this many recorded attempts
+        """
+        self.path = path
+        self.host = host or socket.gethostname()
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._actions = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._actions = json.load(f).get(self.host, {})
+            except (OSError, ValueError):
+                self._actions = {}
+
+    @staticmethod
+    def _score(entry):
+        """Expected seconds until success: mean attempt time over success rate"""
+        return entry["seconds"] / max(entry["success_rate"], 0.05)
+
+    def order(self, action, names):
+        """
+        Return the strategy names in the order they should be tried
+
+        Reliable strategies come first, fastest expected success first;
+        untried ones keep their declared order after them, and strategies
+        that mostly fail go last.
+        """
+        with self._lock:
+            known = self._actions.get(action, {})
+            reliable = sorted((name for name in names
+                               if name in known and known[name]["success_rate"] >= RELIABLE),
+                              key=lambda name: self._score(known[name]))
+            untried = [name for name in names if name not in known]
+            failing = sorted((name for name in names
+                              if name in known and known[name]["success_rate"] < RELIABLE),
+                             key=lambda name: self._score(known[name]))
+        return reliable + untried + failing
+
+    def record(self, action, name, ok, seconds):
+        with self._lock:
+            entry = self._actions.setdefault(action, {}).get(name)
+            if entry is None:
+                entry = self._actions[action][name] = {
+                    "attempts": 0, "successes": 0, "success_rate": 1.0 if ok else 0.0,
+                    "seconds": seconds, "last_used": 0.0}
+            entry["attempts"] += 1
+            entry["successes"] += int(ok)
+            entry["success_rate"] += ALPHA * ((1.0 if ok else 0.0) - entry["success_rate"])
+            entry["seconds"] += ALPHA * (seconds - entry["seconds"])
+            entry["last_used"] = time.time()
+            self._unsaved += 1
+            save = self.path and self._unsaved >= self.save_every
+        if save:
+            self.save()
+
+    def run(self, action, strategies, last_resort=None, on_failure=None):
+        """
+        Try strategies in adaptive order until one succeeds
+
+        Args:
+            action (str): Action name the statistics are kept under
+            strategies (list): (name, callable) pairs in their default order
+            last_resort (tuple): Optional (name, callable) that is always tried
+                last, e.g. a degraded fallback that should never be preferred
+            on_failure: Optional callable(name, exception) for logging
+
+        Returns:
+            tuple: (strategy name, callable result)
+
+        Raises:
+            Exception: The last strategy's error if every strategy failed
+        """
+        functions = dict(strategies)
+        ordered = [(name, functions[name]) for name in self.order(action, list(functions))]
+        if last_resort is not None:
+            ordered.append(last_resort)
+        error = None
+        for name, fn in ordered:
+            started = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                self.record(action, name, False, time.perf_counter() - started)
+                if on_failure is not None:
+                    on_failure(name, e)
+                error = e
+                continue
+            self.record(action, name, True, time.perf_counter() - started)
+            return name, result
+        raise error
+
+    def stats(self):
+        """This host's statistics with each action's current strategy order"""
+        with self._lock:
+            actions = json.loads(json.dumps(self._actions))
+        for action, entries in actions.items():
+            for entry in entries.values():
+                entry["expected_seconds"] = round(self._score(entry), 4)
+            actions[action] = {"order": self.order(action, list(entries)), "strategies": entries}
+        return {"host": self.host, "path": self.path or None, "actions": actions}
+
+    def save(self):
+        """Merge this host's numbers into the shared file (atomic replace)"""
+        if not self.path:
+            return
+        with self._lock:
+            snapshot = json.loads(json.dumps(self._actions))
+            self._unsaved = 0
+        data = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        data[self.host] = snapshot
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
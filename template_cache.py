@@ -0,0 +1,288 @@
+"""
+Template Cache Module for PowerPoint MCP Server
+Parses named .pptx/.potx templates once and hands out copy-on-write clones
+"""
+
+import os
+import posixpath
+import re
+import struct
+import threading
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from types import MappingProxyType
+
+from deck_writer import ZipStreamWriter
+from tool_cache import LRUCache
+
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+CT_TEMPLATE = "application/vnd.openxmlformats-officedocument.presentationml.template.main+xml"
+CT_PRESENTATION = "application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"
+
+# Template names end up in job file names, so they cannot hold path parts
+TEMPLATE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+# A part exactly as stored in the source package (still compressed)
+RawPart = namedtuple("RawPart", "method crc size data")
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+
+
+def _read_raw_parts(path):
+    """Read every zip entry without decompressing it"""
+    parts = {}
+    with zipfile.ZipFile(path) as package, open(path, "rb") as raw:
+        for info in package.infolist():
+            if info.is_dir():
+                continue
+            if info.flag_bits & 0x1:
+                raise ValueError(f"Encrypted entry not supported: {info.filename}")
+            raw.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(raw.read(_LOCAL_HEADER.size))
+            raw.seek(header[9] + header[10], os.SEEK_CUR)
+            parts[info.filename] = RawPart(info.compress_type, info.CRC,
+                                           info.file_size, raw.read(info.compress_size))
+    return parts
+
+
+def _decompress(part):
+    if part.method == zipfile.ZIP_STORED:
+        return part.data
+    if part.method == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(part.data, -15)
+    raise ValueError(f"Unsupported compression method: {part.method}")
+
+
+def _rels_path(part_name):
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", filename + ".rels")
+
+
+class ParsedTemplate:
+    def __init__(self, name, path):
+        """
+        Parse a template package into an immutable in-memory representation
+
+        Args:
+            name (str): Name the template is registered under
+            path (str): Path to a .pptx or .potx file
+        """
+        self.name = name
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.parts = MappingProxyType(_read_raw_parts(path))
+        self.nbytes = sum(len(part.data) for part in self.parts.values())
+
+        content_types = self.read("[Content_Types].xml").decode("utf-8")
+        self.is_template = CT_TEMPLATE in content_types
+
+        self.presentation_part = self._targets("", "officeDocument")[0]
+        presentation = ET.fromstring(self.read(self.presentation_part))
+        size = presentation.find(f"{P_NS}sldSz")
+        self.slide_size = (int(size.get("cx")), int(size.get("cy"))) if size is not None else None
+        slide_list = presentation.find(f"{P_NS}sldIdLst")
+        self.slide_count = len(slide_list) if slide_list is not None else 0
+
+        self.masters = self._targets(self.presentation_part, "slideMaster")
+        self.layouts = []
+        self.themes = []
+        for master in self.masters:
+            for layout in self._targets(master, "slideLayout"):
+                c_sld = ET.fromstring(self.read(layout)).find(f"{P_NS}cSld")
+                self.layouts.append({
+                    "part": layout,
+                    "name": c_sld.get("name", "") if c_sld is not None else "",
+                    "master": master,
+                })
+            for theme in self._targets(master, "theme"):
+                self.themes.append({
+                    "part": theme,
+                    "name": ET.fromstring(self.read(theme)).get("name", ""),
+                })
+
+    def read(self, part_name):
+        """Return the decompressed bytes of a part"""
+        return _decompress(self.parts[part_name])
+
+    def _targets(self, part_name, rel_type):
+        """Resolve relationship targets of a given type for a part"""
+        rels_name = _rels_path(part_name) if part_name else "_rels/.rels"
+        if rels_name not in self.parts:
+            return []
+        return [target for rel_id, target in self._relationships(rels_name, part_name, rel_type)]
+
+    def _relationships(self, rels_name, part_name, rel_type):
+        """(relationship id, resolved part name) pairs of one type"""
+        base = posixpath.dirname(part_name)
+        pairs = []
+        for rel in ET.fromstring(self.read(rels_name)).iter(f"{PKG_REL_NS}Relationship"):
+            if rel.get("Type") == REL_TYPE + rel_type and rel.get("TargetMode") != "External":
+                target = rel.get("Target")
+                if target.startswith("/"):
+                    pairs.append((rel.get("Id"), target.lstrip("/")))
+                else:
+                    pairs.append((rel.get("Id"), posixpath.normpath(posixpath.join(base, target))))
+        return pairs
+
+    def slide_parts(self):
+        """Slide part names in presentation order"""
+        rels_name = _rels_path(self.presentation_part)
+        if rels_name not in self.parts:
+            return []
+        targets = dict(self._relationships(rels_name, self.presentation_part, "slide"))
+        slide_list = ET.fromstring(self.read(self.presentation_part)).find(f"{P_NS}sldIdLst")
+        if slide_list is None:
+            return []
+        return [targets[slide.get(f"{R_NS}id")] for slide in slide_list
+                if slide.get(f"{R_NS}id") in targets]
+
+    def summary(self):
+        """Return a JSON-friendly description of the template"""
+        return {
+            "name": self.name,
+            "path": self.path,
+            "is_template": self.is_template,
+            "slide_size": self.slide_size,
+            "slides": self.slide_count,
+            "masters": list(self.masters),
+            "layouts": [layout["name"] for layout in self.layouts],
+            "themes": [theme["name"] for theme in self.themes],
+            "parts": len(self.parts),
+            "bytes": self.nbytes,
+        }
+
+
+class PresentationClone:
+    def __init__(self, template):
+        """
+        Copy-on-write view of a parsed template
+
+        Reads fall through to the shared template parts. Writes go to a
+        private overlay, so cloning costs nothing until a part is modified,
+        and unmodified parts are copied to disk still compressed.
+        """
+        self.template = template
+        self._overlay = {}
+        self._removed = set()
+
+        if template.is_template:
+            # A .potx must be saved with the presentation content type to
+            # open as a regular document
+            content_types = template.read("[Content_Types].xml")
+            self.write("[Content_Types].xml",
+                       content_types.replace(CT_TEMPLATE.encode(), CT_PRESENTATION.encode()))
+
+    def names(self):
+        """Return all part names in the clone"""
+        names = [name for name in self.template.parts if name not in self._removed]
+        names.extend(name for name in self._overlay if name not in self.template.parts)
+        return names
+
+    def read(self, part_name):
+        """Return the current bytes of a part"""
+        if part_name in self._overlay:
+            return self._overlay[part_name]
+        if part_name in self._removed:
+            raise KeyError(part_name)
+        return self.template.read(part_name)
+
+    def write(self, part_name, data):
+        """Replace or add a part in this clone only"""
+        self._removed.discard(part_name)
+        self._overlay[part_name] = data
+
+    def remove(self, part_name):
+        """Remove a part from this clone only"""
+        self._overlay.pop(part_name, None)
+        if part_name in self.template.parts:
+            self._removed.add(part_name)
+
+    @property
+    def modified_parts(self):
+        return sorted(self._overlay)
+
+    def save(self, path):
+        """Write the clone to a .pptx file and return the path"""
+        writer = ZipStreamWriter(path)
+        try:
+            for name in self.names():
+                if name in self._overlay:
+                    writer.write_part(name, [self._overlay[name]])
+                else:
+                    part = self.template.parts[name]
+                    writer.write_raw(name, part.method, part.crc, part.size, part.data)
+            writer.close()
+        except Exception:
+            writer.abort()
+            raise
+        return path
+
+
+class TemplateCache:
+    def __init__(self, max_entries=8, max_bytes=64 * 1024 * 1024):
+        """
+        Cache of parsed templates keyed by name
+
+        Args:
+            max_entries (int): Maximum number of parsed templates kept in memory
+            max_bytes (int): Maximum total size of cached template parts
+        """
+        self._paths = {}
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self.parses = 0
+
+    def register(self, name, path):
+        """
+        Associate a template name with a file path
+
+        Raises:
+            ValueError: A name other than letters, digits, "_", "." and "-"
+                (such as one holding a path separator)
+        """
+        if not TEMPLATE_NAME.fullmatch(name) or ".." in name:
+            raise ValueError(f"Invalid template name {name!r}; use letters, digits, '_', '.' and '-'")
+        path = os.path.abspath(path)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Template not found: {path}")
+        with self._lock:
+            self._paths[name] = path
+
+    def get(self, name):
+        """Return the parsed template, parsing it only on a miss or file change"""
+        with self._lock:
+            path = self._paths.get(name)
+        if path is None:
+            raise KeyError(f"Unknown template: {name}")
+
+        hit, template = self._cache.get(name)
+        if hit and template.path == path and template.mtime == os.path.getmtime(path):
+            return template
+
+        template = ParsedTemplate(name, path)
+        self.parses += 1
+        self._cache.put(name, template, size=template.nbytes)
+        return template
+
+    def load(self, name, path):
+        """Register and parse a template in one step"""
+        self.register(name, path)
+        return self.get(name)
+
+    def clone(self, name):
+        """Return a copy-on-write clone of a named template"""
+        return PresentationClone(self.get(name))
+
+    def stats(self):
+        """Return cache statistics including the number of parses performed"""
+        stats = self._cache.stats()
+        stats["parses"] = self.parses
+        with self._lock:
+            stats["registered"] = sorted(self._paths)
+        return stats
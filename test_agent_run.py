@@ -0,0 +1,196 @@
+"""
+Tests for the slotted per-run agent state
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agent_run import AgentRun, COMPLETED, CREATED, FAILED, INCOMPLETE, POWERPOINT_WORKFLOW
+
+TOOLS = [
+    SimpleNamespace(name="strings_to_chars_to_int", description="ASCII values",
+                    inputSchema={"properties": {"string": {"type": "string"}}, "required": ["string"]}),
+    SimpleNamespace(name="int_list_to_exponential_sum", description="Sum of exponentials",
+                    inputSchema={"properties": {"int_list": {"type": "array"}}, "required": ["int_list"]}),
+] + [SimpleNamespace(name=name, description=header, inputSchema={})
+     for name, header in POWERPOINT_WORKFLOW]
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    async def initialize(self):
+        pass
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=TOOLS)
+
+    async def call_tool(self, name, arguments=None):
+        self.calls.append((name, arguments))
+        await asyncio.sleep(0)
+        if name == "strings_to_chars_to_int":
+            text = [str(ord(c)) for c in arguments["string"]]
+        else:
+            text = [f"{name} done"]
+        return SimpleNamespace(content=[SimpleNamespace(text=t) for t in text])
+
+
+def scripted(word):
+    async def generate(prompt):
+        await asyncio.sleep(0)
+        if "int_list_to_exponential_sum with" in prompt:
+            reply = f"FINAL_ANSWER: [{len(word)}]"
+        elif "strings_to_chars_to_int with" in prompt:
+            reply = "FUNCTION_CALL: int_list_to_exponential_sum|[1, 2]"
+        else:
+            reply = f"FUNCTION_CALL: strings_to_chars_to_int|{word}"
+        return SimpleNamespace(text=reply)
+    return generate
+
+
+def test_run_lifecycle_and_close():
+    session = FakeSession()
+    run = AgentRun(scripted("INDIA"), echo=False)
+    assert run.state == CREATED and not hasattr(run, "__dict__")
+
+    assert asyncio.run(run.run(session)) == "[5]"
+    assert run.state == COMPLETED
+    assert run.checkpoint.completed_steps == [name for name, _ in POWERPOINT_WORKFLOW]
+    assert session.calls[0] == ("strings_to_chars_to_int", {"string": "INDIA"})
+    assert any("Final Answer: FINAL_ANSWER: [5]" in line for line in run.logs)
+
+    live = run.footprint()
+    run.close()
+    assert run.tools is None and run.iteration_response is None
+    assert 0 < run.footprint() < live
+    with pytest.raises(RuntimeError):
+        asyncio.run(run.run(session))
+
+
+def test_concurrent_runs_do_not_share_state():
+    words = ["A" * n for n in range(1, 51)]
+
+    async def run_all():
+        runs = [AgentRun(scripted(word), echo=False) for word in words]
+        await asyncio.gather(*(run.run(FakeSession()) for run in runs))
+        return runs
+
+    runs = asyncio.run(run_all())
+    assert [run.final_answer for run in runs] == [f"[{len(word)}]" for word in words]
+    assert all(run.state == COMPLETED for run in runs)
+    assert runs[0].system_prompt is runs[1].system_prompt
+
+
+def test_failures_are_recorded():
+    class BrokenSession(FakeSession):
+        async def list_tools(self):
+            raise ConnectionError("server gone")
+
+    run = AgentRun(scripted("X"), echo=False)
+    with pytest.raises(ConnectionError):
+        asyncio.run(run.run(BrokenSession()))
+    assert run.state == FAILED and run.error == "server gone" and run.finished
+
+    async def no_answer(prompt):
+        return SimpleNamespace(text="I am not sure")
+
+    run = AgentRun(no_answer, echo=False, max_iterations=3)
+    assert asyncio.run(run.run(FakeSession())) is None
+    assert run.state == INCOMPLETE and run.iteration == 3
+
+
+def test_run_reports_cached_tokens():
+    generate = scripted("INDIA")
+
+    async def cached_generate(prompt):
+        response = await generate(prompt)
+        response.tokens = len(prompt) // 4
+        response.cached_tokens = len(prompt.prefix) // 4
+        return response
+
+    run = AgentRun(cached_generate, echo=False)
+    asyncio.run(run.run(FakeSession()))
+    assert run.final_answer == "[5]"
+    assert 0 < run.cached_tokens < run.llm_tokens
+    assert any("served from the cached system prompt" in line for line in run.logs)
+
+
+def test_nested_typed_arrays_reach_the_prompt_as_lists():
+    """A paged read_chunk result with typed items is decoded before the prompt is built"""
+    from numeric_codec import encode_array
+
+    read_chunk = SimpleNamespace(name="read_chunk", description="One page of a handle",
+                                 inputSchema={"properties": {"handle": {"type": "string"},
+                                                             "cursor": {"type": "integer"}},
+                                              "required": ["handle"]})
+
+    class PagedSession(FakeSession):
+        async def list_tools(self):
+            return SimpleNamespace(tools=TOOLS + [read_chunk])
+
+        async def call_tool(self, name, arguments=None):
+            if name != "read_chunk":
+                return await super().call_tool(name, arguments)
+            self.calls.append((name, arguments))
+            page = {"handle": arguments["handle"], "items": encode_array([73, 78, 68]),
+                    "cursor": 0, "next_cursor": None, "total": 3}
+            return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(page, indent=2))])
+
+    prompts = []
+
+    async def generate(prompt):
+        prompts.append(prompt)
+        if "int_list_to_exponential_sum with" in prompt:
+            reply = "FINAL_ANSWER: [3]"
+        elif "read_chunk with" in prompt:
+            reply = "FUNCTION_CALL: int_list_to_exponential_sum|[73, 78, 68]"
+        else:
+            reply = "FUNCTION_CALL: read_chunk|h_3f2a9c1d0b7e|0"
+        return SimpleNamespace(text=reply)
+
+    session = PagedSession()
+    run = AgentRun(generate, echo=False)
+    assert asyncio.run(run.run(session)) == "[3]"
+    assert all("$typed" not in prompt for prompt in prompts)
+    assert '"items": [73, 78, 68]' in prompts[1]
+    assert session.calls[1] == ("int_list_to_exponential_sum", {"int_list": [73, 78, 68]})
+    assert "[73,78,68]" in run.typed_arrays
+
+
+def test_open_presentation_is_updated_with_render_value():
+    render_value = SimpleNamespace(name="render_value", description="Render a value",
+                                   inputSchema={"properties": {"value": {"type": "string"}},
+                                                "required": ["value"]})
+
+    class RenderingSession(FakeSession):
+        def __init__(self, reply):
+            super().__init__()
+            self.reply = reply
+
+        async def list_tools(self):
+            return SimpleNamespace(tools=TOOLS + [render_value])
+
+        async def call_tool(self, name, arguments=None):
+            if name != "render_value":
+                return await super().call_tool(name, arguments)
+            self.calls.append((name, arguments))
+            return SimpleNamespace(content=[SimpleNamespace(text=self.reply)])
+
+    session = RenderingSession("Rendered '[5]' into slide 1 in 3.0 ms: update_text Result Rectangle")
+    run = AgentRun(scripted("INDIA"), echo=False)
+    assert asyncio.run(run.run(session)) == "[5]"
+    assert run.state == COMPLETED
+    assert run.checkpoint.completed_steps == ["render_value"]
+    assert session.calls[-1] == ("render_value", {"value": "[5]"})
+
+    # Nothing open yet: the GUI workflow draws the slide
+    session = RenderingSession("PowerPoint is not open. Please call open_powerpoint first, or pass output_path.")
+    run = AgentRun(scripted("INDIA"), echo=False)
+    assert asyncio.run(run.run(session)) == "[5]"
+    assert run.checkpoint.completed_steps == [name for name, _ in POWERPOINT_WORKFLOW]
+    assert [name for name, _ in session.calls[-7:]] == ["render_value"] + [
+        name for name, _ in POWERPOINT_WORKFLOW]
@@ -0,0 +1,99 @@
+"""
+Tests for the streaming deck writer
+"""
+
+import os
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from deck_writer import render_deck
+
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+def test_render_deck_writes_valid_package():
+    """Every slide part is present, well-formed and listed in the presentation"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deck.pptx")
+        count = render_deck(["42", {"value": 3.5, "title": "A & <B>"}, 7], path)
+
+        with zipfile.ZipFile(path) as package:
+            assert package.testzip() is None
+            names = set(package.namelist())
+            for part in ("[Content_Types].xml", "_rels/.rels", "ppt/presentation.xml",
+                         "ppt/theme/theme1.xml", "ppt/slideMasters/slideMaster1.xml"):
+                assert part in names
+
+            presentation = ET.fromstring(package.read("ppt/presentation.xml"))
+            slide_ids = presentation.find(f"{P_NS}sldIdLst")
+            assert len(slide_ids) == count == 3
+
+            texts = [
+                [t.text for t in ET.fromstring(package.read(f"ppt/slides/slide{n}.xml")).iter(f"{A_NS}t")]
+                for n in range(1, count + 1)
+            ]
+            content_types = package.read("[Content_Types].xml").decode("utf-8")
+
+    assert texts == [["42"], ["3.5", "A & <B>"], ["7"]]
+    assert content_types.count("slide+xml") == 3
+
+
+def test_render_deck_accepts_generators():
+    """Rows can be streamed from a generator"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deck.pptx")
+        assert render_deck((str(i) for i in range(250)), path) == 250
+        with zipfile.ZipFile(path) as package:
+            assert "ppt/slides/slide250.xml" in package.namelist()
+
+
+def test_control_characters_do_not_break_the_deck():
+    """Characters XML cannot hold are replaced, so the deck still opens"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deck.pptx")
+        render_deck([{"value": "4\x012", "title": "Line\x0bbreak \"quoted\""}], path)
+        with zipfile.ZipFile(path) as package:
+            slide = ET.fromstring(package.read("ppt/slides/slide1.xml"))
+        assert [t.text for t in slide.iter(f"{A_NS}t")] == ["4 2", 'Line break "quoted"']
+
+        pptx = pytest.importorskip("pptx")
+        texts = [shape.text_frame.text for shape in pptx.Presentation(path).slides[0].shapes]
+        assert texts == ["4 2", 'Line break "quoted"']
+
+
+def test_failed_render_removes_partial_file():
+    """A failure mid-stream does not leave a corrupt deck behind"""
+    def failing_rows():
+        yield "1"
+        raise RuntimeError("source failed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deck.pptx")
+        try:
+            render_deck(failing_rows(), path)
+        except RuntimeError:
+            pass
+        assert not os.path.exists(path)
+
+
+def test_shapes_slide_holds_every_box():
+    """place_shapes without PowerPoint writes the whole layout onto one slide"""
+    from deck_writer import DeckWriter, EMU_PER_POINT
+    from shape_layout import grid_layout
+
+    boxes = grid_layout([f"v{i}" for i in range(150)], 960, 540)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shapes.pptx")
+        with DeckWriter(path) as deck:
+            deck.add_shapes_slide(boxes)
+        with zipfile.ZipFile(path) as package:
+            slide = ET.fromstring(package.read("ppt/slides/slide1.xml"))
+
+    texts = [t.text for t in slide.iter(f"{A_NS}t")]
+    offsets = [(int(off.get("x")), int(off.get("y"))) for off in slide.iter(f"{A_NS}off")]
+    assert texts == [box.label for box in boxes]
+    assert offsets[-1] == (round(boxes[-1].left * EMU_PER_POINT), round(boxes[-1].top * EMU_PER_POINT))
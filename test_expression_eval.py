@@ -0,0 +1,134 @@
+"""
+Tests for compiled, cached arithmetic expressions
+"""
+
+import asyncio
+import json
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from expression_eval import (ExpressionCompiler, ExpressionError, compile_expression, evaluate,
+                             evaluate_batch, to_json)
+
+
+def test_power_binds_like_math():
+    values = {"a": 1, "b": 2, "c": 3, "d": 4}
+    assert evaluate(compile_expression("(a+b)*c^d"), values) == 243
+    assert evaluate(compile_expression("a+b^2"), values) == 5
+    assert evaluate(compile_expression("2^3^2")) == 512
+    assert evaluate(compile_expression("-2^2")) == -4
+    assert evaluate(compile_expression("sqrt(16) + max(1, 2) * pi")) == pytest.approx(4 + 2 * 3.141592653589793)
+
+
+def test_modes():
+    assert evaluate(compile_expression("0.1 + 0.2"), mode="decimal") == Decimal("0.3")
+    assert evaluate(compile_expression("1/3 + x"), {"x": "1/6"}, mode="fraction") == Fraction(1, 2)
+    root = evaluate(compile_expression("sqrt(2)"), mode="decimal", precision=50)
+    assert len(str(root)) == 51 and str(root).startswith("1.41421356237309504880")
+    assert to_json(Fraction(2, 3)) == "2/3" and to_json(Decimal("1.50")) == "1.50"
+    with pytest.raises(ExpressionError, match="not exact"):
+        evaluate(compile_expression("sqrt(2)"), mode="fraction")
+    with pytest.raises(ExpressionError, match="not available in fraction mode"):
+        evaluate(compile_expression("sin(1)"), mode="fraction")
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os')", "x.real", "[1, 2]", "(lambda: 1)()", "'text'", "x if x else 1",
+    "sqrt", "_k0", "open('f')", "sqrt(x=1)", "1 < 2", "",
+])
+def test_rejects_anything_beyond_arithmetic(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+@pytest.mark.parametrize("text", ["2^99999", "9^9^9", "(2^5000)^5000", "1/0", "(-8)^(1/3)", "exp(1000)"])
+def test_refuses_unbounded_or_invalid_results(text):
+    with pytest.raises(ExpressionError):
+        evaluate(compile_expression(text))
+
+
+def test_batch_over_vectors():
+    compiled = compile_expression("a*x + b")
+    assert evaluate_batch(compiled, {"x": [1, 2, 3]}, {"a": 2, "b": 1}) == [3, 5, 7]
+    assert evaluate_batch(compiled, {"x": [1, 2], "b": [0, 10]}, {"a": "1/2"}, mode="fraction") == [
+        Fraction(1, 2), Fraction(11)]
+    with pytest.raises(ExpressionError, match="differ in length"):
+        evaluate_batch(compiled, {"x": [1, 2], "b": [1]}, {"a": 1})
+    with pytest.raises(ExpressionError, match="Missing variables: b"):
+        evaluate_batch(compiled, {"x": [1]}, {"a": 1})
+
+
+def test_compiled_expressions_are_cached_by_text():
+    compiler = ExpressionCompiler(max_entries=2)
+    first = compiler.compile("x + 1")
+    assert compiler.compile("x + 1") is first
+    with pytest.raises(ExpressionError):
+        compiler.compile("x +")
+    compiler.compile("x + 2")
+    compiler.compile("x + 3")
+    stats = compiler.stats()
+    assert stats["hits"] == 1 and stats["entries"] == 2 and stats["evictions"] == 1
+
+
+def test_server_tool_over_mcp():
+    import powerpoint_working_mcp_server as server
+
+    async def call(arguments):
+        result = await server.mcp.call_tool("evaluate_expression", arguments)
+        content = result[0] if isinstance(result, tuple) else result
+        return json.loads(content[0].text)
+
+    assert asyncio.run(call({"expression": "(a+b)*c^d", "variables": {"a": 1, "b": 2, "c": 3, "d": 4}}))[
+        "result"] == 243
+    batch = asyncio.run(call({"expression": "x^2", "vectors": {"x": [1, 2, 3]}, "mode": "fraction"}))
+    assert batch["count"] == 3 and batch["results"] == ["1", "4", "9"]
+
+
+def test_typed_batch_results_reach_the_agent_prompt_as_lists():
+    """Encoded vector results are nested in the result dict; the agent decodes them"""
+    from types import SimpleNamespace
+
+    import numeric_codec
+    import powerpoint_working_mcp_server as server
+    from agent_run import AgentRun
+
+    async def call():
+        server.result_encoding = numeric_codec.TYPED_ENCODING
+        try:
+            result = await server.mcp.call_tool("evaluate_expression",
+                                                {"expression": "x^2", "vectors": {"x": [1, 2, 3]}})
+        finally:
+            server.result_encoding = "json"
+        return result[0] if isinstance(result, tuple) else result
+
+    content = asyncio.run(call())
+    assert '"$typed"' in content[0].text
+
+    class Session:
+        async def initialize(self):
+            pass
+
+        async def list_tools(self):
+            return SimpleNamespace(tools=[SimpleNamespace(
+                name="evaluate_expression", description="Evaluate an expression",
+                inputSchema={"properties": {"expression": {"type": "string"}}, "required": ["expression"]})])
+
+        async def call_tool(self, name, arguments=None):
+            if name == "evaluate_expression":
+                return SimpleNamespace(content=content)
+            return SimpleNamespace(content=[SimpleNamespace(text=f"{name} done")])
+
+    prompts = []
+
+    async def generate(prompt):
+        prompts.append(prompt)
+        if "evaluate_expression with" in prompt:
+            return SimpleNamespace(text="FINAL_ANSWER: [14]")
+        return SimpleNamespace(text="FUNCTION_CALL: evaluate_expression|x^2")
+
+    run = AgentRun(generate, echo=False, max_iterations=2)
+    assert asyncio.run(run.run(Session())) == "[14]"
+    assert '"results": [1, 4, 9]' in prompts[1]
+    assert "$typed" not in prompts[1]
@@ -0,0 +1,181 @@
+"""
+Tests for the persistent job queue and the job service HTTP API
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+import anyio
+from starlette.testclient import TestClient
+
+import job_service
+from job_service import JobQueue, JobService, QueueFull
+
+
+def _session_factory(opened):
+    @asynccontextmanager
+    async def factory():
+        session = {"number": len(opened)}
+        opened.append(session)
+        yield session
+
+    return factory
+
+
+async def _runner(session, payload):
+    await asyncio.sleep(payload.get("sleep", 0))
+    if payload.get("fail"):
+        raise ValueError("bad job")
+    return {"answer": payload["value"] * 2, "session": session["number"]}
+
+
+def _wait_for(client, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get(f"/jobs/{job_id}/result")
+        if response.status_code == 200:
+            return response.json()
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_submit_status_and_result():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"))
+        opened = []
+        service = JobService(_runner, _session_factory(opened), queue, workers=2, poll_interval=0.05)
+        with TestClient(service.app()) as client:
+            submitted = client.post("/jobs", json={"value": 21})
+            assert submitted.status_code == 202
+            job_id = submitted.json()["id"]
+
+            result = _wait_for(client, job_id)
+            assert result["status"] == "succeeded"
+            assert result["result"]["answer"] == 42
+
+            failed = _wait_for(client, client.post("/jobs", json={"value": 1, "fail": True}).json()["id"])
+            assert failed["status"] == "failed" and "bad job" in failed["error"]
+
+            status = client.get(f"/jobs/{job_id}").json()
+            assert status["status"] == "succeeded"
+            assert status["total_seconds"] >= status["run_seconds"] >= 0
+
+            metrics = client.get("/metrics").json()
+            assert metrics["jobs"]["succeeded"] == 1 and metrics["jobs"]["failed"] == 1
+            assert metrics["latency_seconds"]["samples"] == 2
+            assert client.get("/jobs/unknown").status_code == 404
+            assert client.post("/jobs", content=b"[1]").status_code == 400
+        # One MCP session per worker, opened once and reused across jobs
+        assert len(opened) == 2
+        queue.close()
+
+
+def test_broken_session_is_reopened():
+    """A job that kills its MCP session fails; the next job gets a fresh session"""
+    opened = []
+
+    class Session:
+        def __init__(self):
+            self.alive = True
+            self.number = len(opened)
+            opened.append(self)
+
+        async def send_ping(self):
+            if not self.alive:
+                raise anyio.ClosedResourceError()
+
+    @asynccontextmanager
+    async def factory():
+        yield Session()
+
+    async def runner(session, payload):
+        if payload.get("die"):
+            session.alive = False
+            # As the agent reports it: the transport error is not the raised one
+            raise RuntimeError("Agent did not reach a final answer")
+        if not session.alive:
+            raise anyio.ClosedResourceError()
+        return {"session": session.number}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"))
+        service = JobService(runner, factory, queue, workers=1, poll_interval=0.05)
+        with TestClient(service.app()) as client:
+            died = _wait_for(client, client.post("/jobs", json={"die": True}).json()["id"])
+            healthy = _wait_for(client, client.post("/jobs", json={}).json()["id"])
+            assert died["status"] == "failed"
+            assert healthy["status"] == "succeeded" and healthy["result"]["session"] == 1
+            assert client.get("/metrics").json()["session_restarts"] == 1
+            assert len(opened) == 2
+        queue.close()
+
+
+def test_connection_errors_are_recognized_through_causes():
+    from mcp.shared.exceptions import McpError
+    from mcp.types import CONNECTION_CLOSED, ErrorData
+
+    assert job_service.CONNECTION_CLOSED == CONNECTION_CLOSED
+    try:
+        try:
+            raise McpError(ErrorData(code=CONNECTION_CLOSED, message="Connection closed"))
+        except McpError as e:
+            raise RuntimeError("tool call failed") from e
+    except RuntimeError as wrapped:
+        assert job_service.connection_lost(wrapped)
+    assert job_service.connection_lost(anyio.BrokenResourceError())
+    assert not job_service.connection_lost(ValueError("bad job"))
+
+
+def test_workers_run_jobs_concurrently():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"))
+        service = JobService(_runner, _session_factory([]), queue, workers=3, poll_interval=0.05)
+        with TestClient(service.app()) as client:
+            started = time.perf_counter()
+            ids = [client.post("/jobs", json={"value": i, "sleep": 0.3}).json()["id"] for i in range(3)]
+            results = [_wait_for(client, job_id) for job_id in ids]
+            elapsed = time.perf_counter() - started
+        assert sorted(r["result"]["session"] for r in results) == [0, 1, 2]
+        assert elapsed < 0.8
+        queue.close()
+
+
+def test_backpressure_when_queue_full():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"), max_queued=2)
+        queue.submit({"value": 1})
+        queue.submit({"value": 2})
+        try:
+            queue.submit({"value": 3})
+            raise AssertionError("expected QueueFull")
+        except QueueFull:
+            pass
+
+        # Without workers nothing drains, so the API answers 429
+        service = JobService(_runner, _session_factory([]), queue, workers=0)
+        with TestClient(service.app()) as client:
+            response = client.post("/jobs", json={"value": 3})
+            assert response.status_code == 429
+            assert "Retry-After" in response.headers
+        queue.close()
+
+
+def test_queue_survives_restart():
+    """Queued and interrupted jobs are picked up after a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.db")
+        queue = JobQueue(path)
+        first = queue.submit({"value": 1})
+        second = queue.submit({"value": 2})
+        assert queue.claim(0)["id"] == first
+        queue.close()
+
+        reopened = JobQueue(path)
+        assert reopened.requeued == 1
+        assert [reopened.claim(0)["id"], reopened.claim(0)["id"]] == [first, second]
+        assert reopened.get(first)["attempts"] == 2
+        assert reopened.claim(0) is None
+        reopened.close()
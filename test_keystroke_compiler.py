@@ -0,0 +1,59 @@
+"""
+Tests for the coalesced ribbon keystroke scripts
+"""
+
+import pytest
+
+from keystroke_compiler import ActionCompiler, KeystrokeRunner, compile_tokens
+
+
+class FakeWindow:
+    def __init__(self):
+        self.calls = []
+
+    def type_keys(self, keys, pause=None):
+        self.calls.append(("type_keys", keys, pause))
+
+    def wait(self, state, timeout=None, retry_interval=None):
+        self.calls.append(("wait", state, timeout))
+
+
+def test_commands_compile_to_one_script():
+    compiler = ActionCompiler()
+    assert compiler.compile("insert rectangle").keys == "{VK_MENU}isr"
+    assert compiler.compile("  Insert   Text Box ").keys == "{VK_MENU}ix"
+    assert compiler.compile("new presentation").keys == "^n"
+    assert compile_tokens(["ALT", "+", "%x", "ENTER"]) == "{VK_MENU}{+}%x{ENTER}"
+    with pytest.raises(ValueError):
+        compile_tokens(["SHIFTLOCK"])
+    with pytest.raises(KeyError):
+        compiler.compile("insert chart")
+
+
+def test_scripts_are_cached_per_command():
+    compiler = ActionCompiler()
+    first = compiler.compile("insert rectangle")
+    assert compiler.compile("INSERT RECTANGLE") is first
+    assert compiler.stats() == {"commands": 3, "compiled": 1, "hits": 1, "misses": 1}
+
+
+def test_default_pause_leaves_time_for_keytips():
+    """The KeyTip pause keeps the 0.5s the per-key calls used to sleep"""
+    assert ActionCompiler().compile("insert text box").pause == 0.5
+
+
+def test_one_type_keys_call_and_one_wait():
+    script = ActionCompiler(pause=0.02, ready_timeout=3).compile("insert rectangle")
+    window = FakeWindow()
+    actions = KeystrokeRunner().execute(script, window)
+    assert window.calls == [("type_keys", "{VK_MENU}isr", 0.02), ("wait", "ready", 3)]
+    assert actions == window.calls
+
+
+def test_dry_run_records_without_a_window():
+    runner = KeystrokeRunner(dry_run=True)
+    compiler = ActionCompiler()
+    runner.execute(compiler.compile("insert rectangle"))
+    runner.execute(compiler.compile("insert text box"))
+    assert [action[1] for action in runner.recorded if action[0] == "type_keys"] == \
+        ["{VK_MENU}isr", "{VK_MENU}ix"]
@@ -0,0 +1,89 @@
+"""
+Tests for the async LLM clients against the local stand-in server
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from llm_client import AsyncLLMClient, ExecutorLLMClient, GeminiClient, OpenAICompatibleClient
+from llm_stub_server import StubLLMServer
+
+
+def test_gemini_calls_reuse_one_connection():
+    """Sequential calls share a single keep-alive connection"""
+    with StubLLMServer(["FUNCTION_CALL: add|1|2", "FINAL_ANSWER: [3]"]) as server:
+        async def run():
+            async with GeminiClient("key", base_url=server.gemini_url) as client:
+                return [(await client.generate(f"prompt {i}")).text for i in range(4)]
+
+        texts = asyncio.run(run())
+        assert texts == ["FUNCTION_CALL: add|1|2", "FINAL_ANSWER: [3]"] * 2
+        assert server.prompts == [f"prompt {i}" for i in range(4)]
+        assert server.stats()["connections"] == 1
+
+
+def test_openai_compatible_client():
+    with StubLLMServer(["FINAL_ANSWER: [7]"]) as server:
+        async def run():
+            async with OpenAICompatibleClient("key", base_url=server.openai_url, model="m") as client:
+                return (await client.generate("hello")).text
+
+        assert asyncio.run(run()) == "FINAL_ANSWER: [7]"
+
+
+def test_timeout_cancels_the_request():
+    """A timed-out call closes its request instead of leaving it running"""
+    with StubLLMServer(delay=2.0) as server:
+        async def run():
+            async with GeminiClient("key", base_url=server.gemini_url) as client:
+                started = time.perf_counter()
+                try:
+                    await client.generate("slow", timeout=0.2)
+                    raise AssertionError("expected TimeoutError")
+                except TimeoutError:
+                    pass
+                return time.perf_counter() - started, client.stats()
+
+        elapsed, stats = asyncio.run(run())
+        assert elapsed < 1.0
+        assert stats["timeouts"] == 1
+        deadline = time.monotonic() + 2
+        while server.stats()["abandoned"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert server.stats()["abandoned"] == 1
+        assert server.stats()["completed"] == 0
+
+
+def test_incomplete_client_fails_on_creation():
+    class NoGenerate(AsyncLLMClient):
+        pass
+
+    with pytest.raises(TypeError):
+        NoGenerate()
+
+
+def test_executor_client_is_bounded():
+    """Sync providers use a dedicated bounded pool; queued calls are cancelled on timeout"""
+    release = threading.Event()
+    running = []
+
+    def blocking_generate(model, prompt):
+        running.append(prompt)
+        release.wait(5)
+        return type("Response", (), {"text": prompt})()
+
+    client = ExecutorLLMClient(blocking_generate, max_workers=1)
+
+    async def run():
+        calls = [client.generate(f"p{i}", timeout=0.2) for i in range(3)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(run())
+    release.set()
+    asyncio.run(client.aclose())
+    assert all(isinstance(result, TimeoutError) for result in results)
+    assert running == ["p0"]
+    assert client.stats()["abandoned"] == 1
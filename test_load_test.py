@@ -0,0 +1,48 @@
+"""
+Tests for the multi-process MCP server load generator
+"""
+
+import random
+import sys
+
+import pytest
+
+from load_test import CALL_KINDS, latency_summary, parse_mix, percentile, run_point
+
+
+def test_parse_mix():
+    assert parse_mix("math=9, render=1") == {"math": 9.0, "render": 1.0}
+    assert parse_mix("render") == {"render": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("gui=1")
+    with pytest.raises(ValueError):
+        parse_mix("math=0")
+
+
+def test_percentiles_use_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([], 0.5) is None
+    summary = latency_summary([0.002, 0.001, 0.003])
+    assert summary["calls"] == 3 and summary["p50_ms"] == 2.0 and summary["max_ms"] == 3.0
+
+
+def test_calls_are_deterministic_per_seed(tmp_path):
+    first = [CALL_KINDS["render"](random.Random(7), 0, str(tmp_path)) for _ in range(3)]
+    second = [CALL_KINDS["render"](random.Random(7), 0, str(tmp_path)) for _ in range(3)]
+    assert first == second
+    assert first[0][0] in ("render_deck", "place_shapes")
+
+
+def test_run_point_against_real_servers():
+    result = run_point(processes=2, clients=3, duration=0.5, warmup=0.2,
+                       mix={"math": 1, "render": 1})
+    assert result["errors"] == 0
+    assert result["latency"]["calls"] > 0 and result["throughput_per_second"] > 0
+    assert set(result["latency_by_kind"]) <= {"math", "render"}
+    assert [p["clients"] for p in result["per_process"]] == [2, 1]
+    assert len({p["server_pid"] for p in result["per_process"]}) == 2
+    if sys.platform.startswith("linux"):
+        assert all(p["server_rss_bytes"] for p in result["per_process"])
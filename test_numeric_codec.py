@@ -0,0 +1,46 @@
+"""
+Tests for the typed-array result encoding
+"""
+
+import json
+
+from numeric_codec import decode_array, decode_nested_text, decode_text, encode_array, is_typed
+
+
+def test_round_trip_picks_smallest_type():
+    for values, dtype in [([73, 78, 68, 73, 65], "|u1"), ([-5, 100], "|i1"),
+                          ([0, 70000], "<u4"), ([-1, 2 ** 40], "<i8"), ([0.5, 2], "<f8")]:
+        encoded = encode_array(values)
+        assert encoded["dtype"] == dtype
+        view = decode_array(json.loads(json.dumps(encoded)))
+        assert view.tolist() == values
+
+
+def test_decode_is_a_view_with_shape():
+    encoded = encode_array(list(range(6)), shape=[2, 3])
+    view = decode_array(encoded)
+    assert isinstance(view, memoryview)
+    assert view.shape == (2, 3)
+    assert view.tolist() == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_decode_text_ignores_plain_results():
+    assert decode_text("42") is None
+    assert decode_text('{"encoding": "json"}') is None
+    text = json.dumps(encode_array([1, 2, 3]), indent=2)
+    assert decode_text(text).tolist() == [1, 2, 3]
+    assert is_typed(json.loads(text))
+
+
+def test_nested_typed_arrays_are_decoded():
+    page = {"handle": "h_1", "items": encode_array([1, 2, 3]), "next_cursor": None}
+    found = []
+    decoded = json.loads(decode_nested_text(json.dumps(page), found))
+    assert decoded == {"handle": "h_1", "items": [1, 2, 3], "next_cursor": None}
+    assert [view.tolist() for view in found] == [[1, 2, 3]]
+    assert decode_nested_text(json.dumps({"note": "$typed"})) is None
+
+
+def test_payload_smaller_than_json():
+    values = [ord(c) for c in "INDIA" * 10000]
+    assert len(json.dumps(encode_array(values))) < len(json.dumps(values)) / 2
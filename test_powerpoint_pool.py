@@ -0,0 +1,169 @@
+"""
+Tests for the warm PowerPoint instance pool, using stand-in processes
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from powerpoint_pool import ExecutableCache, InstancePool, StandInLauncher
+
+
+def test_warm_instance_is_reused_then_recycled():
+    """Jobs reuse the warm instance until max_jobs, then a fresh one is started"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = InstancePool(StandInLauncher(startup_delay=0.2, state_dir=tmp), size=1, max_jobs=2)
+        try:
+            pool.prewarm(wait=True)
+            first = pool.acquire()
+            pool.open_document(first, "job1.pptx")
+            assert pool.release(first)
+
+            again = pool.acquire()
+            assert again is first
+            assert pool.last_acquire_seconds < 0.2
+            assert not pool.release(again)  # second job: recycled
+            assert not first.app.is_process_running()
+
+            pool.prewarm(wait=True)
+            replacement = pool.acquire()
+            assert replacement.pid != first.pid
+            pool.release(replacement)
+
+            stats = pool.stats()
+            assert stats["cold_starts"] == 2
+            assert stats["warm"] == 3
+            assert stats["recycled"] == 1
+            assert first.documents == ["job1.pptx"]
+        finally:
+            pool.close()
+
+
+def test_dead_instance_is_replaced():
+    """An idle instance that died is detected by the health check"""
+    with tempfile.TemporaryDirectory() as tmp:
+        launcher = StandInLauncher(startup_delay=0.05, state_dir=tmp)
+        pool = InstancePool(launcher, size=1)
+        try:
+            pool.prewarm(wait=True)
+            dead = pool._idle[0]
+            launcher.stop(dead)
+            instance = pool.acquire()
+            assert instance.pid != dead.pid
+            assert pool.stats()["unhealthy"] == 1
+        finally:
+            pool.close()
+
+
+def test_discarded_instance_is_stopped_and_replaced():
+    """A wedged instance is never handed out again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = InstancePool(StandInLauncher(startup_delay=0.05, state_dir=tmp), size=1)
+        try:
+            wedged = pool.acquire()
+            pool.discard(wedged)
+            assert not wedged.app.is_process_running()
+            replacement = pool.acquire()
+            assert replacement.pid != wedged.pid
+            stats = pool.stats()
+            assert stats["discarded"] == 1 and stats["in_use"] == 1
+        finally:
+            pool.close()
+
+
+def test_attach_to_running_instance():
+    """A second pool attaches to an instance another pool left running"""
+    with tempfile.TemporaryDirectory() as tmp:
+        owner = InstancePool(StandInLauncher(startup_delay=0.05, state_dir=tmp))
+        instance = owner.acquire()
+        other_launcher = StandInLauncher(startup_delay=0.05, state_dir=tmp)
+        other = InstancePool(other_launcher)
+        try:
+            attached = other.acquire()
+            assert attached.attached and attached.pid == instance.pid
+            assert other.stats()["cold_starts"] == 0
+        finally:
+            other.close()
+            owner.close()
+        assert not os.listdir(tmp)
+
+
+def test_attached_instance_is_never_stopped():
+    """Prewarm attaches first; a worn-out attached instance is let go, not killed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        owner = InstancePool(StandInLauncher(startup_delay=0.05, state_dir=tmp))
+        users = owner.acquire()
+        pool = InstancePool(StandInLauncher(startup_delay=0.05, state_dir=tmp), max_jobs=1)
+        try:
+            pool.prewarm(wait=True)
+            attached = pool.acquire()
+            assert attached.attached and attached.pid == users.pid
+            assert pool.stats()["cold_starts"] == 0
+            assert not pool.release(attached)  # worn out
+            assert users.app.is_process_running()
+            pool.prewarm(wait=True)
+            replacement = pool.acquire()
+            assert replacement.pid != users.pid and not replacement.attached
+            assert pool.stats()["recycled"] == 1
+        finally:
+            pool.close()
+            owner.close()
+
+
+def test_hung_health_check_does_not_block_the_pool():
+    """A slow probe of one idle instance leaves the others available"""
+    class SlowProbeLauncher(StandInLauncher):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.hung = None
+            self.unblock = threading.Event()
+
+        def healthy(self, instance):
+            if self.hung is None:
+                self.hung = instance
+                self.unblock.wait(5)
+            return super().healthy(instance)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        launcher = SlowProbeLauncher(startup_delay=0.05, state_dir=tmp)
+        pool = InstancePool(launcher, size=2)
+        try:
+            pool.prewarm(wait=True)
+            probing = threading.Thread(target=pool.acquire)
+            probing.start()
+            while launcher.hung is None:
+                time.sleep(0.01)
+            started = time.monotonic()
+            other = pool.acquire()
+            assert other is not launcher.hung
+            assert pool.stats()["in_use"] == 2
+            assert time.monotonic() - started < 1
+            launcher.unblock.set()
+            probing.join(5)
+            assert pool.stats()["warm"] == 2
+        finally:
+            launcher.unblock.set()
+            pool.close()
+
+
+def test_executable_cache_prefers_last_working_path():
+    """The cached executable is tried first and survives a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "exe.json")
+        cache = ExecutableCache(path, candidates=["a.exe", "b.exe", "c.exe"])
+        cache.set("c.exe")
+        restored = ExecutableCache(path, candidates=["a.exe", "b.exe", "c.exe"])
+        assert restored.ordered_candidates()[0] == "c.exe"
+        restored.invalidate()
+        assert ExecutableCache(path, candidates=["a.exe"]).get() is None
+
+
+def test_pool_without_launcher_reports_unavailable():
+    pool = InstancePool(None)
+    assert pool.prewarm() == []
+    try:
+        pool.acquire()
+        raise AssertionError("expected RuntimeError")
+    except RuntimeError as e:
+        assert "not available" in str(e)
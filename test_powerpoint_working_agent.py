@@ -0,0 +1,65 @@
+"""
+Tests for the agent entry point's lazy start-up
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import powerpoint_working_agent as agent
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_import_defers_heavy_stacks():
+    check = ("import sys, powerpoint_working_agent; "
+             "print(sorted(m for m in ('mcp', 'httpx', 'starlette', 'smtplib', 'llm_client', "
+             "'email_logger', 'job_service') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout.strip()
+    assert out == "[]"
+
+
+def test_client_and_email_logger_are_created_once(monkeypatch):
+    monkeypatch.setattr(agent, "_client", None)
+    monkeypatch.setattr(agent, "_email_logger", None)
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    client = agent.get_client()
+    assert agent.get_client() is client and type(client).__name__ == "OpenAICompatibleClient"
+    assert agent.get_email_logger() is agent.get_email_logger()
+    asyncio.run(agent.close_client())
+    assert agent._client is None
+    asyncio.run(agent.close_client())   # nothing created: no-op
+
+
+def test_llm_timeout_setting_applies(monkeypatch):
+    """Without an explicit timeout the client's configured LLM_TIMEOUT is used"""
+    from llm_client import GeminiClient
+    from llm_stub_server import StubLLMServer
+
+    monkeypatch.delenv("LLM_RPM", raising=False)
+    monkeypatch.delenv("LLM_TPM", raising=False)
+    with StubLLMServer(delay=2.0) as server:
+        async def run():
+            async with GeminiClient("key", base_url=server.gemini_url, timeout=0.2) as client:
+                try:
+                    await agent.generate_with_timeout(client, "slow")
+                except TimeoutError as e:
+                    return str(e)
+
+        assert asyncio.run(run()) == "LLM call timed out after 0.2s"
+
+
+def test_completed_run_resumes_without_mcp_or_llm(tmp_path):
+    from run_checkpoint import RunCheckpoint
+
+    checkpoint = RunCheckpoint(directory=str(tmp_path))
+    checkpoint.record_final("42")
+    checkpoint.record_done()
+    checkpoint.close()
+    env = dict(os.environ, AGENT_CHECKPOINT_DIR=str(tmp_path), LLM_BASE_URL="http://127.0.0.1:9")
+    result = subprocess.run([sys.executable, "powerpoint_working_agent.py", "--resume", checkpoint.run_id],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0
+    assert "already completed with final answer 42" in result.stdout
@@ -0,0 +1,93 @@
+"""
+Tests for static prompt prefixes and their provider cache handles
+"""
+
+import asyncio
+import time
+
+from llm_client import GeminiClient
+from llm_stub_server import StubLLMServer
+from prompt_cache import PrefixCache, PrefixedPrompt, prefix_key
+
+PREFIX = "You are a math agent. " * 100
+
+
+def test_prefixed_prompt_is_the_full_text():
+    prompt = PrefixedPrompt("system", "\n\nQuery: q")
+    assert prompt == "system\n\nQuery: q"
+    assert (prompt.prefix, prompt.suffix) == ("system", "\n\nQuery: q")
+    assert f"{prompt}" == "system\n\nQuery: q" and prompt.encode() == b"system\n\nQuery: q"
+
+
+def test_concurrent_callers_share_one_registration():
+    created = []
+
+    async def create():
+        created.append(1)
+        await asyncio.sleep(0.01)
+        return "cachedContents/1"
+
+    async def run():
+        cache = PrefixCache(min_tokens=10)
+        key = prefix_key("m", PREFIX)
+        handles = await asyncio.gather(*(cache.handle(key, PREFIX, create) for _ in range(5)))
+        return handles, await cache.handle(key, PREFIX, create), cache.stats()
+
+    handles, again, stats = asyncio.run(run())
+    assert handles == ["cachedContents/1"] * 5 and again == "cachedContents/1"
+    assert len(created) == 1
+    assert stats["registered"] == 1 and stats["hits"] == 1
+
+
+def test_short_and_refused_prefixes_are_not_registered():
+    calls = []
+
+    async def refuse():
+        calls.append(1)
+        raise RuntimeError("too small to cache")
+
+    async def run():
+        cache = PrefixCache(min_tokens=10)
+        short = await cache.handle(prefix_key("m", "short"), "short", refuse)
+        refused = [await cache.handle(prefix_key("m", PREFIX), PREFIX, refuse) for _ in range(3)]
+        return short, refused, cache.stats()
+
+    short, refused, stats = asyncio.run(run())
+    assert short is None and refused == [None] * 3
+    assert len(calls) == 1 and stats["refused"] == 1
+
+
+def test_gemini_sends_only_the_suffix_after_registering():
+    with StubLLMServer(["FINAL_ANSWER: [1]"]) as server:
+        async def run():
+            async with GeminiClient("key", base_url=server.gemini_url,
+                                    prefix_cache=PrefixCache(min_tokens=10)) as client:
+                responses = [await client.generate(PrefixedPrompt(PREFIX, f"\n\nQuery: {i}")) for i in range(3)]
+                plain = await client.generate("no prefix")
+                return responses, plain, client.stats()
+
+        responses, plain, stats = asyncio.run(run())
+        # The stand-in sees the same full prompts as without caching
+        assert server.prompts == [f"{PREFIX}\n\nQuery: {i}" for i in range(3)] + ["no prefix"]
+        assert server.stats()["caches"] == 1 and server.stats()["cached_requests"] == 3
+        assert [r.cached_tokens for r in responses] == [len(PREFIX) // 4] * 3
+        assert plain.cached_tokens is None
+        assert stats["prefix_cache"]["cached_tokens"] == 3 * (len(PREFIX) // 4)
+
+
+def test_expired_handle_falls_back_and_is_registered_again():
+    with StubLLMServer(["FINAL_ANSWER: [1]"], max_cache_ttl=0.2) as server:
+        async def run():
+            cache = PrefixCache(ttl=600, min_tokens=10)
+            async with GeminiClient("key", base_url=server.gemini_url, prefix_cache=cache) as client:
+                first = await client.generate(PrefixedPrompt(PREFIX, "a"))
+                time.sleep(0.3)
+                second = await client.generate(PrefixedPrompt(PREFIX, "b"))
+                third = await client.generate(PrefixedPrompt(PREFIX, "c"))
+                return [first.text, second.text, third.text], cache.stats()
+
+        texts, stats = asyncio.run(run())
+        assert texts == ["FINAL_ANSWER: [1]"] * 3
+        assert server.prompts == [PREFIX + "a", PREFIX + "b", PREFIX + "c"]
+        assert stats["invalidated"] == 1 and stats["registered"] == 2
+
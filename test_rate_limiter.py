@@ -0,0 +1,95 @@
+"""
+Tests for the LLM token-bucket rate limiter
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from rate_limiter import RateLimiter, estimate_tokens
+
+
+def test_calls_wait_for_token_refill():
+    """Once the minute's tokens are spent, calls queue until the bucket refills"""
+    limiter = RateLimiter(tpm=600)  # 10 tokens per second
+
+    async def run():
+        assert await limiter.acquire(600) == (0, 600)
+        return await limiter.acquire(5)
+
+    waited, debited = asyncio.run(run())
+    assert debited == 5
+    assert 0.4 < waited < 0.8
+    stats = limiter.stats()
+    assert stats["interactive"]["requests"] == 2
+    assert stats["interactive"]["delayed"] == 1
+
+
+def test_request_bucket_limits_call_count():
+    limiter = RateLimiter(rpm=120)  # 2 requests per second
+
+    async def run():
+        for _ in range(120):
+            await limiter.acquire(0)
+        started = time.monotonic()
+        await limiter.acquire(0)
+        return time.monotonic() - started
+
+    assert 0.3 < asyncio.run(run()) < 0.8
+
+
+def test_interactive_runs_beat_batch_runs():
+    """Queued interactive calls are served before earlier batch calls"""
+    limiter = RateLimiter(tpm=1200)  # 20 tokens per second
+    order = []
+
+    async def call(name, priority):
+        await limiter.acquire(4, priority)
+        order.append(name)
+
+    async def run():
+        await limiter.acquire(1200)
+        batch = [asyncio.create_task(call(f"batch{i}", "batch")) for i in range(2)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("interactive", "interactive"))
+        await asyncio.gather(*batch, interactive)
+
+    asyncio.run(run())
+    assert order[0] == "interactive"
+    stats = limiter.stats()
+    assert stats["batch"]["max_wait_seconds"] > stats["interactive"]["max_wait_seconds"]
+
+
+def test_file_store_is_shared_between_limiters():
+    """Limiters in different processes share one budget through the state file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "llm_rate.json")
+        first = RateLimiter(tpm=600, state_path=path)
+        second = RateLimiter(tpm=600, state_path=path)
+
+        async def run():
+            await first.acquire(600)
+            return await second.acquire(5)
+
+        assert asyncio.run(run())[0] > 0.4
+        first.store.close()
+        second.store.close()
+
+
+def test_settle_corrects_estimate():
+    limiter = RateLimiter(tpm=6000)
+    _, debited = asyncio.run(limiter.acquire(1000))
+    limiter.settle(debited, actual=400)
+    assert limiter.stats()["levels"]["tokens"] >= 5600
+    assert estimate_tokens("x" * 400, output_tokens=100) == 200
+
+
+def test_settle_after_clamped_acquire():
+    """A call larger than the bucket is only charged its capacity, so settle must not over-credit"""
+    limiter = RateLimiter(tpm=600)
+    _, debited = asyncio.run(limiter.acquire(5000))
+    assert debited == 600
+    limiter.settle(debited, actual=4800)
+    # The overrun past the capacity is owed, not refunded
+    assert limiter.stats()["levels"]["tokens"] < 0
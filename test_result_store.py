@@ -0,0 +1,99 @@
+"""
+Tests for handle-based chunked results
+"""
+
+import math
+import os
+import tempfile
+
+from result_store import ResultStore
+
+
+def test_chunked_conversion_matches_list_tool():
+    """Chunked input and paged output reproduce the in-memory result"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(tmp)
+        text = "INDIA" * 1000 + "é✓"
+        buffer = store.create_text(text[:2000])
+        store.append_text(buffer, text[2000:])
+
+        handle, count = store.write_ints([ord(c) for c in chunk]
+                                         for chunk in store.iter_text(buffer, chunk_size=333))
+        assert count == len(text)
+
+        items, cursor = [], 0
+        while cursor is not None:
+            page = store.page(handle, cursor, limit=700)
+            items.extend(page["items"])
+            cursor = page["next_cursor"]
+        assert items == [ord(c) for c in text]
+
+        streamed = sum(math.exp(i % 50) for chunk in store.iter_ints(handle, 128) for i in chunk)
+        assert streamed == sum(math.exp(ord(c) % 50) for c in text)
+
+
+def test_file_source_and_release():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "doc.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("hello\nworld")
+        store = ResultStore(os.path.join(tmp, "spill"), input_dir=tmp)
+        assert "".join(store.iter_text(f"file:{path}", chunk_size=4)) == "hello\nworld"
+        assert "".join(store.iter_text("file:doc.txt")) == "hello\nworld"
+
+        handle, _ = store.write_ints([[1, 2, 3]])
+        assert store.describe(handle)["preview"] == [1, 2, 3]
+        assert store.release(handle)
+        assert not store.release(handle)
+        try:
+            store.page(handle)
+            raise AssertionError("expected KeyError")
+        except KeyError:
+            pass
+
+
+def test_file_sources_outside_input_dir_are_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = os.path.join(tmp, "inputs")
+        os.makedirs(inputs)
+        secret = os.path.join(tmp, "secret.txt")
+        with open(secret, "w", encoding="utf-8") as f:
+            f.write("secret")
+        for store, source in ((ResultStore(os.path.join(tmp, "spill"), input_dir=inputs), f"file:{secret}"),
+                              (ResultStore(os.path.join(tmp, "spill"), input_dir=inputs), "file:../secret.txt"),
+                              (ResultStore(os.path.join(tmp, "spill")), f"file:{secret}")):
+            try:
+                list(store.iter_text(source))
+                raise AssertionError(f"expected ValueError for {source}")
+            except ValueError:
+                pass
+
+
+def test_page_cursor_bounds():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(tmp)
+        handle, _ = store.write_ints([[1, 2, 3, 4]])
+        try:
+            store.page(handle, cursor=-2)
+            raise AssertionError("expected ValueError")
+        except ValueError:
+            pass
+        page = store.page(handle, cursor=10)
+        assert page["cursor"] == 4 and page["items"] == [] and page["next_cursor"] is None
+        page = store.page(handle, cursor=1, limit=2)
+        assert page["items"] == [2, 3] and page["next_cursor"] == 3
+
+
+def test_oldest_handles_are_evicted():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(tmp, max_handles=2)
+        first, _ = store.write_ints([[1]])
+        store.write_ints([[2]])
+        store.write_ints([[3]])
+        assert store.stats()["evictions"] == 1
+        assert len(os.listdir(tmp)) == 2
+        try:
+            store.read_ints(first)
+            raise AssertionError("expected KeyError")
+        except KeyError:
+            pass
@@ -0,0 +1,90 @@
+"""
+Tests for agent run checkpointing and resume
+"""
+
+import tempfile
+
+from run_checkpoint import IDEMPOTENT_TOOLS, RunCheckpoint
+
+
+def _completed_run(directory):
+    checkpoint = RunCheckpoint(directory=directory)
+    checkpoint.record_llm(1, "prompt 1", "FUNCTION_CALL: strings_to_chars_to_int|INDIA")
+    checkpoint.record_tool(1, "strings_to_chars_to_int", {"string": "INDIA"},
+                           ["73", "78", "68", "73", "65"])
+    checkpoint.record_llm(2, "prompt 2", "FUNCTION_CALL: open_powerpoint")
+    checkpoint.record_tool(2, "open_powerpoint", {}, ["ITERATION 1 COMPLETE"])
+    checkpoint.record_step("open_powerpoint", "ITERATION 1 COMPLETE")
+    checkpoint.close()
+    return checkpoint.run_id
+
+
+def test_resume_replays_llm_and_idempotent_tools():
+    """Recorded LLM responses and pure tool results are served on resume"""
+    with tempfile.TemporaryDirectory() as tmp:
+        run_id = _completed_run(tmp)
+        resumed = RunCheckpoint(run_id, directory=tmp, resume=True)
+
+        assert resumed.replay_llm("prompt 1") == "FUNCTION_CALL: strings_to_chars_to_int|INDIA"
+        assert resumed.replay_tool("strings_to_chars_to_int", {"string": "INDIA"}) == \
+            ["73", "78", "68", "73", "65"]
+        assert resumed.replay_llm("prompt 2") == "FUNCTION_CALL: open_powerpoint"
+        assert resumed.replay_llm("prompt 3") is None
+        assert resumed.completed_steps == ["open_powerpoint"]
+        assert (resumed.replayed_llm, resumed.replayed_tools) == (2, 1)
+        resumed.close()
+
+
+def test_gui_tools_are_never_replayed():
+    """Non-idempotent tools run again even when recorded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        resumed = RunCheckpoint(_completed_run(tmp), directory=tmp, resume=True)
+        assert resumed.replay_tool("open_powerpoint", {}) is None
+        resumed.close()
+
+
+def test_divergent_prompt_switches_to_live_mode():
+    """Replay stops at the first prompt that differs from the recording"""
+    with tempfile.TemporaryDirectory() as tmp:
+        resumed = RunCheckpoint(_completed_run(tmp), directory=tmp, resume=True)
+        assert resumed.replay_llm("a different prompt") is None
+        assert resumed.replay_llm("prompt 2") is None
+        resumed.record_llm(1, "a different prompt", "FINAL_ANSWER: [1]")
+        resumed.close()
+
+        reloaded = RunCheckpoint(resumed.run_id, directory=tmp, resume=True)
+        assert reloaded.replay_llm("a different prompt") == "FINAL_ANSWER: [1]"
+        reloaded.close()
+
+
+def test_torn_last_line_and_done_marker():
+    """A partial final record is ignored and completion is remembered"""
+    with tempfile.TemporaryDirectory() as tmp:
+        run_id = _completed_run(tmp)
+        checkpoint = RunCheckpoint(run_id, directory=tmp, resume=True)
+        checkpoint.record_final("7.59e+33")
+        checkpoint.record_done()
+        checkpoint.close()
+        with open(checkpoint.path, "a", encoding="utf-8") as f:
+            f.write('{"t":"llm","i":9,"p":')
+
+        resumed = RunCheckpoint(run_id, directory=tmp, resume=True)
+        assert resumed.done
+        assert resumed.final_answer == "7.59e+33"
+        resumed.record_step("paste_number", "ITERATION 6 COMPLETE")
+        resumed.close()
+
+        reloaded = RunCheckpoint(run_id, directory=tmp, resume=True)
+        assert reloaded.completed_steps == ["open_powerpoint", "paste_number"]
+        reloaded.close()
+
+
+def test_replayed_tools_are_the_servers_pure_tools():
+    """The replay set comes from the server's pure-tool list and covers its memoized tools"""
+    import powerpoint_working_mcp_server as server
+    from tool_cache import PURE_TOOLS
+
+    tools = {tool.name: tool for tool in server.mcp._tool_manager.list_tools()}
+    assert IDEMPOTENT_TOOLS == PURE_TOOLS <= tools.keys()
+    assert {name for name, tool in tools.items() if hasattr(tool.fn, "cache")} <= PURE_TOOLS
+    assert "evaluate_expression" in IDEMPOTENT_TOOLS
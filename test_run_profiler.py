@@ -0,0 +1,103 @@
+"""
+Tests for the --profile report writer
+"""
+
+import asyncio
+import os
+import pstats
+import threading
+
+from run_profiler import NullProfiler, Profiler, create_profiler
+from tool_deadlines import AutomationRunner, Deadlines
+
+
+def _work(n):
+    return [str(i) for i in range(n)]
+
+
+def test_sections_accumulate_and_write_reports(tmp_path):
+    profiler = Profiler(str(tmp_path / "run"))
+    for _ in range(2):
+        with profiler.section("iteration_01"):
+            _work(1000)
+    profiler.begin("setup")
+    kept = _work(20000)
+    profiler.write()
+
+    assert profiler.sections["iteration_01"].calls == 2
+    assert profiler.sections["setup"].net > 0
+    files = set(os.listdir(tmp_path / "run"))
+    assert {"iteration_01.pstats", "setup.pstats", "combined.pstats",
+            "summary.txt", "allocations.txt"} <= files
+    stats = pstats.Stats(str(tmp_path / "run" / "combined.pstats"))
+    assert any(func[2] == "_work" for func in stats.stats)
+    summary = (tmp_path / "run" / "summary.txt").read_text()
+    assert "iteration_01" in summary and "setup" in summary
+    assert "test_run_profiler.py" in (tmp_path / "run" / "allocations.txt").read_text()
+    assert len(kept) == 20000
+
+
+def test_wrap_profiles_sync_and_async_functions(tmp_path):
+    profiler = Profiler(str(tmp_path))
+
+    async def tool(n):
+        return len(_work(n))
+
+    assert profiler.wrap(_work, "tool_work")(3) == ["0", "1", "2"]
+    assert asyncio.run(profiler.wrap(tool)(5)) == 5
+    assert profiler.sections["tool_work"].calls == 1
+    assert profiler.sections["tool"].calls == 1
+
+
+def test_disabled_profiler_is_a_no_op(tmp_path, monkeypatch):
+    monkeypatch.setenv("PPT_PROFILE_DIR", str(tmp_path))
+    profiler = create_profiler(False, "agent")
+    assert isinstance(profiler, NullProfiler)
+    assert profiler.wrap(_work) is _work
+    with profiler.section("x"):
+        pass
+    assert profiler.write() is None
+    assert os.listdir(tmp_path) == []
+    assert create_profiler(True, "agent").output_dir.startswith(str(tmp_path))
+
+
+def test_sections_on_other_threads_do_not_interleave(tmp_path):
+    profiler = Profiler(str(tmp_path))
+    started, release = threading.Event(), threading.Event()
+
+    def worker():
+        with profiler.section("tool_gui"):
+            started.set()
+            release.wait(5)
+            _work(100)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait(5)
+    # A section on this thread neither ends nor absorbs the worker's
+    with profiler.section("iteration_01"):
+        _work(10)
+    release.set()
+    thread.join()
+
+    assert profiler.sections["tool_gui"].calls == 1
+    assert profiler.sections["iteration_01"].calls == 1
+    gui = pstats.Stats(*profiler.sections["tool_gui"].profiles.values())
+    assert any(func[2] == "_work" for func in gui.stats)
+    assert not any(func[2] == "worker" for func in
+                   pstats.Stats(*profiler.sections["iteration_01"].profiles.values()).stats)
+
+
+def test_tools_are_profiled_on_the_automation_thread(tmp_path):
+    """Profiled inside AutomationRunner.wrap, the section sees the tool body"""
+    profiler = Profiler(str(tmp_path))
+    runner = AutomationRunner(Deadlines(default=5))
+    tool = runner.wrap(profiler.wrap(_work, "tool_work"), "work")
+
+    assert asyncio.run(tool(50)) == [str(i) for i in range(50)]
+    section = profiler.sections["tool_work"]
+    assert section.calls == 1
+    stats = pstats.Stats(*section.profiles.values())
+    assert any(func[2] == "_work" for func in stats.stats)
+    profiler.write()
+    assert "tool_work" in (tmp_path / "summary.txt").read_text()
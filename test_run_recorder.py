@@ -0,0 +1,100 @@
+"""
+Tests for recording and replaying agent runs
+"""
+
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+
+from mcp import types
+
+from run_recorder import ReplayMismatch, RunRecorder, RunReplay
+
+
+class FakeSession:
+    """Minimal stand-in for an MCP ClientSession"""
+
+    async def initialize(self):
+        return None
+
+    async def list_tools(self):
+        return types.ListToolsResult(tools=[
+            types.Tool(name="add", description="Add two numbers",
+                       inputSchema={"type": "object", "properties": {"a": {"type": "integer"}}}),
+        ])
+
+    async def call_tool(self, name, arguments=None):
+        await asyncio.sleep(0.01)
+        total = sum((arguments or {}).values())
+        return types.CallToolResult(content=[types.TextContent(type="text", text=str(total))])
+
+
+async def _fake_generate(prompt):
+    await asyncio.sleep(0.02)
+    return SimpleNamespace(text=f"FUNCTION_CALL: add|{len(prompt)}|1")
+
+
+async def _record(path):
+    recorder = RunRecorder(path)
+    session = recorder.wrap_session(FakeSession())
+    generate = recorder.wrap_llm(_fake_generate)
+    await session.initialize()
+    await session.list_tools()
+    response = await generate("abc")
+    result = await session.call_tool("add", arguments={"a": 3, "b": 1})
+    recorder.close()
+    return response.text, result.content[0].text, recorder.timings.summary()
+
+
+def test_replay_returns_recorded_responses():
+    """A replayed run sees exactly what the recorded run saw"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.jsonl")
+        text, result_text, summary = asyncio.run(_record(path))
+        assert summary["llm_calls"] == 1 and summary["tool_calls"] == 1
+        assert summary["llm_wait_seconds"] >= 0.02
+
+        async def replay_run():
+            replay = RunReplay(path)
+            session = replay.session()
+            tools = await session.list_tools()
+            response = await replay.generate("abc")
+            result = await session.call_tool("add", arguments={"a": 3, "b": 1})
+            return tools, response, result, replay.timings.summary()
+
+        tools, response, result, replay_summary = asyncio.run(replay_run())
+        assert [tool.name for tool in tools.tools] == ["add"]
+        assert response.text == text
+        assert result.content[0].text == result_text == "4"
+        assert replay_summary["llm_wait_seconds"] < 0.01
+
+
+def test_recorded_latency_mode_sleeps():
+    """Recorded latency reproduces the original external wait times"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.jsonl")
+        asyncio.run(_record(path))
+
+        async def replay_run():
+            replay = RunReplay(path, latency="recorded")
+            await replay.generate("abc")
+            return replay.timings.summary()
+
+        assert asyncio.run(replay_run())["llm_wait_seconds"] >= 0.02
+
+
+def test_divergent_tool_call_is_reported():
+    """Calling a different tool than recorded raises ReplayMismatch"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.jsonl")
+        asyncio.run(_record(path))
+
+        async def replay_run():
+            await RunReplay(path).session().call_tool("add", arguments={"a": 5})
+
+        try:
+            asyncio.run(replay_run())
+            raise AssertionError("expected ReplayMismatch")
+        except ReplayMismatch:
+            pass
@@ -0,0 +1,41 @@
+"""
+Tests for the structured server logger
+"""
+
+import os
+import tempfile
+
+from server_logging import StructuredLogger, _noop
+
+
+def test_records_are_written_as_key_value_lines():
+    """Enabled records reach the log file with their structured fields"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "server.log")
+        log = StructuredLogger(name="test_structured", level="DEBUG", log_file=path)
+        log.info("PowerPoint started", path="C:\\Program Files\\POWERPNT.EXE")
+        log.debug("Tool called", tool="add")
+        log.close()
+
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    assert len(lines) == 2
+    assert "level=INFO" in lines[0]
+    assert 'msg="PowerPoint started"' in lines[0]
+    assert 'path="C:\\\\Program Files\\\\POWERPNT.EXE"' in lines[0]
+    assert "tool=add" in lines[1]
+
+
+def test_disabled_levels_are_noops():
+    """Levels below the threshold are bound to a no-op"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "server.log")
+        log = StructuredLogger(name="test_levels", level="WARNING", log_file=path)
+        assert log.debug is _noop
+        assert log.info is _noop
+        assert log.warning is not _noop
+
+        log.set_level("DEBUG")
+        assert log.debug is not _noop
+        log.close()
@@ -0,0 +1,101 @@
+"""
+Tests for per-tool counters, latency histograms and the Prometheus endpoint
+"""
+
+import asyncio
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from server_metrics import LATENCY_BUCKETS, MetricsRegistry, percentile, start_http_server
+
+
+def test_counts_calls_errors_and_latency():
+    registry = MetricsRegistry()
+
+    def add(a, b):
+        return a + b
+
+    def broken():
+        raise ValueError("boom")
+
+    def handled():
+        return {"content": [SimpleNamespace(text="ERROR: Error opening PowerPoint")]}
+
+    add = registry.instrument(add)
+    assert add(2, 3) == 5 and add.__name__ == "add"
+    with pytest.raises(ValueError):
+        registry.instrument(broken)()
+    registry.instrument(handled, "open_powerpoint")()
+
+    snapshot = registry.snapshot()
+    assert snapshot["process"]["cpu_seconds"] > 0
+    tools = snapshot["tools"]
+    assert tools["add"]["calls"] == 1 and tools["add"]["errors"] == 0
+    assert tools["broken"]["errors"] == 1
+    assert tools["open_powerpoint"]["errors"] == 1
+    assert tools["add"]["in_flight"] == 0
+    assert tools["add"]["p99_ms"] <= LATENCY_BUCKETS[0] * 1000
+    assert tools["add"]["p50_ms"] <= tools["add"]["p999_ms"] <= tools["add"]["max_ms"]
+
+
+def test_async_tools_report_in_flight():
+    registry = MetricsRegistry()
+    seen = []
+
+    async def slow():
+        seen.append(registry.snapshot()["tools"]["slow"]["in_flight"])
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def run():
+        measured = registry.instrument(slow)
+        return await asyncio.gather(measured(), measured())
+
+    assert asyncio.run(run()) == ["ok", "ok"]
+    assert seen == [1, 2]
+    entry = registry.snapshot()["tools"]["slow"]
+    assert entry["calls"] == 2 and entry["in_flight"] == 0
+    assert 5 <= entry["p50_ms"] <= 25
+
+
+def test_percentiles_interpolate_within_buckets():
+    buckets = [0] * len(LATENCY_BUCKETS)
+    buckets[LATENCY_BUCKETS.index(0.01)] = 90     # (0.005, 0.01]
+    buckets[LATENCY_BUCKETS.index(1.0)] = 10      # (0.5, 1.0]
+    assert 0.005 < percentile(buckets, 0.5) <= 0.01
+    assert 0.5 < percentile(buckets, 0.99) <= 1.0
+    assert percentile([0] * len(LATENCY_BUCKETS), 0.5) is None
+
+
+def test_prometheus_endpoint():
+    registry = MetricsRegistry()
+    registry.instrument(lambda: 1, "ping")()
+    server = start_http_server(registry, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        text = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'mcp_tool_calls_total{tool="ping"} 1' in text
+    assert 'mcp_tool_latency_seconds_bucket{tool="ping",le="+Inf"} 1' in text
+    assert "# TYPE mcp_tool_latency_seconds histogram" in text
+
+
+def test_server_tools_are_wrapped_when_imported():
+    """Registration wraps the tools, so an imported server has metrics and deadlines too"""
+    import powerpoint_working_mcp_server as server
+
+    before = server.metrics.snapshot()["tools"].get("add", {}).get("calls", 0)
+    asyncio.run(server.mcp.call_tool("add", {"a": 1, "b": 2}))
+    assert server.metrics.snapshot()["tools"]["add"]["calls"] == before + 1
+
+    tools = {tool.name: tool for tool in server.mcp._tool_manager.list_tools()}
+    assert all(tools[name].is_async for name in server.AUTOMATION_TOOLS)
+    # Without PowerPoint the GUI tool fails fast, but it ran on the automation thread
+    asyncio.run(server.mcp.call_tool("paste_number", {"text": "1"}))
+    assert server.automation.stats()["tools"]["paste_number"]["calls"] == 1
+    assert server.metrics.snapshot()["tools"]["paste_number"]["calls"] == 1
+    assert server.add(1, 2) == 3  # the module keeps the plain function
@@ -0,0 +1,61 @@
+"""
+Tests for the precomputed shape layouts used by place_shapes
+"""
+
+import pytest
+
+from shape_layout import LayoutError, compute_layout, flow_layout, grid_layout, text_width
+
+SLIDE = (960, 540)
+
+
+def _assert_valid(boxes, slide_width, slide_height):
+    for box in boxes:
+        assert 0 <= box.left and box.right <= slide_width + 1e-6
+        assert 0 <= box.top and box.bottom <= slide_height + 1e-6
+    ordered = sorted(boxes, key=lambda box: (box.top, box.left))
+    for i, a in enumerate(ordered):
+        for b in ordered[i + 1:]:
+            if b.top >= a.bottom:
+                break
+            assert a.right <= b.left + 1e-6 or b.right <= a.left + 1e-6, (a.as_dict(), b.as_dict())
+
+
+@pytest.mark.parametrize("count", [1, 2, 7, 48, 300, 600])
+def test_grid_layout_fills_slide_without_overlap(count):
+    boxes = grid_layout([str(i) for i in range(count)], *SLIDE)
+    assert len(boxes) == count
+    _assert_valid(boxes, *SLIDE)
+    assert len({(box.width, box.height, box.font_size) for box in boxes}) == 1
+    assert abs(boxes[0].width / boxes[0].height - 2.0) < 1e-9
+
+
+def test_grid_uses_real_slide_dimensions():
+    wide = grid_layout(["a"] * 12, 960, 540)
+    portrait = grid_layout(["a"] * 12, 540, 960)
+    assert len({box.top for box in wide}) < len({box.top for box in portrait})
+    _assert_valid(portrait, 540, 960)
+
+
+def test_flow_layout_sizes_shapes_to_labels_and_shrinks_text():
+    labels = ["1", "123456789", "12345"]
+    boxes = flow_layout(labels, *SLIDE)
+    assert [box.label for box in boxes] == labels
+    assert boxes[0].width < boxes[2].width < boxes[1].width
+    assert boxes[1].width >= text_width("123456789", boxes[1].font_size)
+
+    many = flow_layout([f"value {i}" for i in range(400)], *SLIDE)
+    _assert_valid(many, *SLIDE)
+    assert many[0].font_size < boxes[0].font_size
+
+
+def test_layout_errors():
+    with pytest.raises(LayoutError):
+        flow_layout(["a long label"] * 5000, *SLIDE)
+    with pytest.raises(LayoutError):
+        grid_layout(["x"] * 20000, *SLIDE)
+    with pytest.raises(ValueError):
+        compute_layout([1], *SLIDE, layout="spiral")
+    assert compute_layout([], *SLIDE) == []
+    assert [box.label for box in compute_layout([{"label": "a"}, {"value": 2}, 3], *SLIDE, "flow")] == \
+        ["a", "2", "3"]
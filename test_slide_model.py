@@ -0,0 +1,174 @@
+"""
+Tests for incremental result-slide updates
+"""
+
+import os
+import xml.etree.ElementTree as ET
+import zipfile
+from types import SimpleNamespace
+
+import deck_writer
+from slide_model import ComSlide, PptxSlide, ShapeState, SlideModel, _namespaces, _serialize, plan
+from template_cache import _read_raw_parts
+
+SLIDE = "ppt/slides/slide1.xml"
+
+
+def _render(model, path, value, title=None):
+    operations = model.render(path, PptxSlide(path), deck_writer.result_shapes(value, title))
+    return [(operation.op, operation.shape) for operation in operations]
+
+
+def _deck_with_note(path):
+    """A result slide plus a shape the model does not manage"""
+    note = deck_writer.ShapeSpec("Note", 0, 0, 100, 100, "keep me", 1200, False)
+    with deck_writer.DeckWriter(path) as deck:
+        deck._write_slide(deck_writer.slide_xml("7").replace(
+            "</p:spTree>", deck_writer.shape_xml(9, note) + "</p:spTree>"))
+
+
+def test_plan_diffs_text_layout_and_membership():
+    value, title = deck_writer.result_shapes("42", "Answer")
+    current = {value.name: ShapeState.from_spec(value, 2)}
+    assert [op.op for op in plan(current, [value])] == ["skip"]
+    assert [op.op for op in plan(current, [value._replace(text="43")])] == ["update_text"]
+    assert [op.op for op in plan(current, [value._replace(x=0)])] == ["update_layout"]
+    assert [(op.op, op.shape) for op in plan(current, [value, title])] == [
+        ("skip", value.name), ("add", title.name)]
+    assert [op.op for op in plan({**current, title.name: ShapeState.from_spec(title, 3)}, [value])] == [
+        "skip", "delete"]
+
+
+def test_pptx_updates_only_what_changed(tmp_path):
+    path = str(tmp_path / "result.pptx")
+    deck_writer.render_deck(["1"], path)
+    model = SlideModel()
+
+    assert _render(model, path, "1") == [("skip", "Result Rectangle")]
+    before = os.stat(path).st_mtime_ns, _read_raw_parts(path)
+    assert _render(model, path, "1") == [("skip", "Result Rectangle")]
+    assert os.stat(path).st_mtime_ns == before[0]          # unchanged: file not rewritten
+
+    assert _render(model, path, "2") == [("update_text", "Result Rectangle")]
+    after = _read_raw_parts(path)
+    changed = {name for name in after if after[name].data != before[1][name].data}
+    assert changed == {SLIDE}                                # other parts copied as stored
+    with zipfile.ZipFile(path) as package:
+        assert package.testzip() is None
+        slide = package.read(SLIDE).decode("utf-8")
+    assert ">2</a:t>" in slide and 'id="2" name="Result Rectangle"' in slide
+
+    assert _render(model, path, "2", "Answer") == [("skip", "Result Rectangle"), ("add", "Title")]
+    assert _render(model, path, "2") == [("skip", "Result Rectangle"), ("delete", "Title")]
+    assert model.scans == 1
+    assert model.stats()["operations"]["skip"] == 4
+
+
+def test_external_changes_are_rescanned_and_other_shapes_kept(tmp_path):
+    path = str(tmp_path / "result.pptx")
+    _deck_with_note(path)
+    model = SlideModel()
+    assert _render(model, path, "8") == [("update_text", "Result Rectangle")]
+
+    deck_writer.render_deck(["8"], path)                   # replaced behind the model's back
+    assert _render(model, path, "8") == [("skip", "Result Rectangle")]
+    assert model.scans == 2
+    deck_writer.render_deck(["1"], path)
+    assert _render(model, path, "8") == [("update_text", "Result Rectangle")]
+
+
+def test_user_shape_survives_update(tmp_path):
+    path = str(tmp_path / "result.pptx")
+    _deck_with_note(path)
+    _render(SlideModel(), path, "8")
+    with zipfile.ZipFile(path) as package:
+        slide = package.read(SLIDE).decode("utf-8")
+    assert "keep me" in slide and ">8</a:t>" in slide
+
+
+def test_serialize_keeps_ignorable_prefixes():
+
+    data = ('<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+            'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+            'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+            'xmlns:p14="http://schemas.microsoft.com/office/powerpoint/2010/main" '
+            'mc:Ignorable="p14"><p:cSld/></p:sld>').encode("utf-8")
+    out = _serialize(ET.fromstring(data), _namespaces(data))
+    assert b'xmlns:p14="http://schemas.microsoft.com/office/powerpoint/2010/main"' in out
+    assert b'mc:Ignorable="p14"' in out
+    ET.fromstring(out)
+
+
+class FakeShape:
+    def __init__(self, shape_id, name, left, top, width, height, shape_type=1):
+        self.Id, self.Name = shape_id, name
+        self.Type, self.AutoShapeType = shape_type, 1
+        self.Left, self.Top, self.Width, self.Height = left, top, width, height
+        self.HasTextFrame = True
+        self.TextFrame = SimpleNamespace(TextRange=SimpleNamespace(Text="", Font=SimpleNamespace(Size=18)))
+        self.Fill, self.Line = SimpleNamespace(Visible=True), SimpleNamespace(Visible=True)
+        self.text_writes = 0
+        self.deleted = False
+
+    def Delete(self):
+        self.deleted = True
+
+
+class FakeShapes(list):
+    def AddShape(self, kind, left, top, width, height):
+        shape = FakeShape(len(self) + 10, "", left, top, width, height)
+        self.append(shape)
+        return shape
+
+
+def test_com_slide_updates_text_in_place():
+    slide = SimpleNamespace(Shapes=FakeShapes(), SlideIndex=1)
+    app = SimpleNamespace(undo_entries=0)
+    app.StartNewUndoEntry = lambda: setattr(app, "undo_entries", app.undo_entries + 1)
+    model = SlideModel()
+
+    def render(value):
+        return [(op.op, op.shape_id) for op in
+                model.render("deck#256", ComSlide(app, slide), deck_writer.result_shapes(value))]
+
+    assert render("1") == [("add", 10)]
+    shape = slide.Shapes[0]
+    assert shape.Name == "Result Rectangle" and shape.TextFrame.TextRange.Text == "1"
+    assert render("1") == [("skip", 10)]
+    assert render("2") == [("update_text", 10)]
+    assert slide.Shapes == [shape] and shape.TextFrame.TextRange.Text == "2"
+    assert app.undo_entries == 2
+
+
+def test_gui_drawn_shapes_become_the_result_shape():
+    rectangle = FakeShape(2, "Rectangle 1", 260, 220, 200, 100)
+    text_box = FakeShape(3, "TextBox 2", 300, 250, 100, 40, shape_type=17)
+    text_box.TextFrame.TextRange.Text = "7.5"
+    slide = SimpleNamespace(Shapes=FakeShapes([rectangle, text_box]), SlideIndex=1)
+    app = SimpleNamespace(StartNewUndoEntry=lambda: None)
+
+    assert ComSlide(app, slide).adopt("7.5") == 2
+    assert rectangle.Name == "Result Rectangle" and rectangle.TextFrame.TextRange.Text == "7.5"
+    assert text_box.deleted
+    slide.Shapes.remove(text_box)
+
+    model = SlideModel()
+    operations = model.render("deck#256", ComSlide(app, slide), deck_writer.result_shapes("8.5"))
+    assert [(op.op, op.shape_id) for op in operations] == [("update_layout", 2), ("update_text", 2)]
+    assert slide.Shapes == [rectangle] and rectangle.TextFrame.TextRange.Text == "8.5"
+    assert ComSlide(app, slide).adopt("nothing like it") is None
+
+
+def test_record_keeps_the_ids_of_a_written_slide(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    with deck_writer.DeckWriter(path) as deck:
+        deck._write_slide(deck_writer.slide_xml("7", "Answer").replace(
+            ' id="2" ', ' id="12" ').replace(' id="3" ', ' id="13" '))
+    model = SlideModel()
+    states = model.record(path, PptxSlide(path))
+    assert {name: state.shape_id for name, state in states.items()} == {
+        "Result Rectangle": 12, "Title": 13}
+    assert [(op.op, op.shape_id) for op in model.render(path, PptxSlide(path),
+                                                          deck_writer.result_shapes("7", "Answer"))] == [
+        ("skip", 12), ("skip", 13)]
+    assert model.stats()["scans"] == 1
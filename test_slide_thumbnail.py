@@ -0,0 +1,61 @@
+"""
+Tests for slide thumbnail rendering, caching and inline email embedding
+"""
+
+import tempfile
+
+from email_logger import EmailLogger
+from slide_thumbnail import ThumbnailCache, render_slide_png
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_render_produces_small_png():
+    """The rasterizer returns a compact PNG at the requested width"""
+    png = render_slide_png("7.599822246093079e+33", width=480)
+    assert png.startswith(PNG_SIGNATURE)
+    assert int.from_bytes(png[16:20], "big") == 480
+    assert len(png) < 20 * 1024
+
+
+def test_identical_slides_render_once():
+    """Re-rendering an identical slide is served from the cache"""
+    cache = ThumbnailCache()
+    first = cache.get("42")
+    second = cache.get("42")
+    cache.get("43")
+
+    assert first == second
+    assert cache.renders == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_disk_cache_survives_new_instances():
+    """Thumbnails persisted to disk are reused by a fresh cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ThumbnailCache(cache_dir=tmp).get("42")
+        fresh = ThumbnailCache(cache_dir=tmp)
+        assert fresh.get("42").startswith(PNG_SIGNATURE)
+        assert fresh.renders == 0
+
+
+def test_size_bound_shrinks_image():
+    """Images over the byte budget are re-rendered smaller"""
+    cache = ThumbnailCache()
+    full = cache.get("123456789", width=800, max_bytes=1024 * 1024)
+    bounded = cache.get("123456789", width=800, max_bytes=len(full) - 1)
+    assert bounded is None or len(bounded) < len(full)
+
+
+def test_success_email_embeds_thumbnail_inline():
+    """The thumbnail is attached as an inline related part referenced by cid"""
+    logger = EmailLogger()
+    png = render_slide_png("42")
+    msg = logger._build_message("subject", '<img src="cid:slide-thumbnail">',
+                                {"slide-thumbnail": png})
+
+    assert msg.get_content_subtype() == "related"
+    image = msg.get_payload()[1]
+    assert image.get_content_type() == "image/png"
+    assert image["Content-ID"] == "<slide-thumbnail>"
+    assert image.get_payload(decode=True) == png
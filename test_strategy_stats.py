@@ -0,0 +1,68 @@
+"""
+Tests for adaptive ordering of GUI fallback strategies
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from strategy_stats import StrategyStats
+
+
+def _fail():
+    raise RuntimeError("shortcut ignored")
+
+
+def test_failing_strategy_moves_behind_working_one():
+    stats = StrategyStats(host="pc1")
+    calls = []
+
+    def mouse():
+        calls.append("mouse")
+        return "clicked"
+
+    strategies = [("keyboard", _fail), ("mouse", mouse)]
+    assert stats.order("select", ["keyboard", "mouse"]) == ["keyboard", "mouse"]
+    assert stats.run("select", strategies) == ("mouse", "clicked")
+    assert stats.order("select", ["keyboard", "mouse"]) == ["mouse", "keyboard"]
+
+    failures = []
+    stats.run("select", strategies, on_failure=lambda name, e: failures.append(name))
+    assert failures == [] and calls == ["mouse", "mouse"]
+
+
+def test_fastest_reliable_strategy_first():
+    stats = StrategyStats(host="pc1")
+    for _ in range(3):
+        stats.record("draw", "slow", True, 2.0)
+        stats.record("draw", "fast", True, 0.2)
+    assert stats.order("draw", ["slow", "fast", "new"]) == ["fast", "slow", "new"]
+
+
+def test_last_resort_is_never_promoted_and_errors_propagate():
+    stats = StrategyStats(host="pc1")
+    used = stats.run("draw", [("drag", _fail)], last_resort=("center", lambda: None))
+    assert used == ("center", None)
+    assert stats.order("draw", ["drag"]) == ["drag"]
+    with pytest.raises(RuntimeError):
+        stats.run("draw", [("drag", _fail)], last_resort=("center", _fail))
+
+
+def test_statistics_persist_per_host():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stats.json")
+        first = StrategyStats(path, host="pc1")
+        first.run("select", [("keyboard", _fail), ("mouse", lambda: None)])
+        other = StrategyStats(path, host="pc2")
+        other.record("select", "keyboard", True, 0.1)
+
+        reloaded = StrategyStats(path, host="pc1")
+        assert reloaded.order("select", ["keyboard", "mouse"]) == ["mouse", "keyboard"]
+        report = reloaded.stats()
+        assert report["host"] == "pc1"
+        assert report["actions"]["select"]["order"] == ["mouse", "keyboard"]
+        assert report["actions"]["select"]["strategies"]["keyboard"]["attempts"] == 1
+        with open(path, encoding="utf-8") as f:
+            assert set(json.load(f)) == {"pc1", "pc2"}
@@ -0,0 +1,113 @@
+"""
+Tests for the parsed template cache and copy-on-write clones
+"""
+
+import os
+import tempfile
+import zipfile
+
+from deck_writer import render_deck
+from template_cache import CT_PRESENTATION, CT_TEMPLATE, TemplateCache
+
+
+def _make_template(directory, name="corporate.pptx", slides=2):
+    path = os.path.join(directory, name)
+    render_deck([f"Sample {i}" for i in range(slides)], path)
+    return path
+
+
+def test_template_is_parsed_once():
+    """Repeated lookups are served from the cache without re-parsing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TemplateCache()
+        template = cache.load("corporate", _make_template(tmp))
+        for _ in range(5):
+            assert cache.get("corporate") is template
+
+        assert cache.parses == 1
+        assert template.slide_count == 2
+        assert [layout["name"] for layout in template.layouts] == ["Blank"]
+        assert template.themes[0]["name"] == "Office Theme"
+        assert template.slide_size == (12192000, 6858000)
+        assert template.slide_parts() == ["ppt/slides/slide1.xml", "ppt/slides/slide2.xml"]
+
+
+def test_names_with_path_parts_are_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TemplateCache()
+        path = _make_template(tmp)
+        for name in ("../evil", "a/b", "a\\b", "..", "", ".hidden"):
+            try:
+                cache.register(name, path)
+                raise AssertionError(f"expected ValueError for {name!r}")
+            except ValueError:
+                pass
+        cache.register("corporate-2024_v1.1", path)
+        assert cache.stats()["registered"] == ["corporate-2024_v1.1"]
+
+
+def test_clone_is_copy_on_write():
+    """Writes to a clone never leak into the template or other clones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TemplateCache()
+        cache.load("corporate", _make_template(tmp))
+        first = cache.clone("corporate")
+        second = cache.clone("corporate")
+
+        first.write("ppt/slides/slide1.xml", b"<changed/>")
+        first.remove("ppt/slides/slide2.xml")
+
+        assert first.modified_parts == ["ppt/slides/slide1.xml"]
+        assert second.modified_parts == []
+        assert second.read("ppt/slides/slide1.xml") != b"<changed/>"
+        assert "ppt/slides/slide2.xml" not in first.names()
+        assert "ppt/slides/slide2.xml" in second.names()
+
+
+def test_saved_clone_is_a_valid_package():
+    """Unmodified parts are copied verbatim and the result reads back intact"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = _make_template(tmp)
+        cache = TemplateCache()
+        cache.load("corporate", source)
+        output = cache.clone("corporate").save(os.path.join(tmp, "job.pptx"))
+
+        with zipfile.ZipFile(source) as original, zipfile.ZipFile(output) as copy:
+            assert copy.testzip() is None
+            assert sorted(copy.namelist()) == sorted(original.namelist())
+            for name in original.namelist():
+                assert copy.read(name) == original.read(name)
+
+
+def test_potx_clone_uses_presentation_content_type():
+    """Cloning a .potx template produces a regular presentation"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pptx = _make_template(tmp)
+        potx = os.path.join(tmp, "corporate.potx")
+        with zipfile.ZipFile(pptx) as source, zipfile.ZipFile(potx, "w") as target:
+            for name in source.namelist():
+                data = source.read(name)
+                if name == "[Content_Types].xml":
+                    data = data.replace(CT_PRESENTATION.encode(), CT_TEMPLATE.encode())
+                target.writestr(name, data)
+
+        cache = TemplateCache()
+        assert cache.load("corporate", potx).is_template
+        clone = cache.clone("corporate")
+        assert CT_PRESENTATION.encode() in clone.read("[Content_Types].xml")
+
+
+def test_eviction_and_file_change_trigger_reparse():
+    """Evicted or modified templates are parsed again on next use"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TemplateCache(max_entries=1)
+        cache.load("a", _make_template(tmp, "a.pptx"))
+        cache.load("b", _make_template(tmp, "b.pptx"))
+        cache.get("a")
+        assert cache.parses == 3
+        assert cache.stats()["evictions"] == 2
+
+        path = _make_template(tmp, "a.pptx", slides=3)
+        os.utime(path, (0, 0))
+        assert cache.get("a").slide_count == 3
+        assert cache.parses == 4
@@ -0,0 +1,94 @@
+"""
+Tests for the pure tool memoization layer
+"""
+
+import pytest
+
+from tool_cache import LRUCache, memoize
+
+
+def test_memoize_hits_on_repeated_call():
+    """Repeated calls with equivalent arguments are served from the cache"""
+    cache = LRUCache()
+    calls = []
+
+    @memoize(cache)
+    def power(a: int, b: int) -> int:
+        calls.append((a, b))
+        return a ** b
+
+    assert power(2, 10) == 1024
+    assert power(a=2, b=10) == 1024
+    assert power(2, b=10) == 1024
+    assert calls == [(2, 10)]
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_argument_passed_twice_is_a_type_error():
+    """Positional and keyword for the same parameter fails like an uncached call"""
+    cache = LRUCache()
+
+    @memoize(cache)
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    with pytest.raises(TypeError):
+        add(1, a=2)
+    with pytest.raises(TypeError):
+        add(1, 2, a=3)
+    assert add(1, b=2) == 3
+
+
+def test_cached_lists_are_not_shared():
+    """Mutating a returned list does not corrupt the cached value"""
+    cache = LRUCache()
+
+    @memoize(cache)
+    def strings_to_chars_to_int(string: str) -> list:
+        return [ord(char) for char in string]
+
+    first = strings_to_chars_to_int("INDIA")
+    first.append(0)
+    assert strings_to_chars_to_int("INDIA") == [73, 78, 68, 73, 65]
+
+
+def test_exceptions_are_not_cached():
+    """Failed calls are recomputed rather than cached"""
+    cache = LRUCache()
+
+    @memoize(cache)
+    def divide(a: int, b: int) -> float:
+        return a / b
+
+    for _ in range(2):
+        try:
+            divide(1, 0)
+        except ZeroDivisionError:
+            pass
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 2
+
+
+def test_entry_bound_evicts_least_recently_used():
+    """The cache evicts the least recently used entry when full"""
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_bound_evicts_and_rejects_oversized_values():
+    """Entries are evicted to stay under the byte budget"""
+    cache = LRUCache(max_entries=100, max_bytes=1000)
+    for i in range(10):
+        cache.put(i, "x", size=300)
+
+    assert cache.total_bytes <= 1000
+    assert len(cache) == 3
+    assert cache.put("huge", "x", size=5000) is False
@@ -0,0 +1,182 @@
+"""
+Tests for per-tool deadlines, cooperative cancellation and the automation watchdog
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import tool_deadlines
+from agent_run import AgentRun, FAILED
+from tool_deadlines import AutomationRunner, Deadlines, ToolCancelled, parse_deadlines
+
+
+def timed_out(name, seconds, queued=False):
+    return f"ERROR: {name} {'queued' if queued else 'after'} {seconds:g}s"
+
+
+def test_deadlines_from_table_overrides_and_env(monkeypatch):
+    assert parse_deadlines("open_powerpoint=90, paste_number=2.5") == {"open_powerpoint": 90.0,
+                                                                      "paste_number": 2.5}
+    with pytest.raises(ValueError):
+        parse_deadlines("paste_number")
+    monkeypatch.setenv("PPT_TOOL_DEADLINE", "12")
+    monkeypatch.setenv("PPT_TOOL_DEADLINES", "paste_number=3")
+    monkeypatch.setenv("PPT_TOOL_QUEUE_TIMEOUT", "4")
+    deadlines = Deadlines.from_env()
+    assert deadlines.for_tool("add") == 12.0
+    assert deadlines.for_tool("paste_number") == 3.0
+    assert deadlines.for_tool("open_powerpoint") == tool_deadlines.DEADLINES["open_powerpoint"]
+    assert deadlines.client("paste_number") == 3.0 + 4.0 + tool_deadlines.CLIENT_MARGIN
+
+
+def test_cancellation_points_are_plain_outside_the_runner():
+    tool_deadlines.check()
+    assert tool_deadlines.remaining(15) == 15
+    started = time.perf_counter()
+    tool_deadlines.sleep(0.01)
+    assert time.perf_counter() - started >= 0.01
+
+
+def test_sync_and_async_tools_run_on_one_automation_thread():
+    runner = AutomationRunner(Deadlines(default=1.0))
+    threads = []
+
+    def sync_tool(value):
+        threads.append(threading.current_thread().name)
+        return value * 2
+
+    async def async_tool(value):
+        threads.append(threading.current_thread().name)
+        await asyncio.sleep(0)
+        return value + 1
+
+    async def run():
+        return [await runner.wrap(sync_tool)(2), await runner.wrap(async_tool)(value=2)]
+
+    assert asyncio.run(run()) == [4, 3]
+    assert threads == ["automation-1", "automation-1"]
+    assert runner.stats()["tools"]["sync_tool"]["calls"] == 1
+
+
+def test_cooperative_tool_stops_at_its_deadline():
+    runner = AutomationRunner(Deadlines(default=0.2), timeout_result=timed_out)
+    stopped = threading.Event()
+
+    def looping():
+        try:
+            while True:
+                tool_deadlines.sleep(0.5)
+        except ToolCancelled:
+            stopped.set()
+            raise
+
+    async def run():
+        started = time.perf_counter()
+        result = await runner.call("looping", looping)
+        return result, time.perf_counter() - started, await runner.call("quick", lambda: "ok")
+
+    result, elapsed, after = asyncio.run(run())
+    assert result == "ERROR: looping after 0.2s"
+    assert elapsed < 0.5
+    assert stopped.wait(1) and after == "ok"
+    stats = runner.stats()
+    assert stats["tools"]["looping"]["timeouts"] == 1 and stats["wedged"] == 0
+
+
+def test_deadline_starts_when_the_call_starts():
+    """Time spent queued behind another call does not use up a call's deadline"""
+    runner = AutomationRunner(Deadlines(default=0.3), timeout_result=timed_out)
+
+    def step(name):
+        tool_deadlines.sleep(0.2)
+        return name
+
+    async def run():
+        return await asyncio.gather(runner.wrap(step, "first")("first"), runner.wrap(step, "second")("second"))
+
+    assert asyncio.run(run()) == ["first", "second"]
+    assert runner.stats()["tools"]["second"]["timeouts"] == 0
+
+
+def test_queued_call_times_out_without_running():
+    runner = AutomationRunner(Deadlines(default=2.0, queue=0.1), timeout_result=timed_out)
+    ran = []
+
+    def step(name):
+        ran.append(name)
+        tool_deadlines.sleep(0.4)
+        return name
+
+    async def run():
+        return await asyncio.gather(runner.wrap(step, "busy")("busy"), runner.wrap(step, "waiting")("waiting"))
+
+    assert asyncio.run(run()) == ["busy", "ERROR: waiting queued 0.1s"]
+    time.sleep(0.1)
+    assert ran == ["busy"]
+    stats = runner.stats()
+    assert stats["tools"]["waiting"]["queue_timeouts"] == 1 and stats["tools"]["waiting"]["timeouts"] == 0
+
+
+def test_remaining_is_bounded_by_the_deadline():
+    runner = AutomationRunner(Deadlines(default=0.5))
+    assert 0 < asyncio.run(runner.call("wait", tool_deadlines.remaining, 15)) <= 0.5
+
+
+def test_watchdog_retires_a_wedged_session():
+    wedged = []
+    release = threading.Event()
+    runner = AutomationRunner(Deadlines(default=0.2, overrides={"next": 5.0}), grace=0.1,
+                              on_wedged=wedged.append, timeout_result=timed_out, interval=0.05)
+
+    def hung():
+        release.wait(5)  # a blocking call with no cancellation point
+        return "late"
+
+    async def run():
+        first = asyncio.ensure_future(runner.call("hung", hung))
+        await asyncio.sleep(0.05)
+        # Queued behind the hung call; runs once the watchdog replaces the thread
+        second = await runner.call("next", lambda: threading.current_thread().name)
+        return await first, second
+
+    started = time.perf_counter()
+    first, second = asyncio.run(run())
+    assert first == "ERROR: hung after 0.2s"
+    assert second == "automation-2"
+    assert time.perf_counter() - started < 2
+    assert [call.name for call in wedged] == ["hung"] and wedged[0].reason == "deadline"
+    assert runner.stats()["wedged"] == 1
+
+    release.set()
+    deadline = time.monotonic() + 2
+    while runner.stats()["tools"]["hung"]["late_completions"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert runner.stats()["tools"]["hung"]["late_completions"] == 1
+
+
+def test_agent_abandons_a_tool_call_without_an_answer():
+    class HungSession:
+        async def initialize(self):
+            pass
+
+        async def list_tools(self):
+            return SimpleNamespace(tools=[SimpleNamespace(name="open_powerpoint", description="",
+                                                          inputSchema={})])
+
+        async def call_tool(self, name, arguments=None):
+            await asyncio.sleep(60)
+
+    async def generate(prompt):
+        return SimpleNamespace(text="FINAL_ANSWER: [1]")
+
+    run = AgentRun(generate, echo=False, deadlines=Deadlines(overrides={"open_powerpoint": 0.1}, margin=0.0,
+                                                                queue=0.0))
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError, match="open_powerpoint did not answer within 0.1s"):
+        asyncio.run(run.run(HungSession()))
+    assert time.perf_counter() - started < 2
+    assert run.state == FAILED
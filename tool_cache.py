@@ -0,0 +1,182 @@
+"""
+Memoization Module for PowerPoint MCP Server
+Caches results of pure tools in a bounded LRU keyed on canonicalized arguments
+"""
+
+import copy
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+
+_IMMUTABLE_TYPES = (int, float, str, bool, bytes, type(None))
+
+# Server tools whose results depend only on their arguments: the ones that
+# may be memoized here and replayed from a checkpoint by the agent
+PURE_TOOLS = frozenset({
+    "add", "subtract", "multiply", "divide", "power", "sqrt",
+    "strings_to_chars_to_int", "int_list_to_exponential_sum", "evaluate_expression",
+})
+
+
+def estimate_size(value):
+    """Roughly estimate the memory footprint of a value in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+def _copy_result(value):
+    """Copy nested lists and dicts, sharing immutable leaves"""
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+def _freeze(value):
+    """Convert a JSON-like value into a hashable canonical form"""
+    kind = type(value)
+    if kind is int or kind is str:
+        return value
+    if kind is list or kind is tuple:
+        return ("list",) + tuple(_freeze(item) for item in value)
+    if kind is dict:
+        return ("dict",) + tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, _IMMUTABLE_TYPES):
+        # Tag floats and bools so 1, 1.0 and True do not share an entry
+        return (kind.__name__, value)
+    return (kind.__name__, repr(value))
+
+
+def canonical_key(name, signature, args, kwargs):
+    """
+    Build a stable, hashable cache key for a tool call
+
+    Positional and keyword arguments are bound to parameter names so that
+    add(1, 2) and add(a=1, b=2) share an entry, lists become tuples and
+    dictionaries are ordered by key.
+    """
+    values = list(args)
+    names = list(signature.parameters)
+    if len(args) + len(kwargs) == len(names) and all(name in kwargs for name in names[len(args):]):
+        # Fast path: FastMCP always calls tools with every argument by name.
+        # A name passed both ways fails the check and gets bind's TypeError
+        for param_name in names[len(args):]:
+            values.append(kwargs[param_name])
+    else:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        values = list(bound.arguments.values())
+    return (name,) + tuple(_freeze(value) for value in values)
+
+
+class LRUCache:
+    def __init__(self, max_entries=1024, max_bytes=4 * 1024 * 1024):
+        """
+        Initialize an LRU cache bounded by entry count and estimated size
+
+        Args:
+            max_entries (int): Maximum number of cached entries
+            max_bytes (int): Maximum total estimated size of keys and values
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) on a hit and (False, None) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value, size=None):
+        """Store a value, evicting least recently used entries as needed"""
+        if size is None:
+            size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+
+            while (len(self._entries) > self.max_entries
+                   or self.total_bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        """Drop all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return cache statistics as a dictionary"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def memoize(cache):
+    """
+    Decorator that memoizes a pure function in the given LRUCache
+
+    Exceptions are never cached. Mutable results are copied on the way out
+    so callers cannot corrupt the cached value.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = canonical_key(name, signature, args, kwargs)
+            hit, value = cache.get(key)
+            if not hit:
+                value = fn(*args, **kwargs)
+                cache.put(key, value)
+            return _copy_result(value)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
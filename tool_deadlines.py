@@ -0,0 +1,406 @@
+"""
+Tool Deadlines Module for PowerPoint MCP Server
+Per-tool deadlines shared by the server and the agent, a single automation
+thread that runs GUI tools with cooperative cancellation, and a watchdog
+that retires a wedged automation session and recycles its PowerPoint
+instance so later calls are not stuck behind it
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_DEADLINE = 30.0
+CLIENT_MARGIN = 5.0     # The server reports a timeout before the client gives up
+DEFAULT_GRACE = 5.0     # Seconds a cancelled call gets to stop before it counts as wedged
+DEFAULT_QUEUE_TIMEOUT = 30.0  # Seconds a call may wait for the automation thread to start it
+
+# Seconds; GUI steps wait up to 15s for windows, opening may start PowerPoint
+DEADLINES = {
+    "open_powerpoint": 60.0,
+    "select_rectangle_shape": 20.0,
+    "draw_rectangle_centered": 20.0,
+    "select_text_box": 20.0,
+    "click_inside_rectangle": 15.0,
+    "paste_number": 20.0,
+}
+
+
+class ToolCancelled(BaseException):
+    """
+    Raised at a cancellation point of a tool whose deadline has passed
+
+    Like asyncio.CancelledError it is not an Exception, so a tool's own
+    error handling and fallback strategies do not swallow it.
+    """
+
+
+def parse_deadlines(text):
+    """
+    Parse "open_powerpoint=90,paste_number=10" into seconds per tool
+
+    Raises:
+        ValueError: An entry without a positive number of seconds
+    """
+    deadlines = {}
+    for part in filter(None, (part.strip() for part in (text or "").split(","))):
+        name, _, seconds = part.partition("=")
+        if not seconds or float(seconds) <= 0:
+            raise ValueError(f"Invalid tool deadline {part!r}; expected name=seconds")
+        deadlines[name.strip()] = float(seconds)
+    return deadlines
+
+
+class Deadlines:
+    def __init__(self, default=DEFAULT_DEADLINE, overrides=None, margin=CLIENT_MARGIN,
+                 queue=DEFAULT_QUEUE_TIMEOUT):
+        """
+        Deadline of every tool: DEADLINES, then overrides, else the default
+
+        A deadline counts from the moment the call starts running; waiting
+        for the automation thread is bounded separately by queue.
+
+        Args:
+            default (float): Seconds for tools without their own deadline
+            overrides (dict): Seconds per tool name
+            margin (float): Extra seconds the client waits on top
+            queue (float): Seconds a call may wait before it starts
+        """
+        self.default = default
+        self.per_tool = dict(DEADLINES, **(overrides or {}))
+        self.margin = margin
+        self.queue = queue
+
+    @classmethod
+    def from_env(cls):
+        """
+        PPT_TOOL_DEADLINE: seconds for tools without their own (default 30)
+        PPT_TOOL_DEADLINES: per-tool overrides, e.g. open_powerpoint=90,paste_number=10
+        PPT_TOOL_QUEUE_TIMEOUT: seconds a call may wait to start (default 30)
+
+        The agent passes its environment to the server, so both read the same.
+        """
+        return cls(float(os.getenv("PPT_TOOL_DEADLINE", str(DEFAULT_DEADLINE))),
+                   parse_deadlines(os.getenv("PPT_TOOL_DEADLINES", "")),
+                   queue=float(os.getenv("PPT_TOOL_QUEUE_TIMEOUT", str(DEFAULT_QUEUE_TIMEOUT))))
+
+    def for_tool(self, name):
+        return self.per_tool.get(name, self.default)
+
+    def client(self, name):
+        """Seconds the client waits for a call before abandoning it"""
+        return self.for_tool(name) + self.queue + self.margin
+
+
+# Cooperative cancellation points, used inside tool bodies
+
+_local = threading.local()
+
+
+class Call:
+    __slots__ = ("name", "deadline", "expires", "started", "cancelled", "reason", "on_start")
+
+    def __init__(self, name, deadline, on_start=None):
+        """One tool call on the automation thread; its deadline runs from start()"""
+        self.name = name
+        self.deadline = deadline
+        self.expires = None
+        self.started = None
+        self.cancelled = threading.Event()
+        self.reason = None
+        self.on_start = on_start
+
+    def start(self):
+        """Called by the automation thread when it picks the call up"""
+        self.started = time.monotonic()
+        self.expires = self.started + self.deadline
+        if self.on_start is not None:
+            self.on_start()
+
+    def cancel(self, reason):
+        if self.reason is None:
+            self.reason = reason
+        self.cancelled.set()
+
+
+def current_call():
+    """The call running on this thread, or None outside the automation thread"""
+    return getattr(_local, "call", None)
+
+
+def check():
+    """Raise ToolCancelled if the running call has been cancelled"""
+    call = current_call()
+    if call is not None and call.cancelled.is_set():
+        raise ToolCancelled(f"{call.name} cancelled ({call.reason})")
+
+
+def remaining(limit):
+    """A wait timeout of at most limit seconds that ends with the call's deadline"""
+    call = current_call()
+    if call is None:
+        return limit
+    check()
+    return max(0.0, min(limit, call.expires - time.monotonic()))
+
+
+def sleep(seconds):
+    """time.sleep that wakes up and raises ToolCancelled when the call is cancelled"""
+    call = current_call()
+    if call is None:
+        time.sleep(seconds)
+        return
+    check()
+    if call.cancelled.wait(seconds):
+        check()
+
+
+class _ToolStats:
+    __slots__ = ("calls", "timeouts", "queue_timeouts", "late_completions", "cancelled")
+
+    def __init__(self):
+        self.calls = 0
+        self.timeouts = 0
+        self.queue_timeouts = 0
+        self.late_completions = 0
+        self.cancelled = 0
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _notify(loop, future):
+    """Resolve an event loop's future from the automation thread"""
+    try:
+        loop.call_soon_threadsafe(_resolve, future)
+    except RuntimeError:
+        pass  # The loop that was waiting has closed
+
+
+def _consume(future):
+    """Retrieve the outcome of a call nobody awaits any more"""
+    if not future.cancelled():
+        future.exception()
+
+
+class _Worker(threading.Thread):
+    def __init__(self, generation, jobs, initializer):
+        super().__init__(name=f"automation-{generation}", daemon=True)
+        self.generation = generation
+        self.jobs = jobs
+        self.initializer = initializer
+        self.call = None
+        self.retired = False
+
+    def run(self):
+        if self.initializer is not None:
+            self.initializer()
+        while not self.retired:
+            job = self.jobs.get()
+            if job is None or self.retired:
+                if job is not None:
+                    self.jobs.put(job)  # belongs to the replacement worker
+                return
+            call, fn, args, kwargs, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            if call.cancelled.is_set():
+                future.set_exception(ToolCancelled(f"{call.name} cancelled before it started ({call.reason})"))
+                continue
+            call.start()
+            self.call = _local.call = call
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self.call = _local.call = None
+
+
+class AutomationRunner:
+    def __init__(self, deadlines=None, grace=DEFAULT_GRACE, on_wedged=None, initializer=None,
+                 timeout_result=None, interval=0.5):
+        """
+        Runs GUI tools one at a time on a dedicated thread, under deadlines
+
+        The event loop only awaits the call, so it stays responsive and can
+        report a timeout when the deadline passes. The deadline counts from
+        when the thread starts the call; a call still queued behind others
+        after deadlines.queue seconds times out without running. The call is then
+        cancelled: its next cancellation point (sleep, remaining, check)
+        raises ToolCancelled. A call still running grace seconds after its
+        deadline is wedged, e.g. inside a blocking pywinauto wait. The
+        watchdog then retires that thread, hands queued calls to a fresh
+        one, and calls on_wedged so the automation session is recycled.
+
+        Args:
+            deadlines (Deadlines): Deadline per tool
+            grace (float): Seconds past the deadline before a call is wedged
+            on_wedged: Callable(call) recycling the automation session
+            initializer: Callable run first on every automation thread
+                (e.g. COM initialization)
+            timeout_result: Callable(name, seconds, queued=False) -> result
+                returned when the deadline passes, or with queued=True when
+                the call never started; by default TimeoutError is raised
+            interval (float): Seconds between watchdog checks
+        """
+        self.deadlines = deadlines or Deadlines()
+        self.grace = grace
+        self.on_wedged = on_wedged
+        self.initializer = initializer
+        self.timeout_result = timeout_result
+        self.interval = interval
+        self.tools = {}
+        self.wedged = 0
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._generation = 0
+        self._worker = None
+        self._watchdog = None
+        self._loops = threading.local()
+
+    def _stats_for(self, name):
+        stats = self.tools.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.tools.setdefault(name, _ToolStats())
+        return stats
+
+    def _ensure_threads(self):
+        with self._lock:
+            if self._worker is None:
+                self._generation += 1
+                self._worker = _Worker(self._generation, self._jobs, self._thread_init)
+                self._worker.start()
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch, name="automation-watchdog", daemon=True)
+                self._watchdog.start()
+
+    def _thread_init(self):
+        self._loops.loop = asyncio.new_event_loop()
+        if self.initializer is not None:
+            self.initializer()
+
+    def wrap(self, fn, name=None):
+        """Return fn (sync or async) as a coroutine function that runs under the runner"""
+        name = name or fn.__name__
+
+        async def guarded(*args, **kwargs):
+            return await self.call(name, fn, *args, **kwargs)
+
+        guarded.__name__ = fn.__name__
+        guarded.__qualname__ = fn.__qualname__
+        guarded.__doc__ = fn.__doc__
+        guarded.__wrapped__ = fn
+        return guarded
+
+    async def call(self, name, fn, *args, **kwargs):
+        """
+        Run fn on the automation thread: wait at most deadlines.queue for it
+        to start, then at most the tool's deadline for it to finish
+
+        Raises:
+            TimeoutError: A timeout passed and no timeout_result is set
+        """
+        self._ensure_threads()
+        stats = self._stats_for(name)
+        stats.calls += 1
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+        call = Call(name, self.deadlines.for_tool(name),
+                    on_start=lambda: _notify(loop, started))
+        future = Future()
+        self._jobs.put((call, self._bind(fn), args, kwargs, future))
+        result = asyncio.wrap_future(future)
+        try:
+            done, _ = await asyncio.wait((result, started), timeout=self.deadlines.queue,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                call.cancel("queue timeout")
+                stats.queue_timeouts += 1
+                result.add_done_callback(_consume)
+                if self.timeout_result is None:
+                    raise TimeoutError(f"{name} did not start within {self.deadlines.queue:g}s")
+                return self.timeout_result(name, self.deadlines.queue, queued=True)
+            # started only resolves after call.expires is set
+            return await asyncio.wait_for(result, max(0.0, call.expires - time.monotonic()))
+        except asyncio.TimeoutError:
+            call.cancel("deadline")
+            stats.timeouts += 1
+            future.add_done_callback(lambda f: self._late(stats, f))
+            if self.timeout_result is None:
+                raise TimeoutError(f"{name} exceeded its {call.deadline:g}s deadline") from None
+            return self.timeout_result(name, call.deadline)
+        except asyncio.CancelledError:
+            # The client cancelled the request
+            call.cancel("cancelled by client")
+            stats.cancelled += 1
+            raise
+
+    def _bind(self, fn):
+        """Async tools run to completion on the automation thread's own event loop"""
+        def run(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = self._loops.loop.run_until_complete(result)
+            return result
+        return run
+
+    @staticmethod
+    def _late(stats, future):
+        if not future.cancelled() and future.exception() is None:
+            stats.late_completions += 1
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            worker = self._worker
+            call = worker.call if worker is not None else None
+            if call is not None and time.monotonic() > call.expires + self.grace:
+                self._retire(worker, call)
+
+    def _retire(self, worker, call):
+        """Replace a worker stuck in a call; queued calls move to the new thread"""
+        with self._lock:
+            if worker is not self._worker or worker.call is not call:
+                return
+            worker.retired = True
+            call.cancel("wedged")
+            self.wedged += 1
+            self._generation += 1
+            self._worker = _Worker(self._generation, self._jobs, self._thread_init)
+            self._worker.start()
+        if self.on_wedged is not None:
+            try:
+                self.on_wedged(call)
+            except Exception:
+                pass
+
+    def stats(self):
+        """Deadline, calls, timeouts and late completions per tool, plus the watchdog state"""
+        worker = self._worker
+        call = worker.call if worker is not None else None
+        tools = {}
+        for name, stats in sorted(self.tools.items()):
+            tools[name] = {"deadline_seconds": self.deadlines.for_tool(name), "calls": stats.calls,
+                           "timeouts": stats.timeouts, "queue_timeouts": stats.queue_timeouts,
+                           "late_completions": stats.late_completions, "cancelled": stats.cancelled}
+        return {
+            "default_deadline_seconds": self.deadlines.default,
+            "queue_timeout_seconds": self.deadlines.queue,
+            "grace_seconds": self.grace,
+            "wedged": self.wedged,
+            "automation_thread": worker.name if worker is not None else None,
+            "running": ({"tool": call.name,
+                         "seconds": round(time.monotonic() - call.started, 3) if call.started else 0.0}
+                        if call is not None else None),
+            "queued": self._jobs.qsize(),
+            "tools": tools,
+        }